@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for tinycolors.tprint.prettify_string.
+
+Times ``prettify_string`` on inputs of growing size, up to 10 MB by default,
+and reports the cost per character. With a linear-time tokenizer the cost
+per character stays flat; the script exits with status 1 if the largest
+input costs more than ``--max-ratio`` times as much per character as the
+smallest one.
+
+Usage:
+    python bench_prettify_string.py
+    python bench_prettify_string.py --sizes 1e4 1e5 1e6 1e7 --max-ratio 2
+    python bench_prettify_string.py --input prose
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from tinycolors.tprint import prettify_string  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_MAX_RATIO = 2.0
+
+_RECORD = {"id": 12, "name": 'O\'Brien said "hi"', "tags": ["a", "b"], "score": 1.5, "ok": True, "note": None}
+
+INPUTS: dict[str, str] = {
+    # The repr of a list of dicts: dense quotes, brackets, numbers and keywords
+    "repr": str([_RECORD] * 10),
+    # A logged message: mostly plain text with stray apostrophes
+    "prose": ("It's the user's 3rd retry; the server didn't answer (timeout=30.5s) "
+              "and the client's cache was None. "),
+    # An escaped JSON payload
+    "json": '{"event": "login", "user": "ann", "ok": true, "detail": "said \\"hi\\"", "n": [1, 2, 3]}\n',
+    # Brackets closed out of order, leaving ever more square brackets open
+    "crossed": "a([b) ",
+    # Brackets nested as deep as the input is long; built by make_input
+    "nested": "[]",
+}
+
+
+def make_input(kind: str, size: int) -> str:
+    """Repeats the ``kind`` sample until it is ``size`` characters long."""
+    unit = INPUTS[kind]
+    if kind == "nested":
+        return unit[0] * (size // 2) + unit[1] * (size - size // 2)
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def time_per_char(func: Callable[[str], str], text: str, repeat: int) -> float:
+    """Returns the best time of ``func(text)`` in nanoseconds per character."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(text) * 1e9
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=float, default=DEFAULT_SIZES,
+                        help="input sizes in characters (default: 1e4 1e5 1e6 1e7)")
+    parser.add_argument("--input", choices=sorted(INPUTS), default="repr", help="kind of input (default: repr)")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repeats per size (default: 3)")
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO,
+                        help=f"allowed growth of the cost per character (default: {DEFAULT_MAX_RATIO})")
+    args = parser.parse_args(argv)
+
+    costs = []
+    for size in sorted(int(size) for size in args.sizes):
+        text = make_input(args.input, size)
+        # Fewer repeats for the largest inputs, they take seconds each
+        cost = time_per_char(prettify_string, text, args.repeat if size <= 1_000_000 else 1)
+        costs.append(cost)
+        print(f"{size:>12,} chars  {cost:8.1f} ns/char")
+
+    ratio = costs[-1] / costs[0]
+    print(f"\nCost per character grew {ratio:.2f}x from the smallest to the largest input.")
+    if ratio > args.max_ratio:
+        print(f"That is more than the allowed {args.max_ratio:.2f}x; scaling is not linear.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
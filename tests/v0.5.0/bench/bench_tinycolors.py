@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the tinycolors hot paths.
+
+Each benchmark is timed with ``timeit`` and reported as the best time per
+call, in nanoseconds, over several repeats. Results can be written to JSON
+and compared against a stored baseline; any benchmark slower than the
+baseline by more than the tolerance counts as a regression.
+
+Usage:
+    python bench_tinycolors.py                          # print results
+    python bench_tinycolors.py --output results.json    # also save them
+    python bench_tinycolors.py --compare baseline.json --tolerance 0.25
+    python bench_tinycolors.py --output baseline.json   # refresh the baseline
+
+The exit status is 1 if any regression was found, 0 otherwise.
+"""
+
+import argparse
+import builtins
+import json
+import os
+import platform
+import sys
+import timeit
+from typing import Any, Callable, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from tinycolors import color, colorize, colortext, cinput, cprint, prettify, set_color_mode  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+class NullSink:
+    """A text stream that discards everything written to it."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+_sink = NullSink()
+
+
+def _no_input(prompt: Any = "") -> str:
+    return ""
+
+
+# Wide, shallow data: many small containers whose items are all leaves
+_ROWS = [{"id": i, "name": "user", "score": 1.5, "ok": True, "tags": None} for i in range(500)]
+_LISTS = [[i, i + 1, "x", None] for i in range(1000)]
+_TABLE = {f"k{i}": [i, 2.5, "v"] for i in range(500)}
+
+
+def _nest(depth: int) -> Any:
+    """Builds ``depth`` levels of alternating lists, dicts and tuples."""
+    element: Any = 1
+    for i in range(depth):
+        element = ([element], {"k": element}, (element, 2))[i % 3]
+    return element
+
+
+# Nested far beyond the recursion limit
+_DEEP = _nest(5000)
+
+
+BENCHMARKS: dict[str, Callable[[], Any]] = {
+    "colorize color": lambda: colorize("text", color="red"),
+    "colorize color style bg": lambda: colorize("text", color="red", style="bold", bg="black"),
+    "colortext with bg": lambda: colortext("text", as_="bold red on black"),
+    "colortext combined": lambda: colortext("text", as_="bold red"),
+    "colortext color": lambda: colortext("text", as_="red"),
+    "colortext style": lambda: colortext("text", as_="bold"),
+    "colortext parsed": lambda: colortext("text", as_="bold italic bright cyan on blue"),
+    "cprint null sink": lambda: cprint("text", as_="bold red", file=_sink),
+    "cprint legacy null sink": lambda: cprint("text", color="red", style="bold", file=_sink),
+    "attribute chain": lambda: color.bold.red,
+    "attribute chain bg": lambda: color.bg.bright.red,
+    "cinput prompt": lambda: cinput("Name: ", as_="bold blue"),
+    "cinput legacy prompt": lambda: cinput("Name: ", color="blue", style="bold"),
+    "prettify wide rows": lambda: prettify(_ROWS),
+    "prettify wide lists": lambda: prettify(_LISTS),
+    "prettify wide table": lambda: prettify(_TABLE),
+    "prettify deep nesting": lambda: prettify(_DEEP),
+}
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> float:
+    """Returns the best time per call of ``func`` in nanoseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(names: Optional[list[str]] = None, repeat: int = 5, min_time: float = 0.2) -> dict[str, Any]:
+    """Runs the selected benchmarks (default: all) and returns the results as a JSON-ready dict."""
+    # Benchmark the colored paths even when stdout is not a terminal.
+    set_color_mode("always")
+    original_input = builtins.input
+    builtins.input = _no_input
+    try:
+        results = {
+            name: round(measure(BENCHMARKS[name], repeat, min_time), 1)
+            for name in (names or BENCHMARKS)
+        }
+    finally:
+        builtins.input = original_input
+        set_color_mode("auto")
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "unit": "ns/call",
+        "results": results,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """
+    Compares ``results`` against ``baseline``.
+
+    Returns a message for every benchmark that is more than ``tolerance``
+    (a fraction, e.g. 0.25 for 25%) slower than its baseline. Benchmarks
+    missing from either side are ignored.
+    """
+    regressions = []
+    for name, current in results["results"].items():
+        expected = baseline["results"].get(name)
+        if not expected:
+            continue
+        ratio = current / expected
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {current:.1f} ns vs {expected:.1f} ns baseline ({ratio - 1:+.0%})")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", metavar="NAME", help="benchmarks to run (default: all)")
+    parser.add_argument("--output", "-o", help="write results to this JSON file")
+    parser.add_argument("--compare", "-c", nargs="?", const=DEFAULT_BASELINE, metavar="BASELINE",
+                        help="compare against a baseline JSON file (default: baseline.json next to this script)")
+    parser.add_argument("--tolerance", "-t", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown as a fraction (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per benchmark (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="approximate seconds per repeat (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+
+    results = run(args.names, args.repeat, args.min_time)
+    width = max(map(len, results["results"]))
+    for name, value in results["results"].items():
+        print(f"{name:<{width}}  {value:>10.1f} ns")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+import os
+
+# The suite checks the exact escape codes tinycolors emits, while pytest
+# captures stdout through a pipe. Force colors on so detection does not
+# switch them off.
+os.environ["FORCE_COLOR"] = "3"
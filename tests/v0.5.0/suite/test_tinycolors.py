@@ -15,6 +15,13 @@ Test Coverage:
 - Edge cases and integration scenarios
 """
 
+import gc
+import os
+import re
+import subprocess
+import sys
+import time
+import weakref
 import pytest # type: ignore
 from io import StringIO
 from unittest.mock import patch, MagicMock
@@ -24,7 +31,12 @@ from tinycolors import (
     # Functions
     colorize,
     colortext,
+    colorize_many,
+    colortext_many,
     cprint,
+    ColorWriter,
+    get_writer,
+    set_writer,
     cinput,
     # Color classes
     clib,
@@ -41,6 +53,26 @@ from tinycolors import (
     StyleNotFoundError,
     # Type definitions
     ColorOptions,
+    # Style specs
+    Style,
+    StyleSpec,
+    parse_style,
+    render_spans,
+    resolve_parts,
+    # SGR encoding
+    compact_sgr_enabled,
+    set_compact_sgr,
+    strip_ansi,
+    visible_len,
+    # Terminal detection
+    DEPTH_NONE,
+    DEPTH_16,
+    DEPTH_256,
+    DEPTH_TRUECOLOR,
+    color_depth,
+    colors_enabled,
+    set_color_mode,
+    resolve_style,
 )
 
 
@@ -239,6 +271,24 @@ class TestColorizeDefaults:
         assert "test" in result
 
 
+class TestColorizePrefixCache:
+    """Test that colorize resolves each argument combination once."""
+
+    def test_colorize_uses_cache(self):
+        """Test repeated colorize calls hit the prefix cache."""
+        resolve_parts.cache_clear()
+        colorize("a", color="red", style="bold")
+        colorize("b", color="red", style="bold")
+        info = resolve_parts.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_colorize_ordering_is_preserved(self):
+        """Test the background, foreground, style ordering of colorize."""
+        result = colorize("test", color="white", style="bold", bg="red")
+        assert result == "\033[41m\033[37m\033[1mtest\033[0m"
+
+
 class TestColorizeErrors:
     """Test error handling in colorize function."""
 
@@ -432,6 +482,373 @@ class TestColortextErrors:
             colortext("test", as_="Bold Red")  # Capital B
 
 
+class TestColortextParser:
+    """Test the style spec grammar behind colortext."""
+
+    def test_parser_matches_every_map_entry(self):
+        """Test parsed specs reproduce every predefined map entry."""
+        for table in (COMBINED_STYLES_WITH_BG, COMBINED_STYLES, COLOR_MAP, STYLE_MAP):
+            for spec, ansi_code in table.items():
+                assert resolve_style(spec) == ansi_code
+
+    def test_colortext_multiple_styles_with_background(self):
+        """Test any mix of styles, foreground and background."""
+        result = colortext("test", as_="bold italic red on bright blue")
+        assert result == "\033[1m\033[3m\033[31m\033[104mtest\033[0m"
+
+    def test_colortext_combination_outside_maps(self):
+        """Test combinations that are not predefined in the maps."""
+        assert "underline cyan on gray" not in COMBINED_STYLES_WITH_BG
+        result = colortext("test", as_="underline cyan on gray")
+        assert result == "\033[4m\033[36m\033[100mtest\033[0m"
+
+    def test_colortext_background_only(self):
+        """Test a spec with only a background color."""
+        assert colortext("test", as_="on red") == "\033[41mtest\033[0m"
+
+    def test_colortext_extra_whitespace(self):
+        """Test that surrounding and repeated whitespace is ignored."""
+        assert colortext("test", as_="  bold   red ") == colortext("test", as_="bold red")
+
+    def test_parse_style_returns_parts(self):
+        """Test parse_style splits styles, foreground and background."""
+        spec = parse_style("bold dim bright green on black")
+        assert spec == StyleSpec(("1", "2"), "92", "40")
+        assert spec.params == ("1", "2", "92", "40")
+
+    @pytest.mark.parametrize("spec", [
+        "", "on", "red blue", "bold on", "red on blue green", "bright", "on bright",
+    ])
+    def test_parse_style_rejects_bad_specs(self, spec):
+        """Test malformed specs raise StyleNotFoundError."""
+        with pytest.raises(StyleNotFoundError):
+            parse_style(spec)
+
+
+class TestExtendedColors:
+    """Test 256-color and truecolor support."""
+
+    def test_palette_colors_in_specs(self):
+        """Test color(n) selects the 256-color palette."""
+        assert colortext("test", as_="color(208)") == "\033[38;5;208mtest\033[0m"
+        assert colortext("test", as_="bold color(15) on color(0)") == "\033[1m\033[38;5;15m\033[48;5;0mtest\033[0m"
+
+    @pytest.mark.parametrize("spec", ["rgb(255,128,0)", "rgb(255, 128, 0)", "#ff8000", "#FF8000"])
+    def test_truecolor_in_specs(self, spec):
+        """Test rgb() and hex colors select truecolor."""
+        assert resolve_style(spec) == "\033[38;2;255;128;0m"
+        assert resolve_style(f"on {spec}") == "\033[48;2;255;128;0m"
+
+    def test_extended_colors_in_colorize(self):
+        """Test colorize accepts extended colors for color and bg."""
+        result = colorize("test", color="#00ff00", style="bold", bg="color(17)")
+        assert result == "\033[48;5;17m\033[38;2;0;255;0m\033[1mtest\033[0m"
+
+    def test_palette_tables(self):
+        """Test the precomputed 256-color tables."""
+        from tinycolors.styles import FG_256, BG_256
+        assert len(FG_256) == len(BG_256) == 256
+        assert FG_256[196] == "\033[38;5;196m"
+        assert BG_256[196] == "\033[48;5;196m"
+
+    def test_truecolor_codes_are_cached(self):
+        """Test truecolor codes are built once per RGB triple."""
+        from tinycolors.styles import truecolor_code
+        assert truecolor_code("38", 1, 2, 3) is truecolor_code("38", 1, 2, 3)
+
+    @pytest.mark.parametrize("spec", ["color(256)", "rgb(256,0,0)", "#12345", "#gggggg", "rgb(1,2)", "on color(999)"])
+    def test_invalid_extended_colors_in_specs(self, spec):
+        """Test out-of-range and malformed colors are rejected."""
+        with pytest.raises(StyleNotFoundError):
+            resolve_style(spec)
+
+    @pytest.mark.parametrize("value", ["color(256)", "rgb(0,0,300)", "#12"])
+    def test_invalid_extended_colors_in_colorize(self, value):
+        """Test colorize rejects invalid extended colors."""
+        with pytest.raises(ColorNotFoundError):
+            colorize("test", color=value)
+        with pytest.raises(ColorNotFoundError):
+            colorize("test", bg=value)
+
+
+class TestStyleCache:
+    """Test the bounded LRU cache behind resolve_style."""
+
+    def setup_method(self):
+        resolve_style.cache_clear()
+
+    def test_cache_counts_hits_and_misses(self):
+        """Test repeated specs are served from the cache."""
+        colortext("a", as_="bold red")
+        colortext("b", as_="bold red")
+        colortext("c", as_="italic cyan")
+        info = resolve_style.cache_info()
+        assert info.hits == 1
+        assert info.misses == 2
+        assert info.currsize == 2
+
+    def test_cache_is_bounded(self):
+        """Test the cache has a fixed maximum size."""
+        assert resolve_style.cache_info().maxsize is not None
+
+    def test_errors_are_not_cached(self):
+        """Test invalid specs raise on every call."""
+        for _ in range(2):
+            with pytest.raises(StyleNotFoundError):
+                colortext("test", as_="bold notacolor")
+        assert resolve_style.cache_info().currsize == 0
+
+
+class TestStyleObjects:
+    """Test precompiled Style objects."""
+
+    def test_style_applies_prefix_and_reset(self):
+        """Test calling a Style wraps text in its codes."""
+        style = Style("bold red on black")
+        assert style("test") == "\033[1m\033[31m\033[40mtest\033[0m"
+
+    def test_style_matches_colortext(self):
+        """Test a Style produces the same output as colortext."""
+        for spec in ("red", "bold", "italic bright cyan", "underline white on red"):
+            assert Style(spec)(123) == colortext(123, as_=spec)
+
+    def test_style_is_interned(self):
+        """Test equal specs return the same object."""
+        assert Style("bold red") is Style("bold red")
+        assert Style("bold red") is Style("  bold   red ")
+        assert Style(Style("bold red")) is Style("bold red")
+
+    def test_style_has_slots(self):
+        """Test Style instances do not carry a __dict__."""
+        style = Style("bold red")
+        assert not hasattr(style, "__dict__")
+        with pytest.raises(AttributeError):
+            style.extra = True
+
+    def test_style_exposes_codes(self):
+        """Test the stored prefix, reset and parsed parts."""
+        style = Style("bold red")
+        assert style.prefix == "\033[1m\033[31m"
+        assert style.reset == "\033[0m"
+        assert style.parts == StyleSpec(("1",), "31", None)
+        assert str(style) == style.prefix
+        assert repr(style) == "Style('bold red')"
+
+    def test_style_accepted_by_colortext(self):
+        """Test colortext accepts a Style as as_."""
+        assert colortext("test", as_=Style("bold red")) == colortext("test", as_="bold red")
+
+    def test_style_validates_once(self):
+        """Test an invalid spec raises at construction."""
+        with pytest.raises(StyleNotFoundError):
+            Style("bold notacolor")
+
+
+class TestBatchColorize:
+    """Test colorize_many and colortext_many."""
+
+    def test_colortext_many_returns_list(self):
+        """Test each item is colored like colortext."""
+        items = ["a", 1, None]
+        assert colortext_many(items, as_="bold red") == [colortext(i, as_="bold red") for i in items]
+
+    def test_colortext_many_joined(self):
+        """Test joining the colored items with a separator."""
+        result = colortext_many(["a", "b", "c"], as_="italic cyan", sep=", ")
+        assert result == ", ".join(colortext(i, as_="italic cyan") for i in "abc")
+
+    def test_colorize_many_matches_colorize(self):
+        """Test colorize_many matches colorize for each item."""
+        result = colorize_many(range(3), color="red", style="bold", bg="black")
+        assert result == [colorize(i, color="red", style="bold", bg="black") for i in range(3)]
+
+    def test_many_accepts_generators(self):
+        """Test single-pass iterables are supported."""
+        result = colorize_many((str(i) for i in range(3)), color="green", sep="")
+        assert result == "".join(colorize(i, color="green") for i in range(3))
+
+    def test_many_empty_input(self):
+        """Test empty inputs produce empty results."""
+        assert colortext_many([], as_="red") == []
+        assert colortext_many([], as_="red", sep=", ") == ""
+
+    def test_many_resolves_errors_up_front(self):
+        """Test an invalid style raises before any item is processed."""
+        with pytest.raises(StyleNotFoundError):
+            colortext_many(["a"], as_="notastyle")
+        with pytest.raises(ColorNotFoundError):
+            colorize_many(["a"], color="notacolor")
+
+    def test_many_numpy_string_array(self):
+        """Test the vectorized path for NumPy string arrays."""
+        np = pytest.importorskip("numpy")
+        labels = np.array([["a", "b"], ["c", "d"]])
+        result = colortext_many(labels, as_="bold red")
+        assert result.shape == labels.shape
+        assert result.tolist() == [[colortext(i, as_="bold red") for i in row] for row in labels.tolist()]
+        assert colortext_many(labels, as_="red", sep=" ") == " ".join(colortext(i, as_="red") for i in "abcd")
+
+
+def render_cells(output):
+    """Replays SGR codes and returns each visible character with its attributes."""
+    off = {"22": {"1", "2"}, "23": {"3"}, "24": {"4"}, "25": {"5", "6"}, "27": {"7"}, "28": {"8"}, "29": {"9"}}
+    attrs, fg, bg = set(), None, None
+    cells = []
+    for code, char in re.findall(r"\033\[([\d;]*)m|(.)", output, re.S):
+        if char:
+            cells.append((char, frozenset(attrs), fg, bg))
+            continue
+        for param in code.split(";"):
+            if param in ("", "0"):
+                attrs, fg, bg = set(), None, None
+            elif param in off:
+                attrs -= off[param]
+            elif param == "39":
+                fg = None
+            elif param == "49":
+                bg = None
+            elif len(param) == 1:
+                attrs.add(param)
+            elif param.startswith(("4", "10")):
+                bg = param
+            else:
+                fg = param
+    return cells, (attrs, fg, bg)
+
+
+class TestRenderSpans:
+    """Test the SGR state-diffing span renderer."""
+
+    SPANS = [
+        ("Error: ", "bold red"),
+        ("disk ", "red"),
+        ("full", "bold red on black"),
+        (" at ", None),
+        ("/var", "underline dim red"),
+        ("/log", "dim red"),
+        ("!", "bold italic bright white on red"),
+        (" done", "italic"),
+    ]
+
+    def test_render_spans_matches_naive_output(self):
+        """Test the rendered text looks the same as concatenated colortext calls."""
+        naive = "".join(colortext(t, as_=s) if s else t for t, s in self.SPANS)
+        assert render_cells(render_spans(self.SPANS))[0] == render_cells(naive)[0]
+
+    def test_render_spans_emits_fewer_bytes(self):
+        """Test redundant codes are not repeated."""
+        naive = "".join(colortext(t, as_=s) if s else t for t, s in self.SPANS)
+        assert len(render_spans(self.SPANS)) < len(naive)
+
+    def test_render_spans_single_final_reset(self):
+        """Test the output ends in a clean state with exactly one reset."""
+        output = render_spans([("a", "bold red"), ("b", "bold red"), ("c", "bold red")])
+        assert output == "\033[1m\033[31mabc\033[0m"
+        assert render_cells(output)[1] == (set(), None, None)
+
+    def test_render_spans_only_emits_changes(self):
+        """Test only the changed attribute is emitted between segments."""
+        output = render_spans([("a", "bold red"), ("b", "bold green")])
+        assert output == "\033[1m\033[31ma\033[32mb\033[0m"
+
+    @pytest.mark.parametrize("before,after", [
+        ("bold dim red", "dim red"),
+        ("blink fast_blink red", "blink red"),
+    ])
+    def test_render_spans_shared_off_codes(self, before, after):
+        """Test styles switched off together with a sibling are restored."""
+        spans = [("a", before), ("b", after)]
+        naive = "".join(colortext(t, as_=s) for t, s in spans)
+        assert render_cells(render_spans(spans))[0] == render_cells(naive)[0]
+
+    def test_render_spans_plain_text(self):
+        """Test unstyled spans and empty inputs."""
+        assert render_spans([("plain", None)]) == "plain"
+        assert render_spans([]) == ""
+
+    def test_render_spans_accepts_style_objects(self):
+        """Test Style objects are accepted as span styles."""
+        assert render_spans([("a", Style("bold red"))]) == colortext("a", as_="bold red")
+
+    def test_render_spans_invalid_style(self):
+        """Test an invalid span style raises StyleNotFoundError."""
+        with pytest.raises(StyleNotFoundError):
+            render_spans([("a", "notastyle")])
+        with pytest.raises(StyleNotFoundError):
+            render_spans([("a", 42)])
+
+    def test_render_spans_distinct_styles_are_bounded(self):
+        """Test a gradient of distinct span styles is not interned like Style objects."""
+        from tinycolors.styles import STYLE_CACHE_SIZE, _INTERNED_SPECS, _parse_span_style
+        interned = len(_INTERNED_SPECS)
+        spans = [("x", f"rgb({n % 256},{n // 256 % 256},0)") for n in range(3 * STYLE_CACHE_SIZE)]
+        output = render_spans(spans)
+        assert output.count("\033[38;2;") == len(spans)
+        assert len(_INTERNED_SPECS) == interned
+        assert _parse_span_style.cache_info().currsize <= STYLE_CACHE_SIZE
+
+
+class TestCompactSGR:
+    """Test the compact single-CSI encoding mode."""
+
+    def setup_method(self):
+        set_compact_sgr(True)
+
+    def teardown_method(self):
+        set_compact_sgr(False)
+
+    def test_colortext_compact(self):
+        """Test colortext merges its parameters."""
+        assert colortext("test", as_="bold red on black") == "\033[1;31;40mtest\033[0m"
+
+    def test_colorize_compact(self):
+        """Test colorize merges its parameters in its own order."""
+        assert colorize("test", color="red", style="bold", bg="black") == "\033[40;31;1mtest\033[0m"
+
+    def test_style_objects_are_reencoded(self):
+        """Test interned Style objects follow the mode."""
+        style = Style("bold red")
+        assert style("test") == "\033[1;31mtest\033[0m"
+        set_compact_sgr(False)
+        assert style("test") == "\033[1m\033[31mtest\033[0m"
+
+    def test_color_chains_compact(self):
+        """Test color class chains merge their codes."""
+        assert color.bold.red == "\033[1;31m"
+        assert color.red == "\033[31m"
+
+    def test_combined_maps_compact(self):
+        """Test the combined maps are re-encoded and restored."""
+        assert COMBINED_STYLES["bold red"] == "\033[1;31m"
+        assert COMBINED_STYLES_WITH_BG["bold red on black"] == "\033[1;31;40m"
+        set_compact_sgr(False)
+        assert COMBINED_STYLES["bold red"] == "\033[1m\033[31m"
+        assert COMBINED_STYLES_WITH_BG["bold red on black"] == "\033[1m\033[31m\033[40m"
+
+    def test_render_spans_compact(self):
+        """Test span transitions are merged too."""
+        output = render_spans([("a", "bold red"), ("b", "italic green")])
+        assert output == "\033[1;31ma\033[0;3;32mb\033[0m"
+
+    def test_environment_variable(self):
+        """Test TINYCOLORS_COMPACT enables compact mode at import."""
+        code = (
+            "import tinycolors as t; print(t.compact_sgr_enabled(), repr(t.colortext('x', as_='bold red')), "
+            "repr(t.COMBINED_STYLES['bold red']), repr(t.COMBINED_STYLES_WITH_BG['bold red on black']))"
+        )
+        env = dict(os.environ, TINYCOLORS_COMPACT="1")
+        output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+        assert output.strip() == (
+            "True '\\x1b[1;31mx\\x1b[0m' '\\x1b[1;31m' '\\x1b[1;31;40m'"
+        )
+
+    def test_default_mode_is_not_compact(self):
+        """Test compact mode is off unless requested."""
+        set_compact_sgr(False)
+        assert not compact_sgr_enabled()
+        assert colortext("test", as_="bold red") == "\033[1m\033[31mtest\033[0m"
+
+
 # =========================================================================
 # Test Suite for cprint() Function
 # =========================================================================
@@ -573,6 +990,276 @@ class TestCprintKwargs:
         assert kwargs.get('file') == output
 
 
+class TestColorWriter:
+    """Test the buffered ColorWriter."""
+
+    def teardown_method(self):
+        set_writer(None)
+
+    def test_writer_buffers_until_flush(self):
+        """Test writes stay in the buffer until flushed."""
+        stream = StringIO()
+        writer = ColorWriter(stream, buffer_size=1024, flush_interval=60)
+        writer.cprint("test", as_="bold red")
+        assert stream.getvalue() == ""
+        writer.flush()
+        assert stream.getvalue() == colortext("test", as_="bold red") + "\n"
+
+    def test_writer_flushes_on_size(self):
+        """Test the buffer is written once it reaches buffer_size."""
+        stream = StringIO()
+        writer = ColorWriter(stream, buffer_size=10, flush_interval=60)
+        writer.write("12345")
+        assert stream.getvalue() == ""
+        writer.write("67890")
+        assert stream.getvalue() == "1234567890"
+
+    def test_writer_flushes_on_interval(self):
+        """Test a write after flush_interval triggers a flush."""
+        stream = StringIO()
+        writer = ColorWriter(stream, buffer_size=1024, flush_interval=0)
+        writer.write("now")
+        assert stream.getvalue() == "now"
+
+    @staticmethod
+    def wait_for(condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_writer_flushes_at_deadline(self):
+        """Test a single write reaches the stream after flush_interval, without another write."""
+        stream = StringIO()
+        writer = ColorWriter(stream, buffer_size=1024, flush_interval=0.05)
+        writer.write("line\n")
+        assert stream.getvalue() == ""
+        assert self.wait_for(lambda: stream.getvalue() == "line\n")
+        writer.write("next\n")
+        assert self.wait_for(lambda: stream.getvalue() == "line\nnext\n")
+
+    def test_writer_kept_until_flushed(self):
+        """Test a writer dropped with buffered text is kept alive and flushed at its deadline."""
+        stream = StringIO()
+        writer = ColorWriter(stream, buffer_size=1024, flush_interval=0.2)
+        writer.write("pending")
+        ref = weakref.ref(writer)
+        del writer
+        gc.collect()
+        assert ref() is not None
+        assert self.wait_for(lambda: stream.getvalue() == "pending")
+        assert self.wait_for(lambda: gc.collect() is not None and ref() is None)
+
+    def test_writer_matches_cprint_arguments(self):
+        """Test legacy and combined style arguments."""
+        stream = StringIO()
+        with ColorWriter(stream, flush_interval=60) as writer:
+            writer.cprint("a", color="red", style="bold", end="")
+            writer.cprint("b", as_="italic cyan", end=None)
+            writer.colortext("c", as_="red")
+        expected = colorize("a", color="red", style="bold") + colortext("b", as_="italic cyan") + "\n"
+        assert stream.getvalue() == expected + colortext("c", as_="red")
+
+    def test_writer_flush_keyword(self):
+        """Test flush=True writes immediately."""
+        stream = StringIO()
+        writer = ColorWriter(stream, flush_interval=60)
+        writer.cprint("test", color="red", flush=True)
+        assert stream.getvalue() == colorize("test", color="red") + "\n"
+
+    @patch('builtins.print')
+    def test_cprint_routes_through_active_writer(self, mock_print):
+        """Test cprint uses the process-wide writer when one is set."""
+        stream = StringIO()
+        writer = ColorWriter(stream, flush_interval=60)
+        assert set_writer(writer) is None
+        assert get_writer() is writer
+        cprint("one", as_="bold red")
+        cprint("two", color="green", end="")
+        mock_print.assert_not_called()
+        writer.flush()
+        assert stream.getvalue() == colortext("one", as_="bold red") + "\n" + colorize("two", color="green")
+
+    @patch('builtins.print')
+    def test_cprint_with_file_bypasses_writer(self, mock_print):
+        """Test an explicit file still goes through print()."""
+        writer = ColorWriter(StringIO(), flush_interval=60)
+        set_writer(writer)
+        target = StringIO()
+        cprint("test", color="red", file=target)
+        mock_print.assert_called_once()
+
+    def test_set_writer_flushes_previous(self):
+        """Test replacing the active writer flushes the old one."""
+        stream = StringIO()
+        writer = ColorWriter(stream, flush_interval=60)
+        set_writer(writer)
+        writer.write("pending")
+        assert set_writer(None) is writer
+        assert stream.getvalue() == "pending"
+
+
+class TestStripAnsi:
+    """Test strip_ansi and visible_len."""
+
+    def test_strip_colortext(self):
+        """Test codes from colortext, colorize and Style are removed."""
+        assert strip_ansi(colortext("Error", as_="bold red on black")) == "Error"
+        assert strip_ansi(colorize("Info", color="#00ff00", bg="color(17)")) == "Info"
+        assert strip_ansi(Style("italic cyan")("x") + " y") == "x y"
+
+    def test_strip_compact_and_spans(self):
+        """Test compact codes and span transitions are removed."""
+        set_compact_sgr(True)
+        try:
+            text = render_spans([("a", "bold red"), ("b", "italic green"), ("c", None)])
+        finally:
+            set_compact_sgr(False)
+        assert strip_ansi(text) == "abc"
+
+    def test_strip_tprint_output(self):
+        """Test prettified output keeps only its visible text."""
+        from tinycolors.tprint import prettify
+        assert strip_ansi(prettify({"a": [1, True, None]})) == '{"a": [1, True, None]}'
+
+    def test_plain_text_is_returned_as_is(self):
+        """Test strings without escapes short-circuit."""
+        text = "plain text"
+        assert strip_ansi(text) is text
+        assert visible_len(text) == len(text)
+
+    def test_visible_len(self):
+        """Test visible_len ignores escape codes."""
+        assert visible_len(colortext("Error", as_="bold red on black")) == 5
+        assert visible_len("\033[1;38;2;1;2;3mab\033[0mc") == 3
+        assert visible_len("") == 0
+
+
+class FakeTTY(StringIO):
+    """A StringIO that claims to be a terminal."""
+
+    def isatty(self):
+        return True
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Removes every variable that influences color detection."""
+    for name in ("FORCE_COLOR", "NO_COLOR", "TERM", "COLORTERM"):
+        monkeypatch.delenv(name, raising=False)
+    set_color_mode("auto")
+    yield monkeypatch
+    set_color_mode("auto")
+
+
+class TestColorDetection:
+    """Test terminal color support detection."""
+
+    def test_tty_has_colors(self, clean_env):
+        """Test a TTY supports the basic colors."""
+        assert color_depth(FakeTTY()) == DEPTH_16
+
+    def test_pipe_has_no_colors(self, clean_env):
+        """Test a non-TTY stream is detected as colorless."""
+        assert color_depth(StringIO()) == DEPTH_NONE
+        assert not colors_enabled(StringIO())
+
+    @pytest.mark.parametrize("env,expected", [
+        ({"TERM": "xterm-256color"}, DEPTH_256),
+        ({"COLORTERM": "truecolor"}, DEPTH_TRUECOLOR),
+        ({"COLORTERM": "24bit", "TERM": "xterm-256color"}, DEPTH_TRUECOLOR),
+        ({"TERM": "dumb"}, DEPTH_NONE),
+        ({"NO_COLOR": "1"}, DEPTH_NONE),
+    ])
+    def test_environment_on_tty(self, clean_env, env, expected):
+        """Test TERM, COLORTERM and NO_COLOR on a TTY."""
+        for name, value in env.items():
+            clean_env.setenv(name, value)
+        assert color_depth(FakeTTY()) == expected
+
+    @pytest.mark.parametrize("value,expected", [
+        ("1", DEPTH_16), ("", DEPTH_16), ("2", DEPTH_256), ("3", DEPTH_TRUECOLOR), ("0", DEPTH_NONE),
+    ])
+    def test_force_color(self, clean_env, value, expected):
+        """Test FORCE_COLOR overrides TTY detection and NO_COLOR."""
+        clean_env.setenv("FORCE_COLOR", value)
+        clean_env.setenv("NO_COLOR", "1")
+        assert color_depth(StringIO()) == expected
+
+    def test_detection_is_cached_per_stream(self, clean_env):
+        """Test a stream is only inspected once."""
+        calls = []
+
+        class CountingTTY(FakeTTY):
+            def isatty(self):
+                calls.append(1)
+                return True
+
+        tty, other = CountingTTY(), CountingTTY()
+        for _ in range(3):
+            color_depth(tty)
+            color_depth(other)
+        assert len(calls) == 2
+
+    def test_color_modes(self, clean_env):
+        """Test the always and never modes ignore the stream."""
+        set_color_mode("never")
+        assert not colors_enabled(FakeTTY())
+        set_color_mode("always")
+        assert colors_enabled(StringIO())
+        with pytest.raises(ValueError):
+            set_color_mode("sometimes")
+
+
+class TestNoColorFastPath:
+    """Test that colorless streams get plain text."""
+
+    @pytest.fixture(autouse=True)
+    def no_color(self, clean_env):
+        clean_env.setenv("NO_COLOR", "1")
+
+    def test_colorize_plain(self):
+        """Test colorize returns str(text)."""
+        assert colorize(123, color="red", style="bold") == "123"
+
+    def test_colortext_plain(self):
+        """Test colortext returns str(text)."""
+        assert colortext(1.5, as_="bold red on black") == "1.5"
+
+    def test_many_plain(self):
+        """Test the batch functions return plain strings."""
+        assert colortext_many([1, 2], as_="red") == ["1", "2"]
+        assert colorize_many([1, 2], color="red", sep=", ") == "1, 2"
+
+    @patch('builtins.print')
+    def test_cprint_plain(self, mock_print):
+        """Test cprint prints the text as is."""
+        cprint(42, as_="bold red", end="")
+        mock_print.assert_called_once_with(42, end="")
+
+    def test_cprint_checks_target_file(self, clean_env):
+        """Test cprint detects support for the file it writes to."""
+        clean_env.delenv("NO_COLOR")
+        tty, pipe = FakeTTY(), StringIO()
+        cprint("a", color="red", file=tty)
+        cprint("a", color="red", file=pipe)
+        assert tty.getvalue() == "\033[31ma\033[0m\n"
+        assert pipe.getvalue() == "a\n"
+
+    def test_writer_plain(self):
+        """Test ColorWriter drops codes for a colorless stream."""
+        stream = StringIO()
+        with ColorWriter(stream) as writer:
+            writer.cprint("test", as_="bold red")
+        assert stream.getvalue() == "test\n"
+
+    def test_tprint_plain(self, capsys):
+        """Test tprint prints the prettified element without escape codes."""
+        from tinycolors.tprint import tprint
+        tprint({"a": [1, 2]})
+        assert capsys.readouterr().out == '{"a": [1, 2]}\n'
+
+
 # =========================================================================
 # Test Suite for cinput() Function
 # =========================================================================
@@ -884,6 +1571,27 @@ class TestColorStyleClassValues:
         """Test color.striked style value."""
         assert color.striked._cls.value == "\033[9m"
 
+    @pytest.mark.parametrize("node", ["bold", "dim", "italic", "underline", "blinking",
+                                      "fast_blinking", "inverted", "hidden", "striked"])
+    def test_style_color_combinations(self, node):
+        """Test every style node combines with every palette color."""
+        set_compact_sgr(False)
+        proxy = getattr(color, node)
+        for color_name in clib.palette:
+            assert getattr(proxy, color_name) == proxy._cls.value + getattr(clib, color_name)
+
+    def test_style_color_combination_is_cached(self):
+        """Test a combination is stored on the style class after first use."""
+        assert color.underline.magenta == "\033[4m\033[35m"
+        assert color.underline._cls.__dict__["magenta"] == "\033[4m\033[35m"
+
+    def test_style_node_unknown_attribute(self):
+        """Test names outside the palette still raise AttributeError."""
+        with pytest.raises(AttributeError):
+            color.bold.gray
+        with pytest.raises(AttributeError):
+            color.bold.does_not_exist
+
 
 class TestNodeProxyRepr:
     """Test NodeProxy repr and str methods."""
@@ -1105,6 +1813,18 @@ class TestCombinedStylesMap:
         result = colortext("test", as_="bold red")
         assert "\033[0m" in result
 
+    def test_combined_styles_match_style_and_color_tables(self):
+        """Test the written-out COMBINED_STYLES is every style + color pair."""
+        from tinycolors.main import _STYLES_DICT, _COLORS_DICT
+        set_compact_sgr(False)
+        expected = {
+            f"{style_name} {color_name}": style_code + color_code
+            for style_name, style_code in _STYLES_DICT.items()
+            for color_name, color_code in _COLORS_DICT.items()
+        }
+        assert COMBINED_STYLES == expected
+        assert list(COMBINED_STYLES) == list(expected)
+
 
 class TestCombinedStylesWithBGMap:
     """Test COMBINED_STYLES_WITH_BG map completeness."""
@@ -1303,6 +2023,164 @@ class TestIntegration:
         assert "\033[37m" in result  # white fg
 
 
+# =========================================================================
+# Test Suite for Package Imports
+# =========================================================================
+
+class TestLazyImports:
+    """Test that optional submodules are only imported when used."""
+
+    def _run(self, code):
+        return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+
+    def test_import_does_not_load_tprint(self):
+        """Test importing tinycolors leaves tprint and importlib.metadata unloaded."""
+        code = "import sys, tinycolors; print('tinycolors.tprint' in sys.modules, 'importlib.metadata' in sys.modules)"
+        assert self._run(code) == "False False"
+
+    def test_lazy_name_loads_submodule(self):
+        """Test accessing a tprint name imports the submodule on demand."""
+        code = "import sys, tinycolors; f = tinycolors.prettify; print('tinycolors.tprint' in sys.modules, f.__module__)"
+        assert self._run(code) == "True tinycolors.tprint"
+
+    def test_lazy_names_resolve(self):
+        """Test lazily exported names are the submodule objects."""
+        import tinycolors
+        from tinycolors import tprint as tprint_module
+        assert tinycolors.tprint is tprint_module
+        assert tinycolors.prettify is tprint_module.prettify
+        assert tinycolors.prettify_string is tprint_module.prettify_string
+
+    def test_version(self):
+        """Test __version__ is available without being imported eagerly."""
+        import tinycolors
+        assert isinstance(tinycolors.__version__, str)
+        assert tinycolors.__version__
+
+    def test_all_is_explicit(self):
+        """Test every name in __all__ resolves and star-imports work."""
+        import tinycolors
+        for name in tinycolors.__all__:
+            assert hasattr(tinycolors, name), name
+        namespace = {}
+        exec("from tinycolors import *", namespace)
+        assert "colorize" in namespace and "prettify" in namespace
+
+    def test_unknown_attribute(self):
+        """Test unknown attributes still raise AttributeError."""
+        import tinycolors
+        with pytest.raises(AttributeError):
+            tinycolors.does_not_exist
+
+    def test_combined_styles_literal_is_lazy(self):
+        """Test the combined-styles Literal is only built on first access."""
+        code = ("import tinycolors, tinycolors.main as m; "
+                "print('COMBINED_STYLES_LITERAL' in vars(m), len(tinycolors.COMBINED_STYLES_LITERAL.__args__))")
+        assert self._run(code) == "False 240"
+
+    def test_combined_styles_literal_members(self):
+        """Test the Literal lists every combined style."""
+        import typing
+        from tinycolors import COMBINED_STYLES_LITERAL
+        assert set(typing.get_args(COMBINED_STYLES_LITERAL)) == set(COMBINED_STYLES) | set(COMBINED_STYLES_WITH_BG)
+
+
+class TestImportBudget:
+    """Test that importing tinycolors stays cheap."""
+
+    # Generous ceilings; a cached import currently takes about 8 ms and 0.75 MB.
+    IMPORT_SECONDS = 0.05
+    IMPORT_BYTES = 1_500_000
+
+    # Standard library modules tinycolors depends on are imported first, so
+    # only the cost of tinycolors itself is measured.
+    MEASURE = """
+import atexit, functools, os, re, sys, threading, time, tracemalloc, typing, weakref
+import __future__, importlib
+if sys.argv[1] == "memory":
+    tracemalloc.start()
+start = time.perf_counter()
+import tinycolors
+elapsed = time.perf_counter() - start
+print(tracemalloc.get_traced_memory()[0] if sys.argv[1] == "memory" else elapsed)
+"""
+
+    def _measure(self, what, cache_dir):
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=str(cache_dir))
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        cwd = os.path.dirname(os.path.dirname(os.path.abspath(__import__("tinycolors").__file__)))
+        output = subprocess.run([sys.executable, "-c", self.MEASURE, what], env=env, cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout
+        return float(output)
+
+    def test_import_time(self, tmp_path):
+        """Test a cached import of tinycolors stays within its time budget."""
+        self._measure("time", tmp_path)  # writes the bytecode cache
+        elapsed = min(self._measure("time", tmp_path) for _ in range(3))
+        assert elapsed < self.IMPORT_SECONDS, f"import took {elapsed * 1000:.1f} ms"
+
+    def test_import_memory(self, tmp_path):
+        """Test importing tinycolors stays within its memory budget."""
+        self._measure("time", tmp_path)
+        allocated = self._measure("memory", tmp_path)
+        assert allocated < self.IMPORT_BYTES, f"import allocated {allocated / 1e6:.2f} MB"
+
+
+class TestBenchmarkSuite:
+    """Test the benchmark runner in tests/v0.5.0/bench."""
+
+    @pytest.fixture
+    def bench(self):
+        import importlib.util
+        path = os.path.join(os.path.dirname(__file__), "..", "bench", "bench_tinycolors.py")
+        spec = importlib.util.spec_from_file_location("bench_tinycolors", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_baseline_covers_all_benchmarks(self, bench):
+        """Test the stored baseline has an entry for every benchmark."""
+        import json
+        with open(bench.DEFAULT_BASELINE, encoding="utf-8") as f:
+            baseline = json.load(f)
+        assert set(baseline["results"]) == set(bench.BENCHMARKS)
+
+    def test_benchmarks_run(self, bench):
+        """Test each benchmark callable runs."""
+        with patch("builtins.input", return_value=""):
+            for func in bench.BENCHMARKS.values():
+                func()
+
+    def test_run_returns_results(self, bench):
+        """Test run() returns a time per call for the selected benchmarks."""
+        results = bench.run(["colortext combined"], repeat=1, min_time=0.001)
+        assert list(results["results"]) == ["colortext combined"]
+        assert results["results"]["colortext combined"] > 0
+        assert results["unit"] == "ns/call"
+
+    def test_compare_detects_regressions(self, bench):
+        """Test compare() reports only slowdowns beyond the tolerance."""
+        baseline = {"results": {"a": 100.0, "b": 100.0, "c": 100.0}}
+        results = {"results": {"a": 120.0, "b": 130.0, "c": 50.0, "new": 1.0}}
+        regressions = bench.compare(results, baseline, tolerance=0.25)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("b: 130.0 ns vs 100.0 ns")
+        assert bench.compare(results, baseline, tolerance=0.5) == []
+
+    def test_main_writes_json_and_compares(self, bench, tmp_path, capsys):
+        """Test the command line saves results and fails on regressions."""
+        import json
+        output = tmp_path / "results.json"
+        args = ["colortext style", "--repeat", "1", "--min-time", "0.001", "--output", str(output)]
+        assert bench.main(args) == 0
+        assert "colortext style" in json.loads(output.read_text())["results"]
+
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"results": {"colortext style": 0.001}}))
+        assert bench.main(args + ["--compare", str(baseline)]) == 1
+        assert "regression" in capsys.readouterr().out
+
+
 # =========================================================================
 # Test Suite for Backward Compatibility
 # =========================================================================
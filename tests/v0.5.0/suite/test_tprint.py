@@ -0,0 +1,1582 @@
+"""
+Unit tests for the tinycolors.tprint pretty printer.
+
+Test Coverage:
+- prettify_string() tokenizing: plain text, quotes, escapes and brackets
+- find_closed_quotes() matching, including pathological inputs
+- Bracket coloring by depth, including deeply nested input
+- Strings inside containers
+- Scaling of prettify_string() on large inputs, by the characters it scans
+- iter_prettify() chunks and streaming tprint() output
+- Containers nested deeper than the recursion limit
+- Cycle markers and memoized rendering of shared containers
+- max_items, max_depth and max_string limits
+- Width-aware choice between the single-line and expanded layouts
+- Hex dumps of bytes, bytearray and memoryview
+- Records: dataclasses, namedtuples, attrs classes, __slots__ objects and the __tinycolors__ hook
+- Summaries of NumPy arrays and array.array
+- register_prettifier() and the cached type dispatch
+"""
+
+import abc
+import array
+import re
+import sys
+import tracemalloc
+from collections import namedtuple
+from dataclasses import dataclass, field
+from io import StringIO
+import pytest # type: ignore
+
+from tinycolors import clib, color, strip_ansi, set_color_mode, set_compact_sgr
+from tinycolors import tprint as tprint_module
+from tinycolors.tprint import (
+    color_bracket,
+    escape_internal_quotes,
+    find_closed_quotes,
+    get_bracket_colors,
+    get_container_color_index,
+    iter_prettify,
+    prettify,
+    prettify_array,
+    prettify_bytes,
+    prettify_quoted,
+    prettify_string,
+    register_prettifier,
+    tprint,
+)
+
+G = clib.green
+Y = clib.yellow
+R = clib.reset
+SYNTAX = str(color.italic.blue)
+
+
+@pytest.fixture(autouse=True)
+def default_encoding():
+    """Run every test with the default, non-compact escape codes."""
+    set_compact_sgr(False)
+
+
+def bracket(char: str, bracket_color: str) -> str:
+    return f"{bracket_color}{char}{R}"
+
+
+class ScanCounter:
+    """Wraps a compiled pattern and counts the characters its searches and matches pass over."""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.scanned = 0
+
+    def search(self, string, pos=0):
+        match = self.pattern.search(string, pos)
+        self.scanned += (match.end() if match else len(string)) - pos
+        return match
+
+    def match(self, string, pos=0):
+        match = self.pattern.match(string, pos)
+        if match:
+            self.scanned += match.end() - pos
+        return match
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Counts the characters scanned by the string tokenizer; returns a function giving the total."""
+    counters = []
+
+    def counted(pattern):
+        counters.append(ScanCounter(pattern))
+        return counters[-1]
+
+    for name in ("_SPECIAL_RE", "_QUOTE_OR_ESCAPE_RE"):
+        monkeypatch.setattr(tprint_module, name, counted(getattr(tprint_module, name)))
+    for table in (tprint_module._QUOTE_SCAN_RE, tprint_module._QUOTE_RUN_RE):
+        for char, pattern in list(table.items()):
+            monkeypatch.setitem(table, char, counted(pattern))
+    return lambda: sum(counter.scanned for counter in counters)
+
+
+# =========================================================================
+# Test Suite for prettify_string
+# =========================================================================
+
+class TestPrettifyString:
+    """Test the colored output of prettify_string()."""
+
+    def test_empty(self):
+        """Test an empty string stays empty."""
+        assert prettify_string("") == ""
+
+    def test_plain_text(self):
+        """Test text without numbers, keywords, quotes or brackets is unchanged."""
+        assert prettify_string("hello world") == "hello world"
+
+    def test_numbers_and_keywords(self):
+        """Test numbers are yellow and True/False/None are italic blue."""
+        assert prettify_string("x 1 2.5 True") == f"x {Y}1{R} {Y}2.5{R} {SYNTAX}True{R}"
+
+    def test_quoted_string(self):
+        """Test quoted strings are green, including their quotes."""
+        assert prettify_string('say "hi 1" now') == f'say {G}"hi 1"{R} now'
+        assert prettify_string("'a'") == f"{G}'a'{R}"
+
+    def test_escaped_quote_inside_string(self):
+        """Test an escaped quote does not close the string and is unescaped."""
+        assert prettify_string('"a\\"b"') == f'{G}"a"b"{R}'
+
+    def test_escaped_quote_outside_string(self):
+        """Test an escaped quote outside a string is plain text."""
+        assert prettify_string('\\"1') == f'\\"{Y}1{R}'
+
+    def test_stray_quote(self):
+        """Test a quote without a closing partner is plain text."""
+        assert prettify_string("it's 1") == f"it's {Y}1{R}"
+
+    def test_triple_quotes(self):
+        """Test doubled quotes inside a string don't close it."""
+        assert prettify_string('"""a"""') == f'{G}"""a"""{R}'
+        assert prettify_string('""') == f'{G}""{R}'
+
+    def test_other_quote_inside_string(self):
+        """Test the other quote character inside a string is part of it."""
+        assert prettify_string('"it\'s"') == f'{G}"it\'s"{R}'
+
+    def test_brackets(self):
+        """Test brackets are colored, with closing brackets one color further."""
+        assert prettify_string("[1]") == f"{bracket('[', clib.yellow)}{Y}1{R}{bracket(']', clib.cyan)}"
+
+    def test_nested_brackets(self):
+        """Test nested brackets of the same type use the next colors."""
+        expected = (bracket("[", clib.yellow) + bracket("[", clib.cyan)
+                    + bracket("]", clib.magenta) + bracket("]", clib.cyan))
+        assert prettify_string("[[]]") == expected
+
+    def test_brackets_inside_string(self):
+        """Test brackets inside a quoted string are not colored."""
+        assert prettify_string('"[x]"') == f'{G}"[x]"{R}'
+
+    def test_escaped_bracket(self):
+        """Test an escaped bracket is plain text."""
+        assert prettify_string("\\[x") == "\\[x"
+
+    def test_trailing_backslash(self):
+        """Test a backslash at the end of the string is kept."""
+        assert prettify_string("a\\") == "a\\"
+
+    def test_keyword_next_to_string(self):
+        """Test plain text is highlighted separately on each side of a string."""
+        assert prettify_string('True"x"None') == f'{SYNTAX}True{R}{G}"x"{R}{SYNTAX}None{R}'
+
+    @pytest.mark.parametrize("text", [
+        str({"a": [1, 2.5, None], "b": ("x", True), "c": {"d": "it's"}}),
+        "It's the user's 3rd retry (timeout=30.5s)",
+        '{"event": "login", "n": [1, 2, 3]}',
+    ])
+    def test_visible_text_is_unchanged(self, text):
+        """Test only escape codes are added to text without backslashes."""
+        assert strip_ansi(prettify_string(text)) == text
+
+
+class TestPrettifyStringScaling:
+    """Test prettify_string() takes linear time."""
+
+    SAMPLE = str([{"id": 12, "name": 'O\'Brien said "hi"', "tags": ["a", "b"], "ok": True}] * 10)
+
+    def make(self, size: int) -> str:
+        return (self.SAMPLE * (size // len(self.SAMPLE) + 1))[:size]
+
+    def test_linear_scaling(self, scans):
+        """Test the tokenizer passes over each character about once, at any size."""
+        for size in (20_000, 400_000):
+            start = scans()
+            prettify_string(self.make(size))
+            assert scans() - start <= 1.25 * size
+
+    def test_large_input(self):
+        """Test a 1 MB input is fully tokenized."""
+        text = self.make(1_000_000)
+        assert strip_ansi(prettify_string(text)) == text
+
+
+# =========================================================================
+# Test Suite for find_closed_quotes
+# =========================================================================
+
+class TestFindClosedQuotes:
+    """Test quote matching in find_closed_quotes()."""
+
+    def test_no_quotes(self):
+        """Test a string without quotes has no matches."""
+        assert find_closed_quotes("abc") == (set(), set())
+
+    def test_simple_pair(self):
+        """Test a single quoted string."""
+        assert find_closed_quotes('a "b" c') == ({2}, {4})
+
+    def test_multiple_pairs(self):
+        """Test several quoted strings of both kinds."""
+        assert find_closed_quotes("'a' \"b\"") == ({0, 4}, {2, 6})
+
+    def test_stray_quote(self):
+        """Test an unmatched quote is left out."""
+        assert find_closed_quotes("it's") == (set(), set())
+
+    def test_stray_quote_before_pair(self):
+        """Test a stray quote of one kind does not hide a pair of the other."""
+        assert find_closed_quotes("'x \"y\"") == ({3}, {5})
+
+    def test_escaped_quotes(self):
+        """Test escaped quotes neither open nor close a string."""
+        assert find_closed_quotes('\\"a"') == (set(), set())
+        assert find_closed_quotes('"a\\"b"') == ({0}, {5})
+
+    def test_triple_quotes(self):
+        """Test doubled quotes are skipped when looking for the closing quote."""
+        assert find_closed_quotes('"""a"""') == ({0}, {6})
+
+    def test_other_quote_inside(self):
+        """Test the other kind of quote inside a string is ignored."""
+        assert find_closed_quotes('"it\'s" \'x\'') == ({0, 7}, {5, 9})
+
+
+PATHOLOGICAL_INPUTS = {
+    "stray quote then text": lambda n: "'" + "x" * n,
+    "stray quote of each kind": lambda n: "'\"" + "it is " * (n // 6),
+    "prose with apostrophes": lambda n: "don't won't can't " * (n // 18),
+    "only quotes": lambda n: "'" * n,
+    "escaped quotes": lambda n: "\\'" * (n // 2),
+    "runs of three quotes": lambda n: "'''a" * (n // 4),
+    "mixed quotes and escapes": lambda n: "'\"\\" * (n // 3),
+}
+
+
+class TestQuoteMatchingPathological:
+    """Test quote matching stays linear on inputs that stress stray quotes."""
+
+    @pytest.mark.parametrize("func", [find_closed_quotes, prettify_string])
+    @pytest.mark.parametrize("name", list(PATHOLOGICAL_INPUTS))
+    def test_linear_scans(self, name, func, scans):
+        """Test each character is scanned a bounded number of times, however the quotes are placed."""
+        text = PATHOLOGICAL_INPUTS[name](100_000)
+        func(text)
+        # Once by the main scan, and to the end once more for a stray quote of each kind
+        assert scans() <= 3 * len(text), f"{name}: {scans() / len(text):.1f} scans per character"
+
+
+# =========================================================================
+# Test Suite for Bracket Coloring
+# =========================================================================
+
+class TestBracketColors:
+    """Test brackets are colored by nesting depth."""
+
+    def colors_of(self, text):
+        """Returns the color index of each bracket in prettify_string(text)."""
+        colors = get_bracket_colors()
+        output = prettify_string(text)
+        return [colors.index(code) for code, char in re.findall(r"(\033\[\d+m)([\[\](){}])", output)]
+
+    def test_color_cycle(self):
+        """Test opening brackets cycle through the five colors."""
+        assert self.colors_of("[" * 7) == [0, 1, 2, 3, 4, 0, 1]
+
+    def test_closing_bracket_is_one_further(self):
+        """Test a closing bracket uses the color after its opening bracket's depth."""
+        assert self.colors_of("[[]]") == [0, 1, 2, 1]
+
+    def test_types_count_separately(self):
+        """Test each bracket type has its own depth for opening brackets."""
+        assert self.colors_of("[({") == [0, 0, 0]
+
+    def test_closing_uses_position_in_whole_stack(self):
+        """Test closing brackets count all open brackets below their partner."""
+        assert self.colors_of("[({})]") == [0, 0, 0, 3, 2, 1]
+
+    def test_unmatched_closing_bracket(self):
+        """Test a closing bracket without a partner uses the first color."""
+        assert self.colors_of("]") == [0]
+        assert self.colors_of("[)") == [0, 0]
+
+    def test_mismatched_brackets(self):
+        """Test closing an outer bracket first, as in "[(]", keeps later colors consistent."""
+        assert self.colors_of("[(])") == [0, 0, 1, 1]
+        assert self.colors_of("[([]]") == [0, 0, 1, 3, 1]
+        assert self.colors_of("[(]{[)]}") == [0, 0, 1, 0, 0, 1, 2, 1]
+
+    @pytest.mark.parametrize("text", ["[({})]", "[(]{[)]}", "]][[(", "{[{]}]"])
+    def test_matches_color_bracket(self, text):
+        """Test prettify_string colors brackets like color_bracket() with a plain stack."""
+        stack = []
+        expected = []
+        for i, char in enumerate(text):
+            expected.append(color_bracket(char, stack))
+            bracket_type = {"(": "paren", ")": "paren", "[": "square", "]": "square"}.get(char, "curly")
+            if char in "([{":
+                stack.append((bracket_type, i))
+            else:
+                for k in range(len(stack) - 1, -1, -1):
+                    if stack[k][0] == bracket_type:
+                        stack.pop(k)
+                        break
+        assert prettify_string(text) == "".join(expected)
+
+    @pytest.fixture
+    def fenwick_steps(self, monkeypatch):
+        """Counts the steps of the bracket stack's Fenwick tree queries; returns a function giving the total."""
+        steps = [0]
+        count = tprint_module._BracketStack._count
+
+        def counting_count(stack, i):
+            steps[0] += bin(i).count("1")
+            return count(stack, i)
+
+        monkeypatch.setattr(tprint_module._BracketStack, "_count", counting_count)
+        return lambda: steps[0]
+
+    def test_deep_nesting_is_linear(self, fenwick_steps):
+        """Test properly nested brackets are colored without querying the tree, at any depth."""
+        text = "[" * 20_000 + "1" + "]" * 20_000
+        assert strip_ansi(prettify_string(text)) == text
+        assert fenwick_steps() == 0
+
+    @pytest.mark.parametrize("make", [
+        lambda n: "a([b) " * n,
+        lambda n: "(" * n + "[" + ")" * n,
+        lambda n: "{[(" * n + "}" * n + ")]" * n,
+    ], ids=["crossed", "outer-closed", "unmatched"])
+    def test_crossed_brackets_are_linear(self, make, fenwick_steps):
+        """Test closing outer brackets first costs O(log depth) per bracket, not O(depth)."""
+        text = make(20_000)
+        prettify_string(text)
+        brackets = sum(char in "()[]{}" for char in text)
+        # At most two queries per bracket, each of at most log2 steps
+        assert fenwick_steps() <= 2 * brackets * len(text).bit_length()
+
+
+# =========================================================================
+# Test Suite for Strings in Containers
+# =========================================================================
+
+STRINGS = [
+    "",
+    "plain",
+    'say "hi"',
+    "it's",
+    '"',
+    '""',
+    "'\"'",
+    "True 1 [x]",
+    "back\\slash",
+    "ends with \\",
+    '\\"',
+    "tab\\t and \\n",
+    "multi\nline",
+]
+
+
+class TestPrettifyQuoted:
+    """Test strings in containers are quoted and colored without the lexer."""
+
+    @pytest.mark.parametrize("text", STRINGS)
+    def test_matches_lexer(self, text):
+        """Test the result is identical to lexing the quoted, escaped string."""
+        assert prettify_quoted(text) == prettify_string(f'"{escape_internal_quotes(text)}"')
+
+    def test_plain_string(self):
+        """Test a string is wrapped in double quotes and colored green."""
+        assert prettify_quoted('say "hi"') == f'{G}"say "hi""{R}'
+
+    def test_no_highlighting_inside(self):
+        """Test numbers, keywords and brackets in the string are not highlighted."""
+        assert prettify_quoted("True 1 [x]") == f'{G}"True 1 [x]"{R}'
+
+    def test_list_of_strings(self):
+        """Test list items use the direct path."""
+        open_, close = bracket("[", clib.yellow), bracket("]", clib.yellow)
+        assert prettify(["a", 'b"c']) == f'{open_}{G}"a"{R}, {G}"b"c"{R}{close}'
+
+    def test_dict_keys_and_values(self):
+        """Test dict keys and values use the direct path."""
+        open_, close = bracket("{", clib.yellow), bracket("}", clib.yellow)
+        assert prettify({"k": "v"}) == f'{open_}{G}"k"{R}: {G}"v"{R}{close}'
+
+    @pytest.mark.parametrize("text", STRINGS)
+    def test_containers_match_lexer(self, text):
+        """Test containers give the same output as quoting and lexing each string."""
+        quoted = prettify_string(f'"{escape_internal_quotes(text)}"')
+        open_, close = bracket("[", clib.yellow), bracket("]", clib.yellow)
+        assert prettify([text]) == f"{open_}{quoted}{close}"
+        items = [text] * 11
+        expected = f"{open_}\n    " + ",\n    ".join([quoted] * 11) + f"\n{close}"
+        assert prettify(items, 0, width=1) == expected
+
+
+# =========================================================================
+# Test Suite for iter_prettify and streaming tprint
+# =========================================================================
+
+NESTED = {
+    "users": [{"id": i, "name": f"user {i}", "tags": ("a", "b"), "ok": i % 2 == 0} for i in range(12)],
+    "single": ("x",),
+    "nested": [[1, [2, [3, {4}]]]],
+    "empty": [[], {}, ()],
+}
+
+
+class TestIterPrettify:
+    """Test iter_prettify() yields the prettify() output in chunks."""
+
+    @pytest.mark.parametrize("element", [
+        NESTED,
+        list(range(25)),
+        {"a": 1, "b": [1, 2], "c": {"d": None}, "e": "text"},
+        ("only",),
+        (["only"],),
+        set(),
+        "a 'quoted' string",
+        42,
+        None,
+    ])
+    @pytest.mark.parametrize("level", [0, 1, 3])
+    def test_chunks_join_to_prettify(self, element, level):
+        """Test the chunks concatenate to exactly the prettify() output."""
+        assert "".join(iter_prettify(element, level)) == prettify(element, level)
+
+    def test_is_lazy(self):
+        """Test the first chunk is produced before the rest of the structure is visited."""
+        visited = []
+
+        class Tracked(list):
+            def __iter__(self):
+                visited.append(self)
+                return super().__iter__()
+
+        inner = Tracked([1, 2])
+        # The first item is too wide for one line, so the layout is decided before reaching inner
+        chunks = iter_prettify([list(range(100)), inner], 0)
+        next(chunks)
+        assert visited == []
+        list(chunks)
+        assert inner in visited
+
+    def test_many_small_chunks(self):
+        """Test large containers are split into many chunks."""
+        chunks = list(iter_prettify(list(range(1000)), 0))
+        assert len(chunks) > 1000
+        assert max(map(len, chunks)) < 100
+
+
+class TestStreamingTprint:
+    """Test tprint() writes to a stream in bounded chunks."""
+
+    class RecordingStream(StringIO):
+        def __init__(self):
+            super().__init__()
+            self.writes = []
+
+        def write(self, text):
+            self.writes.append(len(text))
+            return super().write(text)
+
+    @pytest.fixture
+    def colors_always(self):
+        set_color_mode("always")
+        yield
+        set_color_mode("auto")
+
+    def test_writes_prettify_output(self, colors_always):
+        """Test the stream receives the prettified element and a newline."""
+        stream = StringIO()
+        tprint(NESTED, file=stream)
+        assert stream.getvalue() == prettify(NESTED, 0) + "\n"
+
+    def test_level(self, colors_always):
+        """Test the level is passed through to the prettifier."""
+        stream = StringIO()
+        tprint([1, 2], level=2, file=stream)
+        assert stream.getvalue() == prettify([1, 2], 2) + "\n"
+
+    def test_writes_in_chunks(self, colors_always, monkeypatch):
+        """Test large output is written in several chunks of bounded size."""
+        monkeypatch.setattr(tprint_module, "TPRINT_CHUNK_SIZE", 1000)
+        data = [{"id": i, "name": f"user {i}"} for i in range(500)]
+        stream = self.RecordingStream()
+        tprint(data, file=stream)
+        assert stream.getvalue() == prettify(data, 0) + "\n"
+        assert len(stream.writes) > 10
+        assert max(stream.writes) < 1100
+
+    def test_plain_stream(self):
+        """Test a stream without color support receives the layout without escape codes."""
+        set_color_mode("never")
+        try:
+            stream = StringIO()
+            tprint({"a": [1, 2]}, file=stream)
+        finally:
+            set_color_mode("auto")
+        assert stream.getvalue() == '{"a": [1, 2]}\n'
+
+    def test_plain_file_streamed(self, monkeypatch, tmp_path):
+        """Test a file, detected as colorless, is written in chunks rather than built in memory."""
+        monkeypatch.delenv("FORCE_COLOR", raising=False)
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        set_color_mode("auto")
+
+        def peak(rows):
+            data = [{"id": i, "name": f"user {i}"} for i in range(rows)]
+            path = tmp_path / f"{rows}.txt"
+            with open(path, "w", encoding="utf-8") as stream:
+                tracemalloc.start()
+                try:
+                    tprint(data, file=stream, width=80)
+                    result = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+            assert path.read_text(encoding="utf-8") == strip_ansi(prettify(data, 0, width=80)) + "\n"
+            return result
+
+        try:
+            small, large = peak(2000), peak(40000)
+        finally:
+            set_color_mode("auto")
+        assert large < small * 1.5
+
+    def test_defaults_to_stdout(self, colors_always, capsys):
+        """Test tprint writes to sys.stdout when no file is given."""
+        tprint([1, "a"])
+        assert capsys.readouterr().out == prettify([1, "a"], 0) + "\n"
+
+
+# =========================================================================
+# Test Suite for deeply nested containers
+# =========================================================================
+
+def nest(depth: int, leaf=1):
+    """Builds ``depth`` levels of alternating lists, dicts and tuples around ``leaf``."""
+    element = leaf
+    for i in range(depth):
+        element = ([element], {"k": element}, (element, 2))[i % 3]
+    return element
+
+
+class TestDeepNesting:
+    """Test containers nested beyond the recursion limit are rendered iteratively."""
+
+    def test_beyond_recursion_limit(self):
+        """Test prettify handles ten times the recursion limit without RecursionError."""
+        depth = sys.getrecursionlimit() * 10
+        text = strip_ansi(prettify(nest(depth), 0))
+        assert text.count("[") == text.count("]") == (depth + 2) // 3
+        assert text.count("{") == text.count("}") == (depth + 1) // 3
+        assert "1" in text
+
+    def test_iter_prettify_and_tprint(self):
+        """Test the streaming entry points are iterative as well."""
+        element = nest(sys.getrecursionlimit() * 5)
+        stream = StringIO()
+        set_color_mode("always")
+        try:
+            tprint(element, file=stream)
+        finally:
+            set_color_mode("auto")
+        assert stream.getvalue() == "".join(iter_prettify(element, 0)) + "\n"
+
+    def test_tprint_plain_stream(self, monkeypatch):
+        """Test a colorless stream, detected as such, is written iteratively as well."""
+        monkeypatch.delenv("FORCE_COLOR", raising=False)
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        set_color_mode("auto")
+        element = nest(sys.getrecursionlimit() * 5)
+        stream = StringIO()
+        tprint(element, file=stream)
+        assert stream.getvalue() == strip_ansi("".join(iter_prettify(element, 0))) + "\n"
+
+    @pytest.mark.parametrize("depth", [2, 3, 4, 10, 50])
+    def test_matches_rendered_child(self, depth):
+        """Test each level wraps the separately rendered child exactly once."""
+        element = nest(depth, leaf="x")
+        child = prettify(nest(depth - 1, leaf="x"), 2)
+        open_char, close_char = [("[", "]"), ("{", "}"), ("(", ")")][(depth - 1) % 3]
+        outer = get_bracket_colors()[get_container_color_index(1)]
+        text = prettify(element, 1)
+        assert text.startswith(bracket(open_char, outer))
+        assert text.endswith(bracket(close_char, outer))
+        assert text.count(child) == 1
+
+    def test_mixed_siblings(self):
+        """Test siblings after a deep branch continue at the right level."""
+        element = [nest(2000), "after", {"deep": nest(2000)}, 3]
+        text = strip_ansi(prettify(element, 0))
+        assert text.endswith(',\n    3\n]')
+        assert '\n    "after",\n' in text
+
+    def test_depth_scaling(self, monkeypatch):
+        """Test each level gets one chunk generator, and deeper levels are not measured."""
+        calls = {"nested": 0, "measure": 0}
+        nested_chunks = tprint_module._nested_chunks
+        measure = tprint_module._Render._measure
+
+        def counting_nested_chunks(*args):
+            calls["nested"] += 1
+            return nested_chunks(*args)
+
+        def counting_measure(self, *args):
+            calls["measure"] += 1
+            return measure(self, *args)
+
+        monkeypatch.setattr(tprint_module, "_nested_chunks", counting_nested_chunks)
+        monkeypatch.setattr(tprint_module._Render, "_measure", counting_measure)
+        counts = []
+        for depth in (2000, 20000):
+            calls.update(nested=0, measure=0)
+            prettify(nest(depth))
+            counts.append(dict(calls))
+        assert [count["nested"] for count in counts] == [2000, 20000]
+        # Containers indented past the width are not measured, however deep they go
+        assert counts[0]["measure"] == counts[1]["measure"]
+
+
+# =========================================================================
+# Test Suite for cycles and shared containers
+# =========================================================================
+
+class TestCycles:
+    """Test containers that contain themselves are cut short with <cycle>."""
+
+    def test_self_referencing_list(self):
+        """Test a list containing itself."""
+        element = [1, 2]
+        element.append(element)
+        assert strip_ansi(prettify(element)) == "[1, 2, <cycle>]"
+
+    def test_self_referencing_dict(self):
+        """Test a dict containing itself, directly and through a list."""
+        element = {"x": 1}
+        element["self"] = element
+        element["l"] = [element]
+        assert strip_ansi(prettify(element)) == '{"x": 1, "self": <cycle>, "l": [<cycle>]}'
+
+    def test_indirect_cycle(self):
+        """Test a cycle through several containers."""
+        a, b = [], {}
+        a.append(b)
+        b["a"] = a
+        assert strip_ansi(prettify(a)) == '[{"a": <cycle>}]'
+
+    def test_marker_is_colored(self):
+        """Test the marker is highlighted like a keyword."""
+        element = []
+        element.append(element)
+        assert f"{SYNTAX}<cycle>{R}" in prettify(element)
+
+    def test_repeated_is_not_a_cycle(self):
+        """Test a container appearing twice side by side is rendered both times."""
+        shared = [1]
+        assert strip_ansi(prettify([shared, shared])) == "[[1], [1]]"
+
+    def test_iter_prettify(self):
+        """Test the streaming path detects cycles too."""
+        element = [[]]
+        element[0].append(element)
+        assert "".join(iter_prettify(element)) == prettify(element)
+
+
+def shared_graph(width: int = 20, uses: int = 200):
+    """A list that references the same ``width`` dicts ``uses`` times over."""
+    shared = [{"id": i, "values": list(range(20))} for i in range(width)]
+    return [shared] * uses
+
+
+class TestMemo:
+    """Test memo=True reuses the rendering of shared containers."""
+
+    @pytest.mark.parametrize("level", [0, 1, 2])
+    def test_same_output(self, level):
+        """Test the output is identical with and without the memo."""
+        element = {"a": shared_graph(3, 4), "b": [shared_graph(2, 2)] * 3, "t": ((1,), (1,))}
+        assert prettify(element, level, memo=True) == prettify(element, level)
+
+    def test_same_output_at_different_levels(self):
+        """Test a container shared across nesting levels is rendered for each level."""
+        leaf = list(range(12))
+        element = [leaf, [leaf, [leaf]], leaf]
+        assert prettify(element, 0, memo=True) == prettify(element, 0)
+
+    def test_cycles_inside_shared_containers(self):
+        """Test shared containers on a cycle are not reused where the cycle differs."""
+        a, b = [], []
+        a.extend([b, 1])
+        b.extend([a, 2])
+        element = [a, b, a, b]
+        assert prettify(element, memo=True) == prettify(element)
+        assert strip_ansi(prettify(element, memo=True)).count("<cycle>") == 4
+
+    def test_renders_shared_containers_once(self):
+        """Test each shared container is iterated once per level."""
+        iterations = []
+
+        class Tracked(list):
+            def __iter__(self):
+                iterations.append(self)
+                return super().__iter__()
+
+        shared = Tracked([1, 2])
+        prettify([shared] * 50, memo=True)
+        # Once to find shared containers, once to measure its width, once to render
+        assert len(iterations) == 3
+
+    def test_faster_with_sharing(self, monkeypatch):
+        """Test the memo renders each distinct container once, however often it is shared."""
+        renders = []
+        nested_chunks = tprint_module._nested_chunks
+
+        def counting_nested_chunks(element, *args):
+            renders.append(element)
+            return nested_chunks(element, *args)
+
+        monkeypatch.setattr(tprint_module, "_nested_chunks", counting_nested_chunks)
+        element = shared_graph(width=20, uses=200)
+        prettify(element, 1, True)
+        # The outer list, the shared list, and each dict with its list of values
+        assert len(renders) == 1 + 1 + 2 * 20
+        renders.clear()
+        prettify(element, 1)
+        assert len(renders) == 1 + 200 * (1 + 2 * 20)
+
+    def test_tprint(self):
+        """Test tprint passes the memo through."""
+        element = shared_graph(2, 3)
+        stream = StringIO()
+        set_color_mode("always")
+        try:
+            tprint(element, file=stream, memo=True)
+        finally:
+            set_color_mode("auto")
+        assert stream.getvalue() == prettify(element, 0) + "\n"
+
+
+# =========================================================================
+# Test Suite for size limits
+# =========================================================================
+
+class Untouchable(list):
+    """A list that fails the test if its items are iterated or converted to a string."""
+
+    def __iter__(self):
+        raise AssertionError("elided container was iterated")
+
+    def __str__(self):
+        raise AssertionError("elided container was stringified")
+
+    __repr__ = __str__
+
+
+class Unprintable:
+    """An object that fails the test if it is converted to a string."""
+
+    def __str__(self):
+        raise AssertionError("elided item was stringified")
+
+
+class TestLimits:
+    """Test max_items, max_depth and max_string summarize oversized parts."""
+
+    def test_max_items(self):
+        """Test only the first items are shown, followed by a count of the rest."""
+        text = strip_ansi(prettify(list(range(100_000)), 0, max_items=10, width=1))
+        assert text.split() == ["["] + [f"{i}," for i in range(10)] + ["...", "99,990", "more", "items", "]"]
+
+    def test_max_items_singular(self):
+        """Test a single hidden item is counted as "item"."""
+        assert strip_ansi(prettify([1, 2, 3], max_items=2)) == "[1, 2, ... 1 more item]"
+
+    def test_max_items_not_exceeded(self):
+        """Test containers within the limit are unchanged."""
+        element = {"a": [1, 2], "b": (3,)}
+        assert prettify(element, max_items=2) == prettify(element)
+
+    def test_max_items_dict_and_set(self):
+        """Test dicts and sets are cut after the first items too."""
+        assert strip_ansi(prettify({i: i for i in range(5)}, max_items=1)) == "{0: 0, ... 4 more items}"
+        assert strip_ansi(prettify(set(range(3)), max_items=0)) == "{... 3 more items}"
+
+    def test_max_items_layout_counts_shown_items(self):
+        """Test the compact form is chosen from the items that are shown."""
+        assert "\n" not in prettify(list(range(1000)), max_items=5)
+
+    def test_max_items_skips_elided_items(self):
+        """Test items past the limit are never converted to strings."""
+        element = [1, 2] + [Unprintable()] * 1000
+        assert strip_ansi(prettify(element, max_items=2)) == "[1, 2, ... 1,000 more items]"
+
+    def test_max_depth(self):
+        """Test containers nested too deep are summarized by type and length."""
+        element = {"a": [1, [2, 3]], "b": (4,)}
+        assert strip_ansi(prettify(element, max_depth=2)) == '{"a": [1, <list len=2>], "b": (4,)}'
+        assert strip_ansi(prettify(element, max_depth=1)) == '{"a": <list len=2>, "b": <tuple len=1>}'
+        assert strip_ansi(prettify(element, max_depth=0)) == "<dict len=2>"
+
+    def test_max_depth_skips_elided_containers(self):
+        """Test containers past the depth limit are never iterated."""
+        assert strip_ansi(prettify([Untouchable([1, 2])], max_depth=1)) == "[<Untouchable len=2>]"
+
+    def test_max_string(self):
+        """Test long strings are summarized by their length."""
+        element = ["short", "x" * 4_200_000, {"k" * 20: "v"}]
+        text = strip_ansi(prettify(element, max_string=10))
+        assert text == '["short", <str len=4.2M>, {<str len=20>: "v"}]'
+
+    def test_max_string_top_level_and_tuple(self):
+        """Test the limit applies to a string on its own and in a single-item tuple."""
+        assert strip_ansi(prettify("y" * 1500, max_string=10)) == "<str len=1.5K>"
+        assert strip_ansi(prettify(("y" * 1500,), max_string=10)) == "(<str len=1.5K>,)"
+
+    def test_summary_is_colored(self):
+        """Test summaries are highlighted like keywords."""
+        assert prettify([1, 2], max_items=1).count(SYNTAX) == 1
+
+    def test_iter_prettify(self):
+        """Test the streaming path applies the limits."""
+        element = [list(range(50))] * 50
+        expected = prettify(element, max_items=3, max_depth=2, max_string=5)
+        assert "".join(iter_prettify(element, max_items=3, max_depth=2, max_string=5)) == expected
+
+    def test_memo(self):
+        """Test the memo gives the same output within the limits."""
+        shared = list(range(30))
+        element = [[shared, [shared]]] * 20
+        kwargs = dict(max_items=5, max_depth=3)
+        assert prettify(element, memo=True, **kwargs) == prettify(element, **kwargs)
+
+    def test_memo_skips_elided_parts(self):
+        """Test the search for shared containers stays within the limits."""
+        element = [[1, Untouchable([1])], [Untouchable([2])] * 3]
+        prettify(element, memo=True, max_items=1, max_depth=1)
+        prettify(element, memo=True, max_depth=2, max_items=1)
+
+    @pytest.mark.parametrize("limit", ["max_items", "max_depth", "max_string"])
+    def test_negative_limit(self, limit):
+        """Test negative limits are rejected."""
+        with pytest.raises(ValueError, match=limit):
+            prettify([1], **{limit: -1})
+
+    def test_large_payload_is_fast(self):
+        """Test the cost depends on what is shown, not on the payload size."""
+        pulled = []
+
+        class Rows(list):
+            def __iter__(self):
+                for row in super().__iter__():
+                    pulled.append(row)
+                    yield row
+
+        payload = {"rows": Rows({"id": i, "blob": "x" * 1000} for i in range(100_000))}
+        for memo in (False, True):
+            pulled.clear()
+            text = strip_ansi(prettify(payload, memo=memo, max_items=10, max_string=100))
+            assert text.count('"blob"') == 10
+            # Read to measure, find shared rows and render, never past the shown ones
+            assert len(pulled) <= 3 * 10
+
+    def test_tprint(self):
+        """Test tprint passes the limits through."""
+        stream = StringIO()
+        set_color_mode("always")
+        try:
+            tprint(list(range(20)), file=stream, max_items=2)
+        finally:
+            set_color_mode("auto")
+        assert stream.getvalue() == prettify(list(range(20)), 0, max_items=2) + "\n"
+
+    def test_tprint_plain_with_limits(self):
+        """Test tprint applies the limits without colors on a plain stream."""
+        stream = StringIO()
+        set_color_mode("never")
+        try:
+            tprint(list(range(20)), file=stream, max_items=2)
+        finally:
+            set_color_mode("auto")
+        assert stream.getvalue() == "[0, 1, ... 18 more items]\n"
+
+
+# =========================================================================
+# Test Suite for width-aware layout
+# =========================================================================
+
+class TestWidthLayout:
+    """Test containers are put on one line when it fits in the width."""
+
+    def test_small_items_stay_on_one_line(self):
+        """Test many short items are not expanded."""
+        assert strip_ansi(prettify(list(range(20)), 0)) == str(list(range(20)))
+        assert strip_ansi(prettify({"a": 1, "b": 2, "c": 3, "d": 4}, 0)) == '{"a": 1, "b": 2, "c": 3, "d": 4}'
+
+    def test_long_items_are_expanded(self):
+        """Test a few long items are put on their own lines."""
+        element = ["x" * 30] * 3
+        text = strip_ansi(prettify(element, 0))
+        assert text == "[\n" + ",\n".join([f'    "{"x" * 30}"'] * 3) + "\n]"
+
+    def test_exact_fit(self):
+        """Test a line of exactly the width fits, one more character does not."""
+        element = ["x" * 6, "y"]  # ["xxxxxx", "y"] is 15 characters wide
+        assert "\n" not in prettify(element, 0, width=15)
+        assert "\n" in prettify(element, 0, width=14)
+
+    def test_indentation_counts(self):
+        """Test the indentation of the level is taken from the width."""
+        element = ["x" * 6, "y"]
+        assert "\n" not in prettify(element, 1, width=19)
+        assert "\n" in prettify(element, 1, width=18)
+
+    def test_escape_codes_are_not_counted(self):
+        """Test the width is measured on the visible text."""
+        element = [True, None, 1.5, "a"]
+        visible = len(strip_ansi(prettify(element, 0)))
+        assert "\n" not in prettify(element, 0, width=visible)
+        assert "\n" in prettify(element, 0, width=visible - 1)
+
+    def test_nested_containers_fit_on_their_own(self):
+        """Test an expanded container can hold nested containers on one line."""
+        element = {"first": list(range(10)), "second": list(range(10))}
+        text = strip_ansi(prettify(element, 0, width=40))
+        assert text == f'{{\n    "first": {list(range(10))},\n    "second": {list(range(10))}\n}}'
+
+    def test_nested_containers_stay_on_the_parent_line(self):
+        """Test containers inside a single-line container are not expanded."""
+        element = [[1, 2, 3]]
+        assert strip_ansi(prettify(element, 0, width=11)) == "[[1, 2, 3]]"
+
+    def test_limits_are_measured(self):
+        """Test summaries count toward the width like the items they replace."""
+        element = [list(range(1000))]
+        assert strip_ansi(prettify(element, 0, max_items=2)) == "[[0, 1, ... 998 more items]]"
+        assert strip_ansi(prettify(element, 0, max_depth=1)) == "[<list len=1.0K>]"
+        assert strip_ansi(prettify(["x" * 500], 0, max_string=3)) == "[<str len=500>]"
+
+    def test_cycles_are_measured(self):
+        """Test a cycle counts as its marker."""
+        element = [1]
+        element.append(element)
+        assert "\n" not in prettify(element, 0, width=len("[1, <cycle>]"))
+
+    def test_deep_indentation_stays_on_one_line(self):
+        """Test containers indented past the width are not expanded any further."""
+        element = nest(100, leaf="x" * 10)
+        text = strip_ansi(prettify(element, 0, width=40))
+        lines = text.splitlines()
+        assert max(len(line) - len(line.lstrip()) for line in lines) <= 40
+        assert len(text) < 20 * len(strip_ansi(prettify(element, 0, width=10**6)))
+
+    def test_measuring_stops_at_the_width(self):
+        """Test deciding the layout reads only as many items as fit in the width."""
+        read = []
+
+        class Counting(list):
+            def __iter__(self):
+                for item in super().__iter__():
+                    read.append(item)
+                    yield item
+
+        # The brackets and separators of 30 items take 60 characters, the items 70 more
+        next(iter_prettify(Counting(range(30)), 0))
+        assert 0 < len(read) < 30
+        # The separators of 100,000 items are too wide on their own
+        read.clear()
+        next(iter_prettify(Counting(range(100_000)), 0))
+        assert read == []
+
+    def test_measured_once_per_level(self):
+        """Test the width of a shared container is measured once per level with memo, once per use without."""
+        iterations = []
+
+        class Tracked(list):
+            def __iter__(self):
+                iterations.append(self)
+                return super().__iter__()
+
+        shared = Tracked([1, 2])
+        prettify([shared] * 100, 0, memo=True)
+        # Found to be shared, measured once and rendered once
+        assert len(iterations) == 3
+        iterations.clear()
+        prettify([shared] * 100, 0)
+        # Measured and rendered for each of its occurrences, as widths are dropped once rendered
+        assert len(iterations) == 200
+
+    def test_memory_flat_in_row_count(self):
+        """Test measured widths are dropped once rendered, so memory doesn't grow with the number of rows."""
+        class NullStream:
+            def write(self, text):
+                return len(text)
+
+        def peak(rows):
+            data = [{"id": i, "name": "row", "tags": [i, i + 1]} for i in range(rows)]
+            stream = NullStream()
+            set_color_mode("always")
+            tracemalloc.start()
+            try:
+                tprint(data, file=stream, width=80)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                set_color_mode("auto")
+
+        small = peak(1_000)
+        large = peak(20_000)
+        assert large < small * 1.5
+
+    def test_wide_and_deep_time(self, monkeypatch):
+        """Test the layout decisions keep rendering linear in the size."""
+        calls = {"frames": 0, "renders": 0}
+        open_frame = tprint_module._Render._open_frame
+        nested_chunks = tprint_module._nested_chunks
+
+        def counting_open_frame(self, *args):
+            calls["frames"] += 1
+            return open_frame(self, *args)
+
+        def counting_nested_chunks(*args):
+            calls["renders"] += 1
+            return nested_chunks(*args)
+
+        monkeypatch.setattr(tprint_module._Render, "_open_frame", counting_open_frame)
+        monkeypatch.setattr(tprint_module, "_nested_chunks", counting_nested_chunks)
+
+        def build(depth):
+            element = 1
+            for _ in range(depth):
+                element = [element, list(range(5)), "x" * 10]
+            return element
+
+        counts = []
+        for depth in (300, 3000):
+            calls.update(frames=0, renders=0)
+            prettify(build(depth))
+            counts.append(dict(calls))
+        # Each container is rendered once, and measuring stops within the width
+        assert [count["renders"] for count in counts] == [2 * 300, 2 * 3000]
+        assert counts[0]["frames"] == counts[1]["frames"]
+
+    def test_tprint_width(self, monkeypatch):
+        """Test tprint uses the given width, or a default one on a non-terminal stream."""
+        element = list(range(30))
+        set_color_mode("always")
+        try:
+            stream = StringIO()
+            tprint(element, file=stream, width=20)
+            assert stream.getvalue() == prettify(element, 0, width=20) + "\n"
+            stream = StringIO()
+            tprint(element, file=stream)
+            assert stream.getvalue() == prettify(element, 0, width=tprint_module.PRETTIFY_WIDTH) + "\n"
+        finally:
+            set_color_mode("auto")
+
+    def test_invalid_width(self):
+        """Test a width below 1 is rejected."""
+        with pytest.raises(ValueError, match="width"):
+            prettify([1], width=0)
+
+
+# =========================================================================
+# Test Suite for hex dumps
+# =========================================================================
+
+HELLO_DUMP = (
+    "<bytes len=14>\n"
+    "00000000  48 65 6c 6c 6f 2c 20 77  6f 72 6c 64 21 0a        |Hello, world!.|"
+)
+
+
+class TestHexDump:
+    """Test bytes-like objects are shown as a colored hex dump."""
+
+    def test_layout(self):
+        """Test the header, offset, hex and ASCII columns."""
+        assert strip_ansi(prettify_bytes(b"Hello, world!\n", 0)) == HELLO_DUMP
+
+    def test_prettify_dispatch(self):
+        """Test prettify and iter_prettify dump bytes, bytearray and memoryview."""
+        for element in (b"Hello, world!\n", bytearray(b"Hello, world!\n"), memoryview(b"Hello, world!\n")):
+            name = type(element).__name__
+            expected = HELLO_DUMP.replace("<bytes", f"<{name}")
+            assert strip_ansi(prettify(element, 0)) == expected
+            assert strip_ansi("".join(iter_prettify(element, 0))) == expected
+
+    def test_rows(self):
+        """Test full rows, the offset of each row and the level's indentation."""
+        text = strip_ansi(prettify_bytes(bytes(range(40)), 1))
+        lines = text.splitlines()
+        assert lines[0] == "<bytes len=40>"
+        assert [line.split()[0] for line in lines[1:]] == ["00000000", "00000010", "00000020"]
+        assert all(line.startswith("    0000") for line in lines[1:])
+        assert lines[2] == "    00000010  10 11 12 13 14 15 16 17  18 19 1a 1b 1c 1d 1e 1f  |................|"
+        # The ASCII column of the last, short row lines up with the others
+        assert lines[3].index("|") == lines[2].index("|")
+
+    def test_empty(self):
+        """Test an empty buffer is just the header."""
+        assert strip_ansi(prettify(b"")) == "<bytes len=0>"
+
+    def test_colors(self):
+        """Test NUL, whitespace, printable, other ASCII and non-ASCII bytes are colored apart."""
+        text = prettify_bytes(b"\x00 A\x01\xff", 0)
+        assert f"{clib.gray}00{R}" in text
+        assert f"{G}20{R}" in text
+        assert f"{clib.cyan}41{R}" in text and f"{clib.cyan}A{R}" in text
+        assert f"{clib.magenta}01{R}" in text
+        assert f"{Y}ff{R}" in text
+
+    def test_max_bytes(self):
+        """Test only the first bytes are dumped, followed by a count of the rest."""
+        lines = strip_ansi(prettify(bytes(100), 0, max_bytes=20)).splitlines()
+        assert len(lines) == 4
+        assert lines[-1] == "... 80 more bytes"
+        assert lines[2].split()[0] == "00000010"
+        assert len(lines[2].split()) == 1 + 4 + 1
+
+    def test_max_bytes_reads_no_more(self):
+        """Test a large buffer is neither copied nor read past the limit."""
+        buffer = bytearray(16 * 1024 * 1024)
+        tracemalloc.start()
+        try:
+            prettify(buffer, max_bytes=64)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 64 * 1024
+
+    def test_max_bytes_copies_prefix_of_strided_view(self):
+        """Test a non-contiguous view is copied only up to the limit."""
+        ints = array.array("i", range(8 * 1024 * 1024))
+        strided = memoryview(ints)[::2]
+        tracemalloc.start()
+        try:
+            text = strip_ansi(prettify(strided, 0, max_bytes=10))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 64 * 1024
+        expected = ints[0:6:2].tobytes()[:10]
+        assert text.splitlines()[1].split()[1:11] == [f"{b:02x}" for b in expected]
+        assert text.splitlines()[-1] == f"... {strided.nbytes - 10:,} more bytes"
+
+    def test_memoryview_formats(self):
+        """Test memoryviews of other formats and layouts are dumped byte by byte."""
+        ints = array.array("i", [1, 2])
+        text = strip_ansi(prettify(memoryview(ints), 0))
+        assert text.splitlines()[0] == f"<memoryview len={ints.itemsize * 2}>"
+        assert text.splitlines()[1].split()[1:1 + ints.itemsize * 2] == [f"{b:02x}" for b in ints.tobytes()]
+        strided = memoryview(b"abcdef")[::2]
+        assert strip_ansi(prettify(strided, 0)).endswith("|ace|")
+
+    def test_in_containers(self):
+        """Test dumps in containers are indented below their item and expand the container."""
+        element = {"frame": b"abc", "empty": b"", "n": 1}
+        text = strip_ansi(prettify(element, 0))
+        assert text == (
+            "{\n"
+            '    "frame": <bytes len=3>\n'
+            "        00000000  61 62 63" + " " * 40 + "  |abc|,\n"
+            '    "empty": <bytes len=0>,\n'
+            '    "n": 1\n'
+            "}"
+        )
+        assert strip_ansi(prettify([b""], 0)) == "[<bytes len=0>]"
+
+    def test_in_containers_max_bytes(self):
+        """Test the limit applies to dumps in containers."""
+        text = strip_ansi(prettify([bytes(40)], 0, max_bytes=4))
+        assert text.splitlines()[-2] == "        ... 36 more bytes"
+
+    def test_one_item_tuple_max_bytes(self):
+        """Test the limit applies to the dump in a one-item tuple, at the top and nested."""
+        lines = strip_ansi(prettify((bytes(10000),), 0, max_bytes=16)).splitlines()
+        assert lines == [
+            "(<bytes len=10.0K>",
+            "    00000000  " + " ".join(["00"] * 8) + "  " + " ".join(["00"] * 8) + "  |................|",
+            "    ... 9,984 more bytes,)",
+        ]
+        assert len(strip_ansi(prettify([(bytes(10000),)], 0, max_bytes=16)).splitlines()) == 5
+
+    def test_streamed_by_row(self):
+        """Test iter_prettify yields a large dump row by row."""
+        chunks = list(iter_prettify(bytes(16 * 100), 0))
+        assert len(chunks) == 101
+        assert max(map(len, chunks)) < 1000
+
+    def test_tprint(self):
+        """Test tprint passes the byte limit through."""
+        stream = StringIO()
+        set_color_mode("never")
+        try:
+            tprint(b"Hello, world!\n" * 4, file=stream, max_bytes=14)
+        finally:
+            set_color_mode("auto")
+        assert stream.getvalue() == HELLO_DUMP.replace("len=14", "len=56") + "\n... 42 more bytes\n"
+
+    def test_negative_max_bytes(self):
+        """Test a negative limit is rejected."""
+        with pytest.raises(ValueError, match="max_bytes"):
+            prettify(b"x", max_bytes=-1)
+
+
+# =========================================================================
+# Test Suite for records
+# =========================================================================
+
+Point = namedtuple("Point", "x y")
+Single = namedtuple("Single", "value")
+
+
+@dataclass
+class Node:
+    name: str
+    children: list = field(default_factory=list)
+    secret: str = field(default="hidden", repr=False)
+
+
+class Slotted:
+    __slots__ = ("a", "__b", "unset")
+
+    def __init__(self):
+        self.a = 1
+        self.__b = [2]
+
+
+class SlottedChild(Slotted):
+    __slots__ = "c"
+
+    def __init__(self):
+        super().__init__()
+        self.c = None
+
+
+class SlottedWithRepr:
+    __slots__ = ("a",)
+
+    def __repr__(self):
+        return "SlottedWithRepr('custom')"
+
+
+class AttrsLike:
+    """A class laid out like one made by attrs, without depending on it."""
+
+    class Attribute:
+        def __init__(self, name, repr=True):
+            self.name = name
+            self.repr = repr
+
+    __attrs_attrs__ = (Attribute("left"), Attribute("right"), Attribute("cache", repr=False))
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        self.cache = {}
+
+
+class Hooked:
+    def __tinycolors__(self):
+        return f"{G}<hooked>{R}"
+
+
+@dataclass
+class HookedRecord:
+    value: int
+
+    def __tinycolors__(self):
+        return "custom"
+
+
+class TestRecords:
+    """Test objects with named fields are rendered field by field."""
+
+    def test_dataclass(self):
+        """Test dataclasses show the fields of their repr, with a bold class name."""
+        result = prettify(Node("root"), 0)
+        assert strip_ansi(result) == 'Node(name="root", children=[])'
+        assert result.startswith(f"{color.bold}Node{R}{bracket('(', Y)}name=")
+
+    def test_namedtuple(self):
+        """Test namedtuples are records rather than plain tuples, even with one field."""
+        assert strip_ansi(prettify(Point(1, 2), 0)) == "Point(x=1, y=2)"
+        assert strip_ansi(prettify([Single("a")], 0)) == '[Single(value="a")]'
+        assert strip_ansi(prettify({Point(0, 0): "origin"}, 0)) == '{Point(x=0, y=0): "origin"}'
+
+    def test_attrs_like(self):
+        """Test classes with __attrs_attrs__ show the attributes of their repr."""
+        assert strip_ansi(prettify(AttrsLike(1, "b"), 0)) == 'AttrsLike(left=1, right="b")'
+
+    def test_slots(self):
+        """Test __slots__ objects show the slots that are set, through the class hierarchy."""
+        assert strip_ansi(prettify(Slotted(), 0)) == "Slotted(a=1, __b=[2])"
+        assert strip_ansi(prettify(SlottedChild(), 0)) == "SlottedChild(a=1, __b=[2], c=None)"
+
+    def test_slots_with_own_repr(self):
+        """Test __slots__ objects with their own repr are still shown as a string."""
+        assert strip_ansi(prettify(SlottedWithRepr(), 0)) == "SlottedWithRepr('custom')"
+
+    def test_expanded_layout(self):
+        """Test records wider than the width get one field per line, like containers."""
+        tree = Node("root", [Node("left"), Node("right", [Point(1, 2)])])
+        assert strip_ansi(prettify(tree, 0, width=60)) == (
+            "Node(\n"
+            '    name="root",\n'
+            "    children=[\n"
+            '        Node(name="left", children=[]),\n'
+            '        Node(name="right", children=[Point(x=1, y=2)])\n'
+            "    ]\n"
+            ")"
+        )
+        assert "".join(iter_prettify(tree, 0, width=60)) == prettify(tree, 0, width=60)
+
+    def test_cycles_and_limits(self):
+        """Test cycles through records are cut and records deeper than max_depth are summarized."""
+        root = Node("root")
+        root.children.append(root)
+        assert strip_ansi(prettify(root, 0)) == 'Node(name="root", children=[<cycle>])'
+        assert strip_ansi(prettify([[Point(1, 2)]], 0, max_depth=1)) == "[<list len=1>]"
+        assert strip_ansi(prettify([Point(1, 2)], 0, max_depth=1)) == "[Point(...)]"
+        assert strip_ansi(prettify(Point(1, 2), 0, max_items=1)) == "Point(x=1, ... 1 more item)"
+
+    def test_memo(self):
+        """Test shared records are rendered once with memo and look the same."""
+        point = Point([1], [2])
+        element = [point] * 3
+        assert prettify(element, 0, memo=True) == prettify(element, 0)
+
+    def test_hook(self):
+        """Test __tinycolors__ renders the object as is, before any record rendering."""
+        assert prettify(Hooked()) == f"{G}<hooked>{R}"
+        assert strip_ansi(prettify([Hooked(), HookedRecord(1)], 0)) == "[<hooked>, custom]"
+
+    def test_hook_called_once_per_item(self):
+        """Test a hook runs once per item, though its output is also measured for the layout."""
+        calls = []
+
+        class Counted:
+            def __tinycolors__(self):
+                calls.append(self)
+                return "x" * 30
+
+        element = [Counted(), Counted(), (Counted(),), {"k": Counted()}]
+        text = strip_ansi(prettify(element, 0, width=40))
+        assert len(calls) == 4
+        assert text.startswith(f"[\n    {'x' * 30},\n")
+
+    def test_hook_must_return_str(self):
+        """Test a hook that does not return a string is an error."""
+        class Broken:
+            def __tinycolors__(self):
+                return 1
+
+        with pytest.raises(TypeError, match="__tinycolors__"):
+            prettify(Broken())
+
+    def test_fields_cached_per_class(self):
+        """Test the fields of a class are looked up once, however many instances there are."""
+        tprint_module._record_fields.cache_clear()
+        prettify([Point(i, i) for i in range(1000)], 0)
+        info = tprint_module._record_fields.cache_info()
+        assert info.hits >= 999
+        assert info.misses <= 3
+
+    def test_tprint(self):
+        """Test tprint prints records without colors when the stream has none."""
+        stream = StringIO()
+        set_color_mode("never")
+        try:
+            tprint(Point(1, 2), file=stream, max_items=5)
+        finally:
+            set_color_mode("auto")
+        assert stream.getvalue() == "Point(x=1, y=2)\n"
+
+
+# =========================================================================
+# Test Suite for arrays
+# =========================================================================
+
+class TestArrays:
+    """Test array.array and NumPy arrays are summarized without converting them as a whole."""
+
+    def test_array_module(self):
+        """Test array.array shows its typecode, length and elements."""
+        result = prettify(array.array("i", [1, 2, 3]), 0)
+        assert strip_ansi(result) == "<array typecode='i' len=3> [1, 2, 3]"
+        assert f"{Y}1{R}, {Y}2{R}, {Y}3{R}" in result
+        assert strip_ansi(prettify(array.array("u", "hi"), 0)) == '<array typecode=\'u\' len=2> ["h", "i"]'
+
+    def test_head_and_tail(self):
+        """Test large arrays show their first and last elements only."""
+        element = array.array("d", range(100_000))
+        assert strip_ansi(prettify(element, 0)) == (
+            "<array typecode='d' len=100.0K> [0.0, 1.0, 2.0, ... 99,994 more items, 99997.0, 99998.0, 99999.0]"
+        )
+        assert strip_ansi(prettify(element, 0, max_items=3)) == (
+            "<array typecode='d' len=100.0K> [0.0, 1.0, ... 99,997 more items, 99999.0]"
+        )
+        assert strip_ansi(prettify(array.array("b"), 0)) == "<array typecode='b' len=0> []"
+
+    def test_in_containers(self):
+        """Test arrays in containers are single items measured for the layout."""
+        element = {"data": array.array("b", [1, 2])}
+        assert strip_ansi(prettify(element, 0)) == "{\"data\": <array typecode='b' len=2> [1, 2]}"
+        assert strip_ansi(prettify(element, 0, width=20)) == (
+            "{\n    \"data\": <array typecode='b' len=2> [1, 2]\n}"
+        )
+        assert "".join(iter_prettify([element], 0, width=20)) == prettify([element], 0, width=20)
+
+    def test_one_item_tuple_max_items(self):
+        """Test max_items applies to an array in a one-item tuple as in any other container."""
+        element = array.array("i", range(5000))
+        expected = "<array typecode='i' len=5.0K> [0, ... 4,998 more items, 4999]"
+        assert strip_ansi(prettify((element,), 0, max_items=2)) == f"({expected},)"
+        assert strip_ansi(prettify([element], 0, max_items=2)) == f"[{expected}]"
+
+    def test_numpy(self):
+        """Test NumPy arrays show their shape, dtype and elements in flat order."""
+        numpy = pytest.importorskip("numpy")
+        assert strip_ansi(prettify(numpy.arange(6).reshape(2, 3), 0)) == (
+            "<ndarray shape=(2, 3) dtype=int64> [0, 1, 2, 3, 4, 5]"
+        )
+        assert strip_ansi(prettify(numpy.array([True, False]), 0)) == (
+            "<ndarray shape=(2,) dtype=bool> [True, False]"
+        )
+        assert strip_ansi(prettify(numpy.array(["a"]), 0)) == '<ndarray shape=(1,) dtype=<U1> ["a"]'
+        assert strip_ansi(prettify(numpy.array([{"k": 1}, None], dtype=object), 0)) == (
+            '<ndarray shape=(2,) dtype=object> [{"k": 1}, None]'
+        )
+
+    def test_numpy_large(self):
+        """Test a large, non-contiguous NumPy array is summarized without being copied."""
+        numpy = pytest.importorskip("numpy")
+        element = numpy.zeros((2000, 3000))[::2, ::3]
+        tracemalloc.start()
+        try:
+            result = prettify(element, 0)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert strip_ansi(result) == (
+            "<ndarray shape=(1000, 1000) dtype=float64> [0.0, 0.0, 0.0, ... 999,994 more items, 0.0, 0.0, 0.0]"
+        )
+        assert peak < 64 * 1024
+
+    def test_numpy_not_imported(self):
+        """Test NumPy is not imported to check for its arrays."""
+        numpy = sys.modules.pop("numpy", None)
+        try:
+            assert strip_ansi(prettify([array.array("b", [1]), Hooked()], 0)) == (
+                "[<array typecode='b' len=1> [1], <hooked>]"
+            )
+            assert "numpy" not in sys.modules
+        finally:
+            if numpy is not None:
+                sys.modules["numpy"] = numpy
+
+    def test_prettify_array(self):
+        """Test prettify_array colors its brackets by level, like containers."""
+        result = prettify_array(array.array("b", [1]), 2)
+        assert bracket("[", get_bracket_colors()[get_container_color_index(2)]) in result
+
+
+# =========================================================================
+# Test Suite for type dispatch
+# =========================================================================
+
+class Money:
+    def __init__(self, cents):
+        self.cents = cents
+
+
+class Euros(Money):
+    pass
+
+
+class Shape(abc.ABC):
+    pass
+
+
+class Circle:
+    pass
+
+
+Shape.register(Circle)
+
+
+class Name(str):
+    pass
+
+
+class TestDispatch:
+    """Test prettify dispatches on types through a registry resolved once per type."""
+
+    @pytest.fixture(autouse=True)
+    def clean_registry(self):
+        """Remove the prettifiers registered by a test."""
+        yield
+        tprint_module._prettifiers.clear()
+        tprint_module._dispatch.cache_clear()
+
+    def test_register(self):
+        """Test a registered prettifier is used on its own and inside containers."""
+        register_prettifier(Money, lambda element, level: f"${element.cents / 100:.2f}")
+        assert prettify(Money(150)) == "$1.50"
+        assert strip_ansi(prettify({"price": Money(5)}, 0)) == '{"price": $0.05}'
+
+    def test_decorator(self):
+        """Test register_prettifier works as a decorator and returns the function."""
+        @register_prettifier(Money)
+        def money(element, level):
+            return f"<{level}>"
+
+        assert money(None, 0) == "<0>"
+        assert strip_ansi(prettify([[Money(1)]], 0)) == "[[<2>]]"
+
+    def test_nearest_class_wins(self):
+        """Test the prettifier of the nearest class in the MRO is used."""
+        register_prettifier(Money, lambda element, level: "money")
+        assert prettify(Euros(1)) == "money"
+        register_prettifier(Euros, lambda element, level: "euros")
+        assert prettify(Euros(1)) == "euros"
+        assert prettify(Money(1)) == "money"
+
+    def test_abstract_base_class(self):
+        """Test a prettifier registered for an abstract base class applies to virtual subclasses."""
+        register_prettifier(Shape, lambda element, level: "shape")
+        assert prettify(Circle()) == "shape"
+
+    def test_overrides_builtin_rendering(self):
+        """Test registered prettifiers take precedence over records and built-in types."""
+        register_prettifier(Point, lambda element, level: "point")
+        register_prettifier(bool, lambda element, level: "yes" if element else "no")
+        assert strip_ansi(prettify([Point(1, 2), True, 1], 0)) == "[point, yes, 1]"
+
+    def test_measured_for_layout(self):
+        """Test the output of a prettifier counts towards the width."""
+        register_prettifier(Money, lambda element, level: "x" * 30)
+        assert strip_ansi(prettify([Money(1)], 0, width=40)) == f"[{'x' * 30}]"
+        assert strip_ansi(prettify([Money(1), Money(2)], 0, width=40)) == f"[\n    {'x' * 30},\n    {'x' * 30}\n]"
+
+    def test_invalid(self):
+        """Test registering a non-class and returning a non-string are errors."""
+        with pytest.raises(TypeError, match="expects a class"):
+            register_prettifier("Money", str)
+        register_prettifier(Money, lambda element, level: 1)
+        with pytest.raises(TypeError, match="prettifier for Money"):
+            prettify(Money(1))
+
+    def test_subclasses_of_builtins(self):
+        """Test subclasses of built-in types take the path of their base."""
+        assert prettify([Name("ann")], 0) == prettify(["ann"], 0)
+        assert strip_ansi(prettify({Name("k"): Name("v")}, 0)) == '{"k": "v"}'
+
+    def test_resolved_once_per_type(self):
+        """Test each type is resolved once, however many items of it there are."""
+        tprint_module._dispatch.cache_clear()
+        prettify([[i, str(i), float(i), None, Money(i)] for i in range(1000)], 0)
+        info = tprint_module._dispatch.cache_info()
+        assert info.misses <= 8
+        assert info.hits >= 5000
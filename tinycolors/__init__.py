@@ -1,9 +1,11 @@
 """tinycolors package public surface."""
 
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterable
 from importlib import import_module
-from importlib.metadata import version, PackageNotFoundError
 from .main import (
+    NodeProxy,
+    stylenode,
+    color,
     COLOR_MAP,
     BG_COLOR_MAP,
     STYLE_MAP,
@@ -11,75 +13,148 @@ from .main import (
     COMBINED_STYLES_WITH_BG,
     COLOR_NAMES,
     STYLE_NAMES,
-    COMBINED_STYLES_LITERAL,
     ColorOptions,
     ColorNotFoundError,
     StyleNotFoundError,
+    Supported,
     clib,
 )
-from .tprint import Supported
-# Package version: prefer installed package metadata, fallback to local _version
-try:
-    __version__ = version("tinycolors")
-except PackageNotFoundError:
-    try:
-        # If you have a local _version.py with __version__ defined
-        from ._version import __version__  # type: ignore
-    except Exception:
-        __version__ = "0.6.1"
-
-# Attempt to import and re-export public names from likely submodules.
-__all__ = ["__version__"]
+from .styles import (
+    Style,
+    StyleSpec,
+    apply_many,
+    parse_style,
+    render_spans,
+    resolve_parts,
+    resolve_style,
+)
+from .sgr import compact_sgr_enabled, set_compact_sgr, strip_ansi, visible_len
+from .term import (
+    DEPTH_NONE,
+    DEPTH_16,
+    DEPTH_256,
+    DEPTH_TRUECOLOR,
+    color_depth,
+    colors_enabled,
+    get_color_mode,
+    set_color_mode,
+)
+from .writer import ColorWriter, get_writer, set_writer
+
+if TYPE_CHECKING:
+    from .main import COMBINED_STYLES_LITERAL
+
+__all__ = [
+    "__version__",
+    # Functions
+    "colorize",
+    "colortext",
+    "colorize_many",
+    "colortext_many",
+    "cprint",
+    "cinput",
+    "render_spans",
+    "strip_ansi",
+    "visible_len",
+    # Style specs
+    "Style",
+    "StyleSpec",
+    "parse_style",
+    "resolve_style",
+    "resolve_parts",
+    "apply_many",
+    # Output
+    "ColorWriter",
+    "get_writer",
+    "set_writer",
+    "compact_sgr_enabled",
+    "set_compact_sgr",
+    "DEPTH_NONE",
+    "DEPTH_16",
+    "DEPTH_256",
+    "DEPTH_TRUECOLOR",
+    "color_depth",
+    "colors_enabled",
+    "get_color_mode",
+    "set_color_mode",
+    # Color classes
+    "clib",
+    "color",
+    "NodeProxy",
+    "stylenode",
+    # Maps
+    "COLOR_MAP",
+    "BG_COLOR_MAP",
+    "STYLE_MAP",
+    "COMBINED_STYLES",
+    "COMBINED_STYLES_WITH_BG",
+    # Exceptions
+    "ColorNotFoundError",
+    "StyleNotFoundError",
+    # Type definitions
+    "COLOR_NAMES",
+    "STYLE_NAMES",
+    "COMBINED_STYLES_LITERAL",
+    "ColorOptions",
+    "Supported",
+    # Pretty printing, loaded on first access
+    "tprint",
+    "prettify",
+    "iter_prettify",
+    "prettify_string",
+    "prettify_simple",
+    "prettify_bytes",
+    "prettify_array",
+    "register_prettifier",
+    "prettify_container",
+    "prettify_list",
+    "prettify_dict",
+    "prettify_tuple",
+    "prettify_set",
+]
+
+# Names served by submodules that are only imported, or built, on first access (PEP 562).
+# "tprint" itself resolves to the submodule, as it always has.
+_LAZY_NAMES = {
+    "COMBINED_STYLES_LITERAL": "main",
+    "prettify": "tprint",
+    "iter_prettify": "tprint",
+    "prettify_string": "tprint",
+    "prettify_simple": "tprint",
+    "prettify_bytes": "tprint",
+    "prettify_array": "tprint",
+    "register_prettifier": "tprint",
+    "prettify_container": "tprint",
+    "prettify_list": "tprint",
+    "prettify_dict": "tprint",
+    "prettify_tuple": "tprint",
+    "prettify_set": "tprint",
+}
+_LAZY_SUBMODULES = ("tprint",)
 
-_known_submodules = ("main", "tprint")
+__author__ = "Razka Rizaldi"
 
-for _sub in _known_submodules:
-    try:
-        _mod = import_module(f".{_sub}", __package__)
-    except Exception:
-        continue
-    for _name in dir(_mod):
-        if _name.startswith("_"):
-            continue
-        # Do not overwrite existing globals
-        if _name in globals():
-            continue
-        globals()[_name] = getattr(_mod, _name)
-        __all__.append(_name)
+# print() keywords that a ColorWriter can honour when cprint() routes through it
+_WRITER_KWARGS = {"end", "sep", "flush"}
 
-# Provide attribute access helpers (PEP 562)
-def __getattr__(name: str):
-    if name in globals():
-        return globals()[name]
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+def colorize(text: Supported,
+             color: COLOR_NAMES | str | None = None,
+             style: STYLE_NAMES | None = None,
+             bg: COLOR_NAMES | str | None = None) -> str:
+    """
+    Easy colorize function with ANSI escape sequences.
 
-def __dir__():
-    return sorted(__all__)
+    Besides the named colors, ``color`` and ``bg`` accept ``"color(n)"`` for the
+    256-color palette and ``"rgb(r,g,b)"`` or ``"#rrggbb"`` for truecolor.
 
-__author__ = "Razka Rizaldi"
+    If ``sys.stdout`` does not support colors (see ``colors_enabled()``),
+    ``str(text)`` is returned without building any escape codes.
+    """
+    if not colors_enabled():
+        return str(text)
+    return resolve_parts(color or "reset", style or "reset", bg or "reset") + str(text) + clib.reset
 
-def colorize(text: Supported,
-             color: COLOR_NAMES | None = None,
-             style: STYLE_NAMES | None = None,
-             bg: COLOR_NAMES | None = None) -> str:
-    """Easy colorize function with ANSI escape sequences."""
-    color = color or "reset"
-    style = style or "reset"
-    bg = bg or "reset"
-
-    if color not in COLOR_MAP:
-        raise ColorNotFoundError(f"Color {color} is not supported.")
-    if style not in STYLE_MAP:
-        raise StyleNotFoundError(f"Style {style} is not supported.")
-    if bg not in BG_COLOR_MAP:
-        raise ColorNotFoundError(f"BG color {bg} is not supported.")
-
-    fg_color = COLOR_MAP[color] if color != "reset" else ""
-    bg_color = BG_COLOR_MAP[bg] if bg != "reset" else ""
-    text_style = STYLE_MAP[style] if style != "reset" else ""
-    return bg_color + fg_color + text_style + str(text) + clib.reset
-
-def colortext(text: Supported, as_: COMBINED_STYLES_LITERAL | str) -> str:
+def colortext(text: Supported, as_: "COMBINED_STYLES_LITERAL | Style | str") -> str:
     """
     Simplified color function using combined style names.
 
@@ -94,6 +169,9 @@ def colortext(text: Supported, as_: COMBINED_STYLES_LITERAL | str) -> str:
             - Singular style: "bold", "italic", "underline"
             - Style + color: "bold red", "italic cyan", "underline blue"
             - Style + color + background: "bold red on black", "italic white on blue"
+            - Any mix of the above: "bold italic red on bright blue", "on gray"
+            - Extended colors: "color(208)", "rgb(255, 128, 0)", "bold #ff8000 on color(17)"
+            - A precompiled ``Style``
 
     Returns:
         Colorized text with ANSI codes and automatic reset at the end
@@ -117,43 +195,85 @@ def colortext(text: Supported, as_: COMBINED_STYLES_LITERAL | str) -> str:
         >>> colortext("Styled", as_="bold")
         '\\033[1mStyled\\033[0m'
 
+        >>> colortext("Mixed", as_="bold italic red on bright blue")
+        '\\033[1m\\033[3m\\033[31m\\033[104mMixed\\033[0m'
+
     Raises:
         StyleNotFoundError: If the style is not found in the supported styles
 
     Note:
-        The function checks combined styles first, then singular colors, then singular styles.
+        Specs are parsed by ``parse_style`` and memoized by ``resolve_style``,
+        so repeated specs cost a single cache lookup. If ``sys.stdout`` does
+        not support colors (see ``colors_enabled()``), ``str(text)`` is
+        returned without resolving the style.
+    """
+    if not colors_enabled():
+        return str(text)
+    return resolve_style(as_) + str(text) + clib.reset
+
+def colorize_many(items: Iterable[Supported],
+                  color: COLOR_NAMES | str | None = None,
+                  style: STYLE_NAMES | None = None,
+                  bg: COLOR_NAMES | str | None = None,
+                  sep: str | None = None) -> list[str] | str | Any:
+    """
+    Colorizes every item of an iterable with the same color, style and bg.
+
+    The prefix is resolved once for the whole sequence.
+
+    Args:
+        items: Items to colorize
+        color: Color name, as in ``colorize()``
+        style: Style name, as in ``colorize()``
+        bg: Background color name, as in ``colorize()``
+        sep: If given, return one string with the colored items joined by ``sep``
+
+    Returns:
+        A list of colored strings, or a single joined string if ``sep`` is given.
+        A NumPy string array is colored in vectorized form and returned as an array.
+
+    Examples:
+        >>> colorize_many(["a", "b"], color="red")
+        ['\\033[31ma\\033[0m', '\\033[31mb\\033[0m']
+    """
+    if not colors_enabled():
+        return apply_many("", items, sep, reset="")
+    prefix = resolve_parts(color or "reset", style or "reset", bg or "reset")
+    return apply_many(prefix, items, sep)
+
+def colortext_many(items: Iterable[Supported],
+                   as_: "COMBINED_STYLES_LITERAL | Style | str",
+                   sep: str | None = None) -> list[str] | str | Any:
+    """
+    Colorizes every item of an iterable with the same combined style.
+
+    The style is resolved once for the whole sequence.
+
+    Args:
+        items: Items to colorize
+        as_: Style string or ``Style``, as in ``colortext()``
+        sep: If given, return one string with the colored items joined by ``sep``
+
+    Returns:
+        A list of colored strings, or a single joined string if ``sep`` is given.
+        A NumPy string array is colored in vectorized form and returned as an array.
+
+    Examples:
+        >>> colortext_many([1, 2], as_="bold red", sep=", ")
+        '\\033[1m\\033[31m1\\033[0m, \\033[1m\\033[31m2\\033[0m'
+
+    Raises:
+        StyleNotFoundError: If the style is not found in the supported styles
     """
-    # Check COMBINED_STYLES_WITH_BG first (has precedence for "X on Y" patterns)
-    if as_ in COMBINED_STYLES_WITH_BG:
-        ansi_codes = COMBINED_STYLES_WITH_BG[as_]
-        return ansi_codes + str(text) + clib.reset
-
-    # Fall back to COMBINED_STYLES
-    if as_ in COMBINED_STYLES:
-        ansi_codes = COMBINED_STYLES[as_]
-        return ansi_codes + str(text) + clib.reset
-
-    # Check for singular colors
-    if as_ in COLOR_MAP:
-        ansi_codes = COLOR_MAP[as_]
-        return ansi_codes + str(text) + clib.reset
-
-    # Check for singular styles
-    if as_ in STYLE_MAP:
-        ansi_codes = STYLE_MAP[as_]
-        return ansi_codes + str(text) + clib.reset
-
-    # If not found in any, raise an error
-    raise StyleNotFoundError(
-        f"Style '{as_}' is not supported. "
-        f"Use formats like 'red', 'bold', 'bold red', or 'italic cyan on blue'."
-    )
+    if not colors_enabled():
+        return apply_many("", items, sep, reset="")
+    return apply_many(resolve_style(as_), items, sep)
 
 def cprint(text: Any,
            color: COLOR_NAMES | None = None,
            style: STYLE_NAMES | None = None,
            bg: COLOR_NAMES | None = None,
-           as_: COMBINED_STYLES_LITERAL | str | None = None,
+           as_: "COMBINED_STYLES_LITERAL | str | None" = None,
            **print_kwargs: Any) -> None:
     """
     Prints colorized text with support for both individual parameters and combined styles.
@@ -187,16 +307,32 @@ def cprint(text: Any,
     Note:
         If as_ is provided, it takes precedence over color, style, and bg parameters.
         The as_ parameter provides a cleaner, more intuitive API.
+
+        When a process-wide ``ColorWriter`` is configured with ``set_writer()``,
+        the text is buffered there instead of printed, unless ``file`` is given.
+        If the target stream does not support colors, the text is printed as is.
     """
-    # If as_ is provided, use the new colortext() function
+    writer = get_writer()
+    if writer is not None and print_kwargs.keys() <= _WRITER_KWARGS:
+        writer.cprint(text, color, style, bg, as_,
+                      end=print_kwargs.get("end", "\n"),
+                      flush=print_kwargs.get("flush", False))
+        return
+
+    if not colors_enabled(print_kwargs.get("file")):
+        print(text, **print_kwargs)
+        return
+
+    # If as_ is provided, use the combined style string
     if as_ is not None:
-        print(colortext(text, as_=as_), **print_kwargs)
+        print(resolve_style(as_) + str(text) + clib.reset, **print_kwargs)
     else:
-        # Otherwise use the legacy colorize() for backward compatibility
-        print(colorize(text, color=color, style=style, bg=bg), **print_kwargs)
+        # Otherwise use the legacy color, style and bg parameters
+        prefix = resolve_parts(color or "reset", style or "reset", bg or "reset")
+        print(prefix + str(text) + clib.reset, **print_kwargs)
 
 def cinput(text: Any,
-           as_: COMBINED_STYLES_LITERAL | str | None = None,
+           as_: "COMBINED_STYLES_LITERAL | str | None" = None,
            **kwargs: ColorOptions) -> str:
     """
     Input with colorized prompt supporting both legacy and new APIs.
@@ -230,4 +366,33 @@ def cinput(text: Any,
         return input(colortext(text, as_=as_))
     else:
         # Otherwise use the legacy colorize() with kwargs for backward compatibility
-        return input(colorize(text, **kwargs)) # type: ignore
\ No newline at end of file
+        return input(colorize(text, **kwargs)) # type: ignore
+
+def _package_version() -> str:
+    # Package version: prefer installed package metadata, fallback to local _version
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        return version("tinycolors")
+    except PackageNotFoundError:
+        try:
+            # If you have a local _version.py with __version__ defined
+            from ._version import __version__  # type: ignore
+            return __version__
+        except Exception:
+            return "0.6.1"
+
+# Provide attribute access helpers (PEP 562)
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        return import_module(f".{name}", __name__)
+    if name in _LAZY_NAMES:
+        value = getattr(import_module(f".{_LAZY_NAMES[name]}", __name__), name)
+    elif name == "__version__":
+        value = _package_version()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(__all__) | set(globals()))
@@ -6,8 +6,8 @@ the color library you were looking for.
 """
 
 from sys import platform
-from typing import Any, Literal, TypedDict
-from . import cprint, cinput, colortext
+from typing import TYPE_CHECKING, Any, Literal, TypedDict, Union
+from .sgr import compact_sgr_enabled, merge_sgr
 
 if platform == "win32":
     from os import system
@@ -22,9 +22,18 @@ class NodeProxy:
         self._cls = cls
 
     def __getattr__(self, item):
-        attr = getattr(self._cls, item)
+        try:
+            attr = getattr(self._cls, item)
+        except AttributeError:
+            # Style + color combinations (color.bold.red) are built on first use
+            if item not in clib.palette or not hasattr(self._cls, "value"):
+                raise
+            attr = self._cls.value + getattr(clib, item)
+            setattr(self._cls, item, attr)
         if isinstance(attr, type):
             return NodeProxy(attr)
+        if isinstance(attr, str) and compact_sgr_enabled():
+            return merge_sgr(attr)
         return attr
 
     def __repr__(self):
@@ -120,81 +129,54 @@ class color:
     class bold:
         """Bold style"""
         value = "\033[1m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
     @stylenode
     class dim:
         """Dim style"""
         value = "\033[2m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
     @stylenode
     class italic:
         """Italic style"""
         value = "\033[3m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
     @stylenode
     class underline:
         """Underline style"""
         value = "\033[4m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
     @stylenode
     class blinking:
         """Blinking style"""
         value = "\033[5m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
     @stylenode
     class fast_blinking:
         """Blinking style, but faster"""
         value = "\033[6m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
     @stylenode
     class inverted:
         """Inverted background and foreground colors style"""
         value = "\033[7m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
     @stylenode
     class hidden:
         # This class was purposely not have given a docstring, because it's hidden. (get it)
         value = "\033[8m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
     @stylenode
     class striked:
         """Your text is striked (struck) in the chest!"""
         value = "\033[9m"
-
-        for color_name in clib.palette:
-            locals()[color_name] = value + getattr(clib, color_name)
         reset = "\033[0m"
 
 
@@ -215,6 +197,9 @@ class color:
 # Type definitions
 # ---------------------------------------------------------
 
+Supported = Union[str, list[Any], dict[Any, Any], tuple[Any, ...], set[Any], int, float, bool, None]
+"""Supported types for prettification. Includes str, list, dict, tuple, set, int, float, bool, and None."""
+
 COLOR_NAMES = Literal[
     "black",
     "red",
@@ -373,12 +358,181 @@ _BG_COLORS_DICT = {
     "bright white": "\033[107m",
 }
 
-# COMBINED_STYLES: All style + color combinations (162 total: 9 styles × 18 colors)
-COMBINED_STYLES = {}
-for style_name, style_code in _STYLES_DICT.items():
-    for color_name, color_code in _COLORS_DICT.items():
-        key = f"{style_name} {color_name}"
-        COMBINED_STYLES[key] = style_code + color_code
+# COMBINED_STYLES: All style + color combinations (162 total: 9 styles × 18 colors).
+# Written out rather than built in a loop so that importing costs nothing;
+# the test suite checks it against _STYLES_DICT and _COLORS_DICT.
+COMBINED_STYLES = {
+    "bold black": "\033[1m\033[30m",
+    "bold red": "\033[1m\033[31m",
+    "bold green": "\033[1m\033[32m",
+    "bold yellow": "\033[1m\033[33m",
+    "bold blue": "\033[1m\033[34m",
+    "bold magenta": "\033[1m\033[35m",
+    "bold cyan": "\033[1m\033[36m",
+    "bold white": "\033[1m\033[37m",
+    "bold gray": "\033[1m\033[90m",
+    "bold default": "\033[1m\033[39m",
+    "bold bright black": "\033[1m\033[90m",
+    "bold bright red": "\033[1m\033[91m",
+    "bold bright green": "\033[1m\033[92m",
+    "bold bright yellow": "\033[1m\033[93m",
+    "bold bright blue": "\033[1m\033[94m",
+    "bold bright magenta": "\033[1m\033[95m",
+    "bold bright cyan": "\033[1m\033[96m",
+    "bold bright white": "\033[1m\033[97m",
+
+    "dim black": "\033[2m\033[30m",
+    "dim red": "\033[2m\033[31m",
+    "dim green": "\033[2m\033[32m",
+    "dim yellow": "\033[2m\033[33m",
+    "dim blue": "\033[2m\033[34m",
+    "dim magenta": "\033[2m\033[35m",
+    "dim cyan": "\033[2m\033[36m",
+    "dim white": "\033[2m\033[37m",
+    "dim gray": "\033[2m\033[90m",
+    "dim default": "\033[2m\033[39m",
+    "dim bright black": "\033[2m\033[90m",
+    "dim bright red": "\033[2m\033[91m",
+    "dim bright green": "\033[2m\033[92m",
+    "dim bright yellow": "\033[2m\033[93m",
+    "dim bright blue": "\033[2m\033[94m",
+    "dim bright magenta": "\033[2m\033[95m",
+    "dim bright cyan": "\033[2m\033[96m",
+    "dim bright white": "\033[2m\033[97m",
+
+    "italic black": "\033[3m\033[30m",
+    "italic red": "\033[3m\033[31m",
+    "italic green": "\033[3m\033[32m",
+    "italic yellow": "\033[3m\033[33m",
+    "italic blue": "\033[3m\033[34m",
+    "italic magenta": "\033[3m\033[35m",
+    "italic cyan": "\033[3m\033[36m",
+    "italic white": "\033[3m\033[37m",
+    "italic gray": "\033[3m\033[90m",
+    "italic default": "\033[3m\033[39m",
+    "italic bright black": "\033[3m\033[90m",
+    "italic bright red": "\033[3m\033[91m",
+    "italic bright green": "\033[3m\033[92m",
+    "italic bright yellow": "\033[3m\033[93m",
+    "italic bright blue": "\033[3m\033[94m",
+    "italic bright magenta": "\033[3m\033[95m",
+    "italic bright cyan": "\033[3m\033[96m",
+    "italic bright white": "\033[3m\033[97m",
+
+    "underline black": "\033[4m\033[30m",
+    "underline red": "\033[4m\033[31m",
+    "underline green": "\033[4m\033[32m",
+    "underline yellow": "\033[4m\033[33m",
+    "underline blue": "\033[4m\033[34m",
+    "underline magenta": "\033[4m\033[35m",
+    "underline cyan": "\033[4m\033[36m",
+    "underline white": "\033[4m\033[37m",
+    "underline gray": "\033[4m\033[90m",
+    "underline default": "\033[4m\033[39m",
+    "underline bright black": "\033[4m\033[90m",
+    "underline bright red": "\033[4m\033[91m",
+    "underline bright green": "\033[4m\033[92m",
+    "underline bright yellow": "\033[4m\033[93m",
+    "underline bright blue": "\033[4m\033[94m",
+    "underline bright magenta": "\033[4m\033[95m",
+    "underline bright cyan": "\033[4m\033[96m",
+    "underline bright white": "\033[4m\033[97m",
+
+    "blink black": "\033[5m\033[30m",
+    "blink red": "\033[5m\033[31m",
+    "blink green": "\033[5m\033[32m",
+    "blink yellow": "\033[5m\033[33m",
+    "blink blue": "\033[5m\033[34m",
+    "blink magenta": "\033[5m\033[35m",
+    "blink cyan": "\033[5m\033[36m",
+    "blink white": "\033[5m\033[37m",
+    "blink gray": "\033[5m\033[90m",
+    "blink default": "\033[5m\033[39m",
+    "blink bright black": "\033[5m\033[90m",
+    "blink bright red": "\033[5m\033[91m",
+    "blink bright green": "\033[5m\033[92m",
+    "blink bright yellow": "\033[5m\033[93m",
+    "blink bright blue": "\033[5m\033[94m",
+    "blink bright magenta": "\033[5m\033[95m",
+    "blink bright cyan": "\033[5m\033[96m",
+    "blink bright white": "\033[5m\033[97m",
+
+    "fast_blink black": "\033[6m\033[30m",
+    "fast_blink red": "\033[6m\033[31m",
+    "fast_blink green": "\033[6m\033[32m",
+    "fast_blink yellow": "\033[6m\033[33m",
+    "fast_blink blue": "\033[6m\033[34m",
+    "fast_blink magenta": "\033[6m\033[35m",
+    "fast_blink cyan": "\033[6m\033[36m",
+    "fast_blink white": "\033[6m\033[37m",
+    "fast_blink gray": "\033[6m\033[90m",
+    "fast_blink default": "\033[6m\033[39m",
+    "fast_blink bright black": "\033[6m\033[90m",
+    "fast_blink bright red": "\033[6m\033[91m",
+    "fast_blink bright green": "\033[6m\033[92m",
+    "fast_blink bright yellow": "\033[6m\033[93m",
+    "fast_blink bright blue": "\033[6m\033[94m",
+    "fast_blink bright magenta": "\033[6m\033[95m",
+    "fast_blink bright cyan": "\033[6m\033[96m",
+    "fast_blink bright white": "\033[6m\033[97m",
+
+    "inverse black": "\033[7m\033[30m",
+    "inverse red": "\033[7m\033[31m",
+    "inverse green": "\033[7m\033[32m",
+    "inverse yellow": "\033[7m\033[33m",
+    "inverse blue": "\033[7m\033[34m",
+    "inverse magenta": "\033[7m\033[35m",
+    "inverse cyan": "\033[7m\033[36m",
+    "inverse white": "\033[7m\033[37m",
+    "inverse gray": "\033[7m\033[90m",
+    "inverse default": "\033[7m\033[39m",
+    "inverse bright black": "\033[7m\033[90m",
+    "inverse bright red": "\033[7m\033[91m",
+    "inverse bright green": "\033[7m\033[92m",
+    "inverse bright yellow": "\033[7m\033[93m",
+    "inverse bright blue": "\033[7m\033[94m",
+    "inverse bright magenta": "\033[7m\033[95m",
+    "inverse bright cyan": "\033[7m\033[96m",
+    "inverse bright white": "\033[7m\033[97m",
+
+    "hidden black": "\033[8m\033[30m",
+    "hidden red": "\033[8m\033[31m",
+    "hidden green": "\033[8m\033[32m",
+    "hidden yellow": "\033[8m\033[33m",
+    "hidden blue": "\033[8m\033[34m",
+    "hidden magenta": "\033[8m\033[35m",
+    "hidden cyan": "\033[8m\033[36m",
+    "hidden white": "\033[8m\033[37m",
+    "hidden gray": "\033[8m\033[90m",
+    "hidden default": "\033[8m\033[39m",
+    "hidden bright black": "\033[8m\033[90m",
+    "hidden bright red": "\033[8m\033[91m",
+    "hidden bright green": "\033[8m\033[92m",
+    "hidden bright yellow": "\033[8m\033[93m",
+    "hidden bright blue": "\033[8m\033[94m",
+    "hidden bright magenta": "\033[8m\033[95m",
+    "hidden bright cyan": "\033[8m\033[96m",
+    "hidden bright white": "\033[8m\033[97m",
+
+    "strike black": "\033[9m\033[30m",
+    "strike red": "\033[9m\033[31m",
+    "strike green": "\033[9m\033[32m",
+    "strike yellow": "\033[9m\033[33m",
+    "strike blue": "\033[9m\033[34m",
+    "strike magenta": "\033[9m\033[35m",
+    "strike cyan": "\033[9m\033[36m",
+    "strike white": "\033[9m\033[37m",
+    "strike gray": "\033[9m\033[90m",
+    "strike default": "\033[9m\033[39m",
+    "strike bright black": "\033[9m\033[90m",
+    "strike bright red": "\033[9m\033[91m",
+    "strike bright green": "\033[9m\033[92m",
+    "strike bright yellow": "\033[9m\033[93m",
+    "strike bright blue": "\033[9m\033[94m",
+    "strike bright magenta": "\033[9m\033[95m",
+    "strike bright cyan": "\033[9m\033[96m",
+    "strike bright white": "\033[9m\033[97m",
+}
 
 # COMBINED_STYLES_WITH_BG: Practical style + foreground + background combinations
 # Focus on high contrast and commonly used patterns
@@ -486,91 +640,94 @@ COMBINED_STYLES_WITH_BG = {
     "dim magenta on black": "\033[2m\033[35m\033[40m",
 }
 
-# Type literal for all combined styles
-COMBINED_STYLES_LITERAL = Literal[
-    # All style + color combinations (162 entries)
-    "bold black", "bold red", "bold green", "bold yellow", "bold blue", "bold magenta",
-    "bold cyan", "bold white", "bold gray", "bold default", "bold bright black",
-    "bold bright red", "bold bright green", "bold bright yellow", "bold bright blue",
-    "bold bright magenta", "bold bright cyan", "bold bright white",
-
-    "dim black", "dim red", "dim green", "dim yellow", "dim blue", "dim magenta",
-    "dim cyan", "dim white", "dim gray", "dim default", "dim bright black",
-    "dim bright red", "dim bright green", "dim bright yellow", "dim bright blue",
-    "dim bright magenta", "dim bright cyan", "dim bright white",
-
-    "italic black", "italic red", "italic green", "italic yellow", "italic blue", "italic magenta",
-    "italic cyan", "italic white", "italic gray", "italic default", "italic bright black",
-    "italic bright red", "italic bright green", "italic bright yellow", "italic bright blue",
-    "italic bright magenta", "italic bright cyan", "italic bright white",
-
-    "underline black", "underline red", "underline green", "underline yellow", "underline blue", "underline magenta",
-    "underline cyan", "underline white", "underline gray", "underline default", "underline bright black",
-    "underline bright red", "underline bright green", "underline bright yellow", "underline bright blue",
-    "underline bright magenta", "underline bright cyan", "underline bright white",
-
-    "blink black", "blink red", "blink green", "blink yellow", "blink blue", "blink magenta",
-    "blink cyan", "blink white", "blink gray", "blink default", "blink bright black",
-    "blink bright red", "blink bright green", "blink bright yellow", "blink bright blue",
-    "blink bright magenta", "blink bright cyan", "blink bright white",
-
-    "fast_blink black", "fast_blink red", "fast_blink green", "fast_blink yellow", "fast_blink blue", "fast_blink magenta",
-    "fast_blink cyan", "fast_blink white", "fast_blink gray", "fast_blink default", "fast_blink bright black",
-    "fast_blink bright red", "fast_blink bright green", "fast_blink bright yellow", "fast_blink bright blue",
-    "fast_blink bright magenta", "fast_blink bright cyan", "fast_blink bright white",
-
-    "inverse black", "inverse red", "inverse green", "inverse yellow", "inverse blue", "inverse magenta",
-    "inverse cyan", "inverse white", "inverse gray", "inverse default", "inverse bright black",
-    "inverse bright red", "inverse bright green", "inverse bright yellow", "inverse bright blue",
-    "inverse bright magenta", "inverse bright cyan", "inverse bright white",
-
-    "hidden black", "hidden red", "hidden green", "hidden yellow", "hidden blue", "hidden magenta",
-    "hidden cyan", "hidden white", "hidden gray", "hidden default", "hidden bright black",
-    "hidden bright red", "hidden bright green", "hidden bright yellow", "hidden bright blue",
-    "hidden bright magenta", "hidden bright cyan", "hidden bright white",
-
-    "strike black", "strike red", "strike green", "strike yellow", "strike blue", "strike magenta",
-    "strike cyan", "strike white", "strike gray", "strike default", "strike bright black",
-    "strike bright red", "strike bright green", "strike bright yellow", "strike bright blue",
-    "strike bright magenta", "strike bright cyan", "strike bright white",
-
-    # All style + foreground + background combinations from COMBINED_STYLES_WITH_BG
-    "bold red on black", "bold red on white", "bold white on red", "bold white on blue",
-    "bold white on green", "bold white on black", "bold black on white", "bold black on yellow",
-    "bold yellow on black", "bold yellow on blue", "bold green on black", "bold blue on black",
-    "bold cyan on black", "bold magenta on black", "bold bright white on red", "bold bright white on blue",
-    "bold bright white on green", "bold bright white on black", "bold bright red on black", "bold bright green on black",
-    "bold bright blue on black", "bold bright yellow on black", "bold bright cyan on black", "bold bright magenta on black",
-
-    "italic cyan on black", "italic bright cyan on black", "italic blue on black", "italic green on black",
-    "italic white on blue", "italic white on black", "italic gray on black",
-
-    "underline red on black", "underline blue on black", "underline cyan on black", "underline white on blue",
-    "underline white on red", "underline bright cyan on black",
-
-    "dim white on black", "dim green on black", "dim red on black", "dim yellow on black",
-    "dim cyan on black", "dim gray on black",
-
-    "inverse red on white", "inverse white on black", "inverse black on white", "inverse blue on white",
-
-    "strike red on black", "strike white on red", "strike gray on black",
-
-    "blink red on black", "blink white on red", "blink yellow on black",
-
-    "fast_blink red on black", "fast_blink white on red",
-
-    "hidden white on black", "hidden black on black",
-
-    "bold black on cyan", "bold black on green", "bold black on magenta", "bold red on yellow",
-    "bold blue on white", "bold green on white", "bold magenta on white",
-
-    "bold black on bright white", "bold black on bright yellow", "bold black on bright cyan",
-    "bold black on bright green", "bold white on bright red", "bold white on bright blue",
-    "bold white on bright magenta", "bold bright white on bright red", "bold bright white on bright blue",
-
-    "italic white on gray", "underline green on black", "underline yellow on black",
-    "dim blue on black", "dim magenta on black",
-]
+# Type literal for all combined styles. Type checkers read the definition below;
+# at runtime the ~260-member Literal is only built when it's first accessed,
+# see __getattr__ at the end of this module.
+if TYPE_CHECKING:
+    COMBINED_STYLES_LITERAL = Literal[
+        # All style + color combinations (162 entries)
+        "bold black", "bold red", "bold green", "bold yellow", "bold blue", "bold magenta",
+        "bold cyan", "bold white", "bold gray", "bold default", "bold bright black",
+        "bold bright red", "bold bright green", "bold bright yellow", "bold bright blue",
+        "bold bright magenta", "bold bright cyan", "bold bright white",
+
+        "dim black", "dim red", "dim green", "dim yellow", "dim blue", "dim magenta",
+        "dim cyan", "dim white", "dim gray", "dim default", "dim bright black",
+        "dim bright red", "dim bright green", "dim bright yellow", "dim bright blue",
+        "dim bright magenta", "dim bright cyan", "dim bright white",
+
+        "italic black", "italic red", "italic green", "italic yellow", "italic blue", "italic magenta",
+        "italic cyan", "italic white", "italic gray", "italic default", "italic bright black",
+        "italic bright red", "italic bright green", "italic bright yellow", "italic bright blue",
+        "italic bright magenta", "italic bright cyan", "italic bright white",
+
+        "underline black", "underline red", "underline green", "underline yellow", "underline blue", "underline magenta",
+        "underline cyan", "underline white", "underline gray", "underline default", "underline bright black",
+        "underline bright red", "underline bright green", "underline bright yellow", "underline bright blue",
+        "underline bright magenta", "underline bright cyan", "underline bright white",
+
+        "blink black", "blink red", "blink green", "blink yellow", "blink blue", "blink magenta",
+        "blink cyan", "blink white", "blink gray", "blink default", "blink bright black",
+        "blink bright red", "blink bright green", "blink bright yellow", "blink bright blue",
+        "blink bright magenta", "blink bright cyan", "blink bright white",
+
+        "fast_blink black", "fast_blink red", "fast_blink green", "fast_blink yellow", "fast_blink blue", "fast_blink magenta",
+        "fast_blink cyan", "fast_blink white", "fast_blink gray", "fast_blink default", "fast_blink bright black",
+        "fast_blink bright red", "fast_blink bright green", "fast_blink bright yellow", "fast_blink bright blue",
+        "fast_blink bright magenta", "fast_blink bright cyan", "fast_blink bright white",
+
+        "inverse black", "inverse red", "inverse green", "inverse yellow", "inverse blue", "inverse magenta",
+        "inverse cyan", "inverse white", "inverse gray", "inverse default", "inverse bright black",
+        "inverse bright red", "inverse bright green", "inverse bright yellow", "inverse bright blue",
+        "inverse bright magenta", "inverse bright cyan", "inverse bright white",
+
+        "hidden black", "hidden red", "hidden green", "hidden yellow", "hidden blue", "hidden magenta",
+        "hidden cyan", "hidden white", "hidden gray", "hidden default", "hidden bright black",
+        "hidden bright red", "hidden bright green", "hidden bright yellow", "hidden bright blue",
+        "hidden bright magenta", "hidden bright cyan", "hidden bright white",
+
+        "strike black", "strike red", "strike green", "strike yellow", "strike blue", "strike magenta",
+        "strike cyan", "strike white", "strike gray", "strike default", "strike bright black",
+        "strike bright red", "strike bright green", "strike bright yellow", "strike bright blue",
+        "strike bright magenta", "strike bright cyan", "strike bright white",
+
+        # All style + foreground + background combinations from COMBINED_STYLES_WITH_BG
+        "bold red on black", "bold red on white", "bold white on red", "bold white on blue",
+        "bold white on green", "bold white on black", "bold black on white", "bold black on yellow",
+        "bold yellow on black", "bold yellow on blue", "bold green on black", "bold blue on black",
+        "bold cyan on black", "bold magenta on black", "bold bright white on red", "bold bright white on blue",
+        "bold bright white on green", "bold bright white on black", "bold bright red on black", "bold bright green on black",
+        "bold bright blue on black", "bold bright yellow on black", "bold bright cyan on black", "bold bright magenta on black",
+
+        "italic cyan on black", "italic bright cyan on black", "italic blue on black", "italic green on black",
+        "italic white on blue", "italic white on black", "italic gray on black",
+
+        "underline red on black", "underline blue on black", "underline cyan on black", "underline white on blue",
+        "underline white on red", "underline bright cyan on black",
+
+        "dim white on black", "dim green on black", "dim red on black", "dim yellow on black",
+        "dim cyan on black", "dim gray on black",
+
+        "inverse red on white", "inverse white on black", "inverse black on white", "inverse blue on white",
+
+        "strike red on black", "strike white on red", "strike gray on black",
+
+        "blink red on black", "blink white on red", "blink yellow on black",
+
+        "fast_blink red on black", "fast_blink white on red",
+
+        "hidden white on black", "hidden black on black",
+
+        "bold black on cyan", "bold black on green", "bold black on magenta", "bold red on yellow",
+        "bold blue on white", "bold green on white", "bold magenta on white",
+
+        "bold black on bright white", "bold black on bright yellow", "bold black on bright cyan",
+        "bold black on bright green", "bold white on bright red", "bold white on bright blue",
+        "bold white on bright magenta", "bold bright white on bright red", "bold bright white on bright blue",
+
+        "italic white on gray", "underline green on black", "underline yellow on black",
+        "dim blue on black", "dim magenta on black",
+    ]
 
 # ---------------------------------------------------------
 # Custom errors
@@ -593,11 +750,24 @@ class ColorOptions(TypedDict, total=False):
     style: STYLE_NAMES | None
     bg: COLOR_NAMES | None
 
+# ---------------------------------------------------------
+# Lazily built definitions (PEP 562)
+# ---------------------------------------------------------
+
+def __getattr__(name: str):
+    if name == "COMBINED_STYLES_LITERAL":
+        global COMBINED_STYLES_LITERAL
+        COMBINED_STYLES_LITERAL = Literal[(*COMBINED_STYLES, *COMBINED_STYLES_WITH_BG)]
+        return COMBINED_STYLES_LITERAL
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # ---------------------------------------------------------
 # Colorizing functions
 # ---------------------------------------------------------
 
 if __name__ == "__main__":
+    from . import cprint, cinput, colortext
+
     cprint("number colored text, passing numbers as argument")
     print("----")
     print(colortext(123, as_="bold red"))
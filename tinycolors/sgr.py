@@ -0,0 +1,99 @@
+"""
+SGR (Select Graphic Rendition) encoding for tinycolors.
+
+By default every parameter is sent as its own escape sequence, e.g.
+``"\\033[1m\\033[31m\\033[40m"``. In compact mode the same parameters are
+merged into a single sequence, ``"\\033[1;31;40m"``, which is shorter to send
+and to parse. Compact mode is enabled with ``set_compact_sgr(True)`` or by
+setting the ``TINYCOLORS_COMPACT`` environment variable to a non-empty value
+other than ``0``.
+
+``strip_ansi`` and ``visible_len`` go the other way and look through escape
+sequences, e.g. to align columns that contain colored text.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Callable
+
+_SGR_RUN_RE = re.compile(r"(?:\033\[[0-9;]*m){2,}")
+_SGR_PARAMS_RE = re.compile(r"\033\[([0-9;]*)m")
+# Any CSI sequence: ESC [, parameter bytes, intermediate bytes, a final byte.
+_ANSI_RE = re.compile(r"\033\[[0-?]*[ -/]*[@-~]")
+
+_compact = os.environ.get("TINYCOLORS_COMPACT", "") not in ("", "0")
+_listeners: list[Callable[[], None]] = []
+
+
+def compact_sgr_enabled() -> bool:
+    """Returns True if escape codes are emitted in compact form."""
+    return _compact
+
+
+def set_compact_sgr(enabled: bool) -> None:
+    """Switches compact SGR encoding on or off for all tinycolors output."""
+    global _compact
+    enabled = bool(enabled)
+    if enabled == _compact:
+        return
+    _compact = enabled
+    merge_sgr.cache_clear()
+    for listener in _listeners:
+        listener()
+
+
+def on_sgr_mode_change(listener: Callable[[], None]) -> Callable[[], None]:
+    """Registers a callback run after the encoding mode changes; usable as a decorator."""
+    _listeners.append(listener)
+    return listener
+
+
+def encode_sgr(params: tuple[str, ...]) -> str:
+    """Builds the escape sequence for a tuple of SGR parameters."""
+    if not params:
+        return ""
+    if _compact:
+        return "\033[" + ";".join(params) + "m"
+    return "".join(f"\033[{param}m" for param in params)
+
+
+def _merge_run(match: re.Match) -> str:
+    return "\033[" + ";".join(_SGR_PARAMS_RE.findall(match.group(0))) + "m"
+
+
+@lru_cache(maxsize=256)
+def merge_sgr(codes: str) -> str:
+    """Merges runs of adjacent SGR sequences in ``codes`` when compact mode is on."""
+    if not _compact:
+        return codes
+    return _SGR_RUN_RE.sub(_merge_run, codes)
+
+
+def strip_ansi(text: str) -> str:
+    """
+    Removes ANSI escape sequences from ``text``.
+
+    Handles every sequence tinycolors emits, including ``tprint`` output, and
+    returns ``text`` unchanged if it contains no escape character.
+
+    Examples:
+        >>> strip_ansi("\\033[1m\\033[31mError\\033[0m")
+        'Error'
+    """
+    if "\033" not in text:
+        return text
+    return _ANSI_RE.sub("", text)
+
+
+def visible_len(text: str) -> int:
+    """
+    Returns the number of characters in ``text`` that are not part of an escape sequence.
+
+    Examples:
+        >>> visible_len("\\033[1;31mError\\033[0m")
+        5
+    """
+    if "\033" not in text:
+        return len(text)
+    return len(text) - sum(map(len, _ANSI_RE.findall(text)))
@@ -0,0 +1,426 @@
+"""
+Style spec parsing for tinycolors.
+
+A style spec is the human readable string accepted by ``colortext(as_=...)``,
+such as ``"red"``, ``"bold italic red"`` or ``"underline cyan on bright blue"``.
+The grammar is::
+
+    spec  := "reset" | style* [color] ["on" color]
+    color := ["bright"] name | "color(" n ")" | "rgb(" r "," g "," b ")" | "#" rrggbb
+
+``color(n)`` selects an entry of the 256-color palette, while ``rgb(...)`` and
+``#rrggbb`` select a 24-bit truecolor.
+
+Resolved specs are memoized in a bounded LRU cache, so a spec that is used
+over and over again costs a single dictionary lookup after the first call.
+For hot loops, ``Style`` pre-resolves a spec into a callable object, and
+``render_spans`` joins many styled fragments while emitting only the escape
+codes that change between them.
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Iterable, NamedTuple, Optional, Union
+from .main import (
+    COLOR_MAP,
+    BG_COLOR_MAP,
+    STYLE_MAP,
+    COMBINED_STYLES,
+    COMBINED_STYLES_WITH_BG,
+    _STYLES_DICT,
+    _COLORS_DICT,
+    _BG_COLORS_DICT,
+    ColorNotFoundError,
+    StyleNotFoundError,
+    clib,
+)
+from .sgr import compact_sgr_enabled, encode_sgr, merge_sgr, on_sgr_mode_change
+
+STYLE_CACHE_SIZE = 1024
+"""Maximum number of resolved specs kept by ``resolve_style``."""
+
+# SGR parameters ("1", "31", "40", ...) keyed by the names used in style specs.
+_STYLE_PARAMS = {name: code[2:-1] for name, code in _STYLES_DICT.items()}
+_FG_PARAMS = {name: code[2:-1] for name, code in _COLORS_DICT.items()}
+_BG_PARAMS = {name: code[2:-1] for name, code in _BG_COLORS_DICT.items()}
+
+# Escape strings for the 256-color palette, built once and keyed by the SGR
+# base parameter: "38" for foreground and "48" for background colors.
+FG_256 = tuple(f"\033[38;5;{n}m" for n in range(256))
+BG_256 = tuple(f"\033[48;5;{n}m" for n in range(256))
+_PALETTES = {"38": FG_256, "48": BG_256}
+
+_TOKEN_RE = re.compile(r"rgb\(\s*\d+\s*,\s*\d+\s*,\s*\d+\s*\)|color\(\s*\d+\s*\)|\S+")
+_EXTENDED_RE = re.compile(
+    r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)|color\(\s*(\d+)\s*\)|#([0-9a-fA-F]{6})"
+)
+
+
+class StyleSpec(NamedTuple):
+    """A parsed style spec, stored as SGR parameters."""
+    styles: tuple[str, ...]
+    fg: Optional[str] = None
+    bg: Optional[str] = None
+
+    @property
+    def params(self) -> tuple[str, ...]:
+        """All SGR parameters in emission order: styles, foreground, background."""
+        params = self.styles
+        if self.fg is not None:
+            params += (self.fg,)
+        if self.bg is not None:
+            params += (self.bg,)
+        return params
+
+
+def _unsupported(spec: str, reason: str) -> StyleNotFoundError:
+    return StyleNotFoundError(
+        f"Style '{spec}' is not supported ({reason}). "
+        f"Use formats like 'red', 'bold', 'bold red', or 'italic cyan on blue'."
+    )
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def truecolor_code(base: str, r: int, g: int, b: int) -> str:
+    """Escape code for a 24-bit color; ``base`` is ``"38"`` (foreground) or ``"48"`` (background)."""
+    return f"\033[{base};2;{r};{g};{b}m"
+
+
+def extended_color_code(name: str, base: str) -> Optional[str]:
+    """
+    Escape code for ``color(n)``, ``rgb(r,g,b)`` or ``#rrggbb``.
+
+    ``base`` is ``"38"`` for a foreground and ``"48"`` for a background color.
+    Returns None if ``name`` is not a valid extended color.
+    """
+    match = _EXTENDED_RE.fullmatch(name) if isinstance(name, str) else None
+    if match is None:
+        return None
+    r, g, b, index, hex_code = match.groups()
+    if index is not None:
+        n = int(index)
+        return _PALETTES[base][n] if n < 256 else None
+    if hex_code is not None:
+        rgb = int(hex_code, 16)
+        return truecolor_code(base, rgb >> 16, (rgb >> 8) & 0xFF, rgb & 0xFF)
+    r, g, b = int(r), int(g), int(b)
+    if r > 255 or g > 255 or b > 255:
+        return None
+    return truecolor_code(base, r, g, b)
+
+
+def _parse_color(tokens: list[str], pos: int, table: dict[str, str], base: str) -> tuple[Optional[str], int]:
+    """Reads a color at ``pos``, returning the SGR parameter and the next position."""
+    if pos >= len(tokens):
+        return None, pos
+    token = tokens[pos]
+    if token == "bright" and pos + 1 < len(tokens):
+        name = f"bright {tokens[pos + 1]}"
+        if name in table:
+            return table[name], pos + 2
+        return None, pos
+    if token in table:
+        return table[token], pos + 1
+    code = extended_color_code(token, base)
+    if code is not None:
+        return code[2:-1], pos + 1
+    return None, pos
+
+
+def parse_style(spec: str) -> StyleSpec:
+    """
+    Parses a style spec into its styles, foreground and background parts.
+
+    Args:
+        spec: Style string such as ``"bold italic red on bright blue"``
+
+    Returns:
+        The parsed ``StyleSpec``
+
+    Raises:
+        StyleNotFoundError: If the spec does not follow the style grammar
+    """
+    if isinstance(spec, Style):
+        return spec.parts
+    if not isinstance(spec, str):
+        raise _unsupported(spec, "expected a string")
+
+    tokens = _TOKEN_RE.findall(spec)
+    if not tokens:
+        raise _unsupported(spec, "empty style")
+    if tokens == ["reset"]:
+        return StyleSpec(("0",))
+
+    pos = 0
+    styles: list[str] = []
+    while pos < len(tokens) and tokens[pos] in _STYLE_PARAMS:
+        styles.append(_STYLE_PARAMS[tokens[pos]])
+        pos += 1
+
+    fg, pos = _parse_color(tokens, pos, _FG_PARAMS, "38")
+
+    bg = None
+    if pos < len(tokens) and tokens[pos] == "on":
+        bg, end = _parse_color(tokens, pos + 1, _BG_PARAMS, "48")
+        if bg is None:
+            bad = " ".join(tokens[pos + 1:]) or "nothing"
+            raise _unsupported(spec, f"unknown background {bad!r}")
+        pos = end
+
+    if pos < len(tokens):
+        raise _unsupported(spec, f"unexpected {tokens[pos]!r}")
+
+    return StyleSpec(tuple(styles), fg, bg)
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def resolve_style(spec: str) -> str:
+    """
+    Resolves a style spec to its ANSI prefix.
+
+    Results are kept in a bounded LRU cache; use ``resolve_style.cache_info()``
+    for hit/miss statistics and ``resolve_style.cache_clear()`` to empty it.
+
+    Examples:
+        >>> resolve_style("bold red on black")
+        '\\033[1m\\033[31m\\033[40m'
+
+    Raises:
+        StyleNotFoundError: If the spec does not follow the style grammar
+    """
+    return encode_sgr(parse_style(spec).params)
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def resolve_parts(color: str, style: str, bg: str) -> str:
+    """
+    Resolves separate ``colorize()`` arguments to their ANSI prefix.
+
+    Pass ``"reset"`` for a part that should be left out. Colors may also be
+    given as ``color(n)``, ``rgb(r,g,b)`` or ``#rrggbb``.
+
+    Raises:
+        ColorNotFoundError: If the color or background is not supported
+        StyleNotFoundError: If the style is not supported
+    """
+    fg_color = _color_code(color, COLOR_MAP, "38", "Color")
+    if style not in STYLE_MAP:
+        raise StyleNotFoundError(f"Style {style} is not supported.")
+    bg_color = _color_code(bg, BG_COLOR_MAP, "48", "BG color")
+
+    text_style = STYLE_MAP[style] if style != "reset" else ""
+    return merge_sgr(bg_color + fg_color + text_style)
+
+
+def _color_code(name: str, table: dict[str, str], base: str, label: str) -> str:
+    """Escape code for a named or extended ``colorize()`` color; empty for ``"reset"``."""
+    if name == "reset":
+        return ""
+    code = table.get(name)
+    if code is None:
+        code = extended_color_code(name, base)
+        if code is None:
+            raise ColorNotFoundError(f"{label} {name} is not supported.")
+    return code
+
+
+@on_sgr_mode_change
+def _refresh_encoding() -> None:
+    """Re-encodes cached prefixes, interned styles and the combined maps."""
+    resolve_style.cache_clear()
+    resolve_parts.cache_clear()
+    for style in _INTERNED_PARTS.values():
+        style.prefix = encode_sgr(style.parts.params)
+    for table in (COMBINED_STYLES, COMBINED_STYLES_WITH_BG):
+        for spec in table:
+            table[spec] = resolve_style(spec)
+
+
+def apply_many(prefix: str,
+               items: Iterable[Any],
+               sep: Optional[str] = None,
+               reset: str = clib.reset) -> Union[list[str], str, Any]:
+    """
+    Wraps every item of ``items`` in ``prefix`` and ``reset``.
+
+    Returns a list of colored strings, or a single string joined with ``sep``
+    when ``sep`` is given. A NumPy unicode array is colored in vectorized form
+    and returned as an array of the same shape; NumPy itself is never imported
+    here, only used when the caller already passed one of its arrays.
+    """
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(items, numpy.ndarray) and items.dtype.kind == "U":
+        if sep is None:
+            return numpy.char.add(numpy.char.add(prefix, items), reset)
+        items = items.ravel().tolist()
+
+    if not prefix and not reset:
+        return list(map(str, items)) if sep is None else sep.join(map(str, items))
+    if sep is None:
+        return [prefix + text + reset for text in map(str, items)]
+
+    texts = list(map(str, items))
+    if not texts:
+        return ""
+    return prefix + (reset + sep + prefix).join(texts) + reset
+
+
+# Interned Style instances, keyed by the spec they were created from and by
+# their parsed form so that equivalent specs share a single object.
+_INTERNED_SPECS: dict[str, "Style"] = {}
+_INTERNED_PARTS: dict[StyleSpec, "Style"] = {}
+
+
+class Style:
+    """
+    A precompiled, reusable style.
+
+    The spec is validated once and its escape codes are stored on the instance,
+    so applying the style is a plain string concatenation. Instances are
+    interned: equal specs return the same object.
+
+    Examples:
+        >>> error = Style("bold red on black")
+        >>> error("Error!")
+        '\\033[1m\\033[31m\\033[40mError!\\033[0m'
+        >>> Style("bold red on black") is error
+        True
+
+    Raises:
+        StyleNotFoundError: If the spec does not follow the style grammar
+    """
+    __slots__ = ("spec", "parts", "prefix", "reset")
+
+    spec: str
+    parts: StyleSpec
+    prefix: str
+    reset: str
+
+    def __new__(cls, spec: "str | Style") -> "Style":
+        if isinstance(spec, Style):
+            return spec
+        try:
+            return _INTERNED_SPECS[spec]
+        except (KeyError, TypeError):
+            pass
+
+        parts = parse_style(spec)
+        self = _INTERNED_PARTS.get(parts)
+        if self is None:
+            self = object.__new__(cls)
+            self.spec = spec
+            self.parts = parts
+            self.prefix = encode_sgr(parts.params)
+            self.reset = clib.reset
+            _INTERNED_PARTS[parts] = self
+        _INTERNED_SPECS[spec] = self
+        return self
+
+    def __call__(self, text: Any) -> str:
+        return self.prefix + str(text) + self.reset
+
+    def __repr__(self) -> str:
+        return f"Style({self.spec!r})"
+
+    def __str__(self) -> str:
+        return self.prefix
+
+    def __reduce__(self):
+        return (Style, (self.spec,))
+
+
+# SGR parameter that switches off each style. Bold and dim share "22", and
+# both blink speeds share "25".
+_STYLE_OFF = {"1": "22", "2": "22", "3": "23", "4": "24", "5": "25", "6": "25", "7": "27", "8": "28", "9": "29"}
+_EMPTY = StyleSpec(())
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _parse_span_style(spec: str) -> StyleSpec:
+    """
+    Parses the style of a span. Unlike ``Style``, which interns every spec
+    for good, this keeps a bounded number of them, so gradients and heatmaps
+    with many distinct colors don't grow memory without bound.
+    """
+    return parse_style(spec)
+
+
+def _span_state(style: "str | Style | StyleSpec | None") -> StyleSpec:
+    """Returns the SGR state a span style asks for."""
+    if style is None:
+        return _EMPTY
+    if isinstance(style, StyleSpec):
+        parts = style
+    elif isinstance(style, str):
+        parts = _parse_span_style(style)
+    else:
+        parts = parse_style(style)
+    if parts.styles == ("0",):
+        return _EMPTY
+    return parts
+
+
+def _transition(old: StyleSpec, new: StyleSpec) -> tuple[str, ...]:
+    """SGR parameters that turn the ``old`` state into the ``new`` one."""
+    if not new.params:
+        return ("0",)
+
+    removed = [param for param in old.styles if param not in new.styles]
+    off = []
+    for param in removed:
+        code = _STYLE_OFF.get(param, "0")
+        if code not in off:
+            off.append(code)
+    if "0" in off:
+        return ("0",) + new.params
+
+    # "22" and "25" also clear a sibling style, which then has to be set again.
+    kept = [param for param in new.styles if param in old.styles and _STYLE_OFF[param] not in off]
+    params = off + [param for param in new.styles if param not in kept]
+    if new.fg != old.fg:
+        params.append(new.fg if new.fg is not None else "39")
+    if new.bg != old.bg:
+        params.append(new.bg if new.bg is not None else "49")
+
+    if len(encode_sgr(tuple(params))) > len(encode_sgr(("0",) + new.params)):
+        return ("0",) + new.params
+    return tuple(params)
+
+
+def render_spans(spans: Iterable[tuple[Any, "str | Style | StyleSpec | None"]]) -> str:
+    """
+    Renders a sequence of ``(text, style)`` pairs into one string.
+
+    Unlike concatenating ``colortext()`` results, the renderer tracks the
+    current SGR state and only emits the attributes that change between
+    adjacent segments, followed by a single reset at the end. A style of
+    ``None`` renders the text without attributes.
+
+    Examples:
+        >>> render_spans([("Error: ", "bold red"), ("disk full", "red")])
+        '\\033[1m\\033[31mError: \\033[22mdisk full\\033[0m'
+
+    Raises:
+        StyleNotFoundError: If a span style does not follow the style grammar
+    """
+    parts: list[str] = []
+    state = _EMPTY
+    for text, style in spans:
+        text = str(text)
+        if not text:
+            continue
+        new = _span_state(style)
+        if new != state:
+            parts.append(encode_sgr(_transition(state, new)))
+            state = new
+        parts.append(text)
+    if state != _EMPTY:
+        parts.append(clib.reset)
+    return "".join(parts)
+
+
+# The combined maps are built in the default encoding; re-encode them
+# once if compact mode was already enabled by TINYCOLORS_COMPACT.
+if compact_sgr_enabled():
+    _refresh_encoding()
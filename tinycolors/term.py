@@ -0,0 +1,129 @@
+"""
+Terminal color support detection for tinycolors.
+
+The color depth of a stream is detected once and cached per stream, from
+(in order of precedence) the mode set with ``set_color_mode()``, the
+``FORCE_COLOR`` and ``NO_COLOR`` environment variables, whether the stream
+is a TTY, and the ``TERM`` and ``COLORTERM`` environment variables.
+"""
+
+import os
+import sys
+from typing import Literal, Optional, TextIO
+from weakref import WeakKeyDictionary
+
+DEPTH_NONE = 0
+"""No color support; output is written without escape codes."""
+DEPTH_16 = 1
+"""The 16 basic and bright ANSI colors."""
+DEPTH_256 = 2
+"""The 256-color palette."""
+DEPTH_TRUECOLOR = 3
+"""24-bit truecolor."""
+
+ColorMode = Literal["auto", "always", "never"]
+
+_mode: ColorMode = "auto"
+_depths: "WeakKeyDictionary[TextIO, int]" = WeakKeyDictionary()
+_last_stream: Optional[TextIO] = None
+_last_depth = DEPTH_NONE
+
+
+def _env_depth() -> int:
+    """Color depth the terminal advertises through TERM and COLORTERM."""
+    if os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return DEPTH_TRUECOLOR
+    if "256color" in os.environ.get("TERM", ""):
+        return DEPTH_256
+    return DEPTH_16
+
+
+def _forced_depth() -> Optional[int]:
+    """Depth requested through FORCE_COLOR, or None if it is not set."""
+    force = os.environ.get("FORCE_COLOR")
+    if force is None:
+        return None
+    force = force.strip().lower()
+    if force in ("0", "false", "no", "off"):
+        return DEPTH_NONE
+    if force in ("2", "3"):
+        return max(int(force), _env_depth())
+    return _env_depth()
+
+
+def detect_color_depth(stream: Optional[TextIO]) -> int:
+    """
+    Detects the color depth of ``stream`` without using the cache.
+
+    Returns one of ``DEPTH_NONE``, ``DEPTH_16``, ``DEPTH_256`` or ``DEPTH_TRUECOLOR``.
+    """
+    if _mode == "never":
+        return DEPTH_NONE
+    if _mode == "always":
+        return _env_depth()
+
+    forced = _forced_depth()
+    if forced is not None:
+        return forced
+    if os.environ.get("NO_COLOR"):
+        return DEPTH_NONE
+    if stream is None:
+        return DEPTH_NONE
+    try:
+        if not stream.isatty():
+            return DEPTH_NONE
+    except Exception:
+        return DEPTH_NONE
+    if os.environ.get("TERM") == "dumb":
+        return DEPTH_NONE
+    return _env_depth()
+
+
+def color_depth(stream: Optional[TextIO] = None) -> int:
+    """
+    Returns the cached color depth of ``stream`` (default: the current ``sys.stdout``).
+
+    The depth is detected on first use and remembered for each stream.
+    """
+    global _last_stream, _last_depth
+    if stream is None:
+        stream = sys.stdout
+    if stream is _last_stream:
+        return _last_depth
+
+    try:
+        depth = _depths[stream]
+    except (KeyError, TypeError):
+        depth = detect_color_depth(stream)
+        try:
+            _depths[stream] = depth
+        except TypeError:
+            pass
+    _last_stream, _last_depth = stream, depth
+    return depth
+
+
+def colors_enabled(stream: Optional[TextIO] = None) -> bool:
+    """Returns True if escape codes should be written to ``stream`` (default: ``sys.stdout``)."""
+    return color_depth(stream) != DEPTH_NONE
+
+
+def get_color_mode() -> ColorMode:
+    """Returns the current color mode: ``"auto"``, ``"always"`` or ``"never"``."""
+    return _mode
+
+
+def set_color_mode(mode: ColorMode) -> None:
+    """
+    Sets whether tinycolors emits escape codes.
+
+    ``"auto"`` detects support per stream, ``"always"`` and ``"never"`` ignore
+    the stream and the environment. Changing the mode, including setting
+    ``"auto"`` again, discards all cached detection results.
+    """
+    global _mode, _last_stream, _last_depth
+    if mode not in ("auto", "always", "never"):
+        raise ValueError(f"Color mode {mode!r} is not supported. Use 'auto', 'always' or 'never'.")
+    _mode = mode
+    _depths.clear()
+    _last_stream, _last_depth = None, DEPTH_NONE
@@ -1,15 +1,25 @@
+import array
+import os
 import re
-from typing import Optional, Any, Union
-from .main import color, clib
+import shutil
+import sys
+from collections import deque
+from functools import lru_cache
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Callable, Iterator, Optional, Any, TextIO
+from .main import color, clib, Supported
+from .sgr import strip_ansi, visible_len
+from .term import colors_enabled
 from . import colorize
 
-Supported = Union[str, list[Any], dict[Any, Any], tuple[Any, ...], set[Any], int, float, bool, None]
-"""Supported types for prettification. Includes str, list, dict, tuple, set, int, float, bool, and None."""
-
 def indent(level: int) -> str:
     return '    ' * level
 
 
+_INDENT_WIDTH = len(indent(1))
+
+
 def is_quote(char: str) -> bool:
     return char in ('"', "'")
 
@@ -46,23 +56,111 @@ def get_bracket_colors():
     ]
 
 
-def color_bracket(char: str, bracket_stack: list[tuple[str, int]]) -> str:
-    colors = get_bracket_colors()
-    bracket_type = get_bracket_type(char)
+# The bracket colors, and every bracket pre-rendered in each of them.
+_BRACKET_COLORS = tuple(get_bracket_colors())
+_COLORED_BRACKETS = {
+    char: tuple(f"{bracket_color}{char}{clib.reset}" for bracket_color in _BRACKET_COLORS)
+    for char in '{}[]()'
+}
+_BRACKET_TYPES = {char: get_bracket_type(char) for char in '{}[]()'}
+_CONTAINER_TYPES = (list, dict, tuple, set)
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+_SIMPLE_TYPES = (int, float, bool, type(None))
 
-    type_depth = sum(1 for t, _ in bracket_stack if t == bracket_type)
+PRETTIFY_WIDTH = 80
+"""Default line width ``prettify`` fits containers into before expanding them."""
+
+TPRINT_CHUNK_SIZE = 65536
+"""Number of characters ``tprint`` collects before writing them to the stream."""
+
+
+def color_bracket(char: str, bracket_stack: list[tuple[str, int]]) -> str:
+    colored = _COLORED_BRACKETS[char]
+    bracket_type = _BRACKET_TYPES[char]
 
     if is_closing_bracket(char):
-        reverse_stack = bracket_stack[::-1]
-        for idx, (t, _) in enumerate(reverse_stack):
-            if t == bracket_type:
+        for k in range(len(bracket_stack) - 1, -1, -1):
+            if bracket_stack[k][0] == bracket_type:
                 # Calculate the depth of the *matching* opening bracket
-                current_depth = len(reverse_stack) - idx
-                bracket_color = colors[current_depth % len(colors)]
-                return f"{bracket_color}{char}{clib.reset}"
+                return colored[(k + 1) % len(colored)]
+
+    type_depth = sum(1 for t, _ in bracket_stack if t == bracket_type)
+    return colored[type_depth % len(colored)]
+
 
-    bracket_color = colors[type_depth % len(colors)]
-    return f"{bracket_color}{char}{clib.reset}"
+class _BracketStack:
+    """
+    The open brackets of a string, colored the same way as ``color_bracket``.
+
+    Keeps the stack positions of the open brackets of each type, which
+    double as per-type depth counters. A bracket that closes one that isn't
+    the innermost, as in "[(]", leaves a tombstone at its position instead
+    of shifting the ones opened after it, and a Fenwick tree over the
+    positions counts the brackets still open below any of them. Brackets
+    are therefore colored in O(1) when properly nested and in O(log depth)
+    otherwise.
+    """
+
+    __slots__ = ("types", "positions", "tree", "live")
+
+    def __init__(self) -> None:
+        # Bracket type by stack position, None once closed out of order
+        self.types: list[Optional[str]] = []
+        self.positions: dict[str, list[int]] = {'curly': [], 'square': [], 'paren': []}
+        # Fenwick tree of the open brackets by position, 1-based
+        self.tree: list[int] = [0]
+        self.live = 0
+
+    def _count(self, i: int) -> int:
+        """Returns the number of open brackets among the first ``i`` positions."""
+        tree = self.tree
+        total = 0
+        while i:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def color(self, char: str) -> str:
+        """Returns the colored bracket and opens or closes it."""
+        colored = _COLORED_BRACKETS[char]
+        bracket_type = _BRACKET_TYPES[char]
+        positions = self.positions[bracket_type]
+        types = self.types
+
+        if is_opening_bracket(char):
+            result = colored[len(positions) % len(colored)]
+            positions.append(len(types))
+            types.append(bracket_type)
+            i = len(types)
+            low = i & -i
+            if self.live == i - 1:
+                # No tombstones: every position below is open
+                self.tree.append(low)
+            else:
+                self.tree.append(1 + self._count(i - 1) - self._count(i - low))
+            self.live += 1
+            return result
+
+        if not positions:
+            return colored[0]
+        k = positions.pop()
+        if k == len(types) - 1:
+            # The innermost bracket: every open bracket is below it
+            rank = self.live
+        else:
+            # Closing an outer bracket: count the ones still open below it
+            rank = self._count(k + 1)
+            tree = self.tree
+            i = k + 1
+            while i < len(tree):
+                tree[i] -= 1
+                i += i & -i
+        types[k] = None
+        self.live -= 1
+        while types and types[-1] is None:
+            types.pop()
+            self.tree.pop()
+        return colored[rank % len(colored)]
 
 
 def open_quote(char: str) -> tuple[bool, str, str]:
@@ -70,20 +168,25 @@ def open_quote(char: str) -> tuple[bool, str, str]:
 
 
 def close_quote(substring: str) -> str:
-    return colorize(substring, "green")
+    return f"{clib.green}{substring}{clib.reset}"
 
 
 def append_char(substring: str, char: str) -> str:
     return substring + char
 
 
+_SYNTAX_RE = re.compile(r"\b(True|False|None)\b")
+_NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+# Both of the above in one pattern, for highlighting plain text in a single pass
+_PLAIN_RE = re.compile(r"\b(?:(?P<syntax>True|False|None)|\d+(?:\.\d+)?)\b")
+
+
 def color_syntax(text: str) -> str:
     def replacer(match: re.Match) -> str:
         word = match.group(0)
         return f"{color.italic.blue}{word}{clib.reset}" # type: ignore
 
-    pattern = r"\b(True|False|None)\b"
-    return re.sub(pattern, replacer, text)
+    return _SYNTAX_RE.sub(replacer, text)
 
 
 def color_numbers(text: str) -> str:
@@ -91,8 +194,22 @@ def color_numbers(text: str) -> str:
         word = match.group(0)
         return f"{clib.yellow}{word}{clib.reset}"
 
-    pattern = r"\b\d+(\.\d+)?\b"
-    return re.sub(pattern, replacer, text)
+    return _NUMBER_RE.sub(replacer, text)
+
+
+def _color_plain(text: str) -> str:
+    """Same as ``color_syntax(color_numbers(text))``, in one pass."""
+    if _PLAIN_RE.search(text) is None:
+        return text
+    syntax_color = f"{color.italic.blue}" # type: ignore
+    number_color = clib.yellow
+    reset = clib.reset
+
+    def replacer(match: re.Match) -> str:
+        word = match.group(0)
+        return f"{syntax_color if match.lastgroup else number_color}{word}{reset}"
+
+    return _PLAIN_RE.sub(replacer, text)
 
 
 def handle_escape(char: str, escaped: bool) -> tuple[str, bool]:
@@ -124,60 +241,75 @@ def append_result(result_parts: list[str], substring: str, in_quote: bool):
             result_parts.append(substring)
 
 
+# Characters that end a plain-text run: escapes, quotes and brackets.
+_SPECIAL_RE = re.compile(r"""[\\'"(){}\[\]]""")
+# Characters that matter when only looking for quoted strings.
+_QUOTE_OR_ESCAPE_RE = re.compile(r"""[\\'"]""")
+# Inside a quoted string only escapes and the quote character itself matter.
+_QUOTE_SCAN_RE = {'"': re.compile(r'[\\"]'), "'": re.compile(r"[\\']")}
+_QUOTE_RUN_RE = {'"': re.compile(r'"+'), "'": re.compile(r"'+")}
+
+
+def _closing_quote(element: str, start: int) -> int:
+    """
+    Returns the index of the quote that closes the one at ``start``, or -1.
+
+    Backslashes escape the next character, and doubled quotes (as in triple
+    quotes) don't close the string, so a run of quotes only closes it if its
+    length is odd.
+
+    A quote without a partner scans to the end of the string, but callers
+    scanning left to right hit at most one such quote per quote character:
+    after it, every run of that character has even length, so the next one
+    opens and closes a string. Matching all quotes is therefore linear.
+    """
+    quote_char = element[start]
+    scan = _QUOTE_SCAN_RE[quote_char].search
+    run = _QUOTE_RUN_RE[quote_char].match
+    j = start + 1
+    while True:
+        match = scan(element, j)
+        if match is None:
+            return -1
+        j = match.start()
+        if element[j] == '\\':
+            j += 2
+            continue
+        end = run(element, j).end()
+        if (end - j) % 2:
+            return end - 1
+        j = end
+
+
 def find_closed_quotes(element: str) -> tuple[set[int], set[int]]:
     """
     Identifies the starting and ending indices of balanced, non-escaped quotes
     in a string, handling escaped internal quotes like '\"'.
+
+    Takes linear time in the length of the string, see ``_closing_quote``.
     """
     opening_positions = set()
     closing_positions = set()
+    search = _QUOTE_OR_ESCAPE_RE.search
     i = 0
-    length = len(element)
-    escaped = False
 
-    while i < length:
-        char = element[i]
+    while True:
+        match = search(element, i)
+        if match is None:
+            break
+        i = match.start()
 
-        if escaped:
-            escaped = False
-            i += 1
+        if element[i] == '\\':
+            i += 2
             continue
 
-        if char == '\\':
-            escaped = True
+        end = _closing_quote(element, i)
+        if end < 0:
             i += 1
             continue
-
-        if is_quote(char):
-            quote_char = char
-            start_pos = i
-            j = i + 1
-            escaped_inner = False
-            found_close = False
-
-            while j < length:
-                current_char = element[j]
-                next_char = element[j + 1] if j + 1 < length else ""
-
-                if escaped_inner:
-                    escaped_inner = False
-                elif current_char == '\\':
-                    escaped_inner = True
-                elif current_char == quote_char:
-                    if next_char == quote_char:
-                        # Handles potential triple quotes, allowing the inner loop to continue
-                        j += 1
-                    else:
-                        opening_positions.add(start_pos)
-                        closing_positions.add(j)
-                        found_close = True
-                        break
-                j += 1
-
-            if found_close:
-                i = j
-
-        i += 1
+        opening_positions.add(i)
+        closing_positions.add(end)
+        i = end + 1
 
     return opening_positions, closing_positions
 
@@ -186,86 +318,47 @@ def prettify_string(element: str) -> str:
     """
     Highlights syntax, numbers, and quoted strings within a single string.
     Also handles bracket color matching when outside of quotes.
+
+    The string is scanned once, jumping between escapes, quotes and brackets,
+    and every plain-text run or quoted string is appended as one slice.
     """
-    opening_quotes, closing_quotes = find_closed_quotes(element)
     result_parts: list[str] = []
-    substring = ""
-    plain_text = ""
-    in_quote = False
-    quote_char: Optional[str] = None
-    bracket_stack: list[tuple[str, int]] = []
+    brackets = _BracketStack()
+    search = _SPECIAL_RE.search
+    plain_start = 0  # start of the plain-text run not yet appended
     i = 0
-    length = len(element)
 
-    while i < length:
+    while True:
+        match = search(element, i)
+        if match is None:
+            break
+        i = match.start()
         char = element[i]
-        next_char = element[i + 1] if i + 1 < length else ""
 
-        # Handle explicit escape sequences like '\n' or '\"'
-        if char == '\\' and i + 1 < length:
-            if in_quote:
-                substring += char
-                substring += next_char
-            else:
-                plain_text += char
-                plain_text += next_char
+        if char == '\\':
+            # Escape sequences like '\n' or '\"' stay part of the plain text
             i += 2
             continue
 
-        elif is_quote(char) and (i in opening_quotes or i in closing_quotes):
-            if not in_quote and i in opening_quotes:
-                if (plain_text):
-                    result_parts.append(color_syntax(color_numbers(plain_text)))
-                    plain_text = ""
-                in_quote, quote_char, substring = start_quote(char)
-            elif in_quote and char == quote_char and i in closing_quotes:
-                # The quote character must be the expected closing quote
-                in_quote, result_or_substring, quote_char = maybe_close_quote(substring, char, quote_char, next_char)
-                if not in_quote:
-                    # Closing quote found, append the colored string
-                    result_parts.append(result_or_substring.replace('\\"', '"'))
-                    substring = ""
-                else:
-                    # Still in quote (e.g. adjacent quotes like "" for triple quotes), continue building
-                    substring = result_or_substring
-            else:
-                # Quote inside a quote, or mismatched closing quote
-                if in_quote:
-                    substring += char
-                else:
-                    plain_text += char
-
-        elif is_bracket(char) and not in_quote:
-            if plain_text:
-                result_parts.append(color_syntax(color_numbers(plain_text)))
-                plain_text = ""
-
-            colored_bracket = color_bracket(char, bracket_stack)
-            result_parts.append(colored_bracket)
-
-            if is_opening_bracket(char):
-                bracket_type = get_bracket_type(char)
-                bracket_stack.append((bracket_type, i))
-            elif is_closing_bracket(char):
-                bracket_type = get_bracket_type(char)
-                # Pop the latest matching opening bracket from the stack
-                for k in range(len(bracket_stack) - 1, -1, -1):
-                    if bracket_stack[k][0] == bracket_type:
-                        bracket_stack.pop(k)
-                        break
+        if is_quote(char):
+            end = _closing_quote(element, i)
+            if end < 0:
+                # Quotes without a closing partner are plain text
+                i += 1
+                continue
+            if plain_start < i:
+                result_parts.append(_color_plain(element[plain_start:i]))
+            result_parts.append(close_quote(element[i:end + 1]).replace('\\"', '"'))
         else:
-            if in_quote:
-                substring += char
-            else:
-                plain_text += char
+            if plain_start < i:
+                result_parts.append(_color_plain(element[plain_start:i]))
+            result_parts.append(brackets.color(char))
+            end = i
 
-        i += 1
+        i = plain_start = end + 1
 
-    if (plain_text):
-        result_parts.append(color_syntax(color_numbers(plain_text)))
-    if (substring) and in_quote:
-        # Final append for an unterminated string (shouldn't happen with find_closed_quotes, but for safety)
-        result_parts.append(close_quote(substring).replace('\\"', '"'))
+    if plain_start < len(element):
+        result_parts.append(_color_plain(element[plain_start:]))
 
     return "".join(result_parts)
 
@@ -277,108 +370,939 @@ def escape_internal_quotes(s: str) -> str:
 
 def get_container_color_index(level: int) -> int:
     """Calculates the color index based on the nesting level for bracket coloring."""
-    colors = get_bracket_colors()
     if level <= 1:
         return 0
     else:
-        return (level - 1) % len(colors)
+        return (level - 1) % len(_BRACKET_COLORS)
 
 
 def prettify_simple(element: Any) -> str:
     """Highlights simple types (bool, None, int, float) with their respective colors."""
     s = str(element)
     if isinstance(element, (bool, type(None))):
-        return color_syntax(s)  # Colors True, False, None
+        # True, False or None, colored as a whole like color_syntax would
+        return f"{color.italic.blue}{s}{clib.reset}"  # type: ignore
     elif isinstance(element, (int, float)):
+        if s.replace('.', '', 1).isdigit():
+            # A plain number, like 12 or 2.5, is colored as a whole
+            return f"{clib.yellow}{s}{clib.reset}"
         return color_numbers(s) # Colors numbers
     return s
 
-def prettify_container(
+def prettify_quoted(element: str, level: int = 1) -> str:
+    """
+    Prettifies a string inside a container: wrapped in double quotes and green.
+
+    Gives the same result as passing the quoted, escaped string to
+    ``prettify_string``, but only strings with a backslash need the lexer.
+    """
+    if '\\' in element:
+        return prettify(f'"{escape_internal_quotes(element)}"', level)
+    # The only quotes the lexer would see are the outer pair and the escaped
+    # internal ones, so it would color the whole string and unescape them again.
+    return close_quote('"' + element + '"')
+
+
+def _byte_color(byte: int) -> str:
+    """Colors bytes by kind: NUL, whitespace, printable ASCII, other ASCII, non-ASCII."""
+    if byte == 0:
+        return clib.gray
+    if byte in b" \t\n\r\x0b\x0c":
+        return clib.green
+    if 0x20 < byte < 0x7f:
+        return clib.cyan
+    if byte < 0x80:
+        return clib.magenta
+    return clib.yellow
+
+
+# Every byte pre-rendered as a hex cell and as a character of the ASCII column
+_HEX_CELLS = tuple(f"{_byte_color(byte)}{byte:02x}{clib.reset}" for byte in range(256))
+_ASCII_CELLS = tuple(
+    f"{_byte_color(byte)}{chr(byte) if 0x20 <= byte < 0x7f else '.'}{clib.reset}" for byte in range(256)
+)
+_BLANK_CELL = "  "
+_HEXDUMP_ROW = 16
+
+
+def _iter_hexdump(element: Any, level: int = 1, max_bytes: Optional[int] = None) -> Iterator[str]:
+    """
+    Yields the hex dump of a bytes-like object: a ``<bytes len=...>`` header,
+    then one chunk per row of 16 bytes with the offset, the hex values and
+    the ASCII characters, each on a new line indented to ``level``.
+
+    Rows are read through ``memoryview`` slices, so the buffer is never
+    copied, and bytes past ``max_bytes`` are never read. A non-contiguous
+    buffer of another format is copied, but only the leading items that
+    hold the bytes shown.
+    """
+    with memoryview(element) as view:
+        size = view.nbytes
+        shown = size if max_bytes is None else min(size, max_bytes)
+        yield _marker(f"<{type(element).__name__} len={_short_count(size)}>")
+        if view.format != 'B' or view.ndim != 1:
+            # Any other layout is read byte by byte; only non-contiguous buffers need a copy
+            if view.c_contiguous:
+                view = view.cast('B')
+            else:
+                if shown < size:
+                    # Slices along the first dimension, by whole items or rows of items
+                    step = size // view.shape[0]
+                    view = view[:-(-shown // step)]
+                view = memoryview(view.tobytes())
+        row_start = f"\n{indent(level)}{clib.gray}"
+        reset = clib.reset
+        hex_cells = _HEX_CELLS
+        ascii_cells = _ASCII_CELLS
+        for offset in range(0, shown, _HEXDUMP_ROW):
+            row = view[offset:min(offset + _HEXDUMP_ROW, shown)]
+            cells = [hex_cells[byte] for byte in row]
+            if len(cells) < _HEXDUMP_ROW:
+                cells.extend([_BLANK_CELL] * (_HEXDUMP_ROW - len(cells)))
+            yield (
+                f"{row_start}{offset:08x}{reset}  {' '.join(cells[:8])}  {' '.join(cells[8:])}"
+                f"  |{''.join([ascii_cells[byte] for byte in row])}|"
+            )
+        if shown < size:
+            hidden = size - shown
+            yield f"\n{indent(level)}{_marker(f'... {hidden:,} more byte' + ('s' if hidden > 1 else ''))}"
+
+
+def prettify_bytes(element: Any, level: int = 1, max_bytes: Optional[int] = None) -> str:
+    """
+    Converts a bytes, bytearray or memoryview into a colored hex dump with
+    offset, hex and ASCII columns, showing at most ``max_bytes`` bytes.
+
+    Examples:
+        >>> print(prettify_bytes(b"Hello, world!\\n"))
+    """
+    return "".join(_iter_hexdump(element, level, max_bytes))
+
+
+ARRAY_THRESHOLD = 1000
+"""Arrays with more elements than this are summarized by their first and last ``ARRAY_EDGE_ITEMS``."""
+
+ARRAY_EDGE_ITEMS = 3
+
+
+def _array_cells(values: Any, kind: str, level: int) -> str:
+    """
+    Prettifies array elements of the NumPy dtype ``kind``, separated by
+    commas. Numbers and booleans share one color per array, so they are
+    colored by joining their text with a colored separator rather than by
+    lexing each of them.
+    """
+    if kind in ("i", "u", "f", "b"):
+        cell_color = clib.yellow if kind != "b" else f"{color.italic.blue}" # type: ignore
+        texts = list(map(str, values))
+        if not texts:
+            return ""
+        return f"{cell_color}{f'{clib.reset}, {cell_color}'.join(texts)}{clib.reset}"
+    if kind == "U":
+        return ", ".join(prettify_quoted(str(value), level) for value in values)
+    return ", ".join(prettify(value, level) for value in values)
+
+
+def prettify_array(element: Any, level: int = 1, max_items: Optional[int] = None) -> str:
+    """
+    Summarizes an ``array.array`` or a NumPy array: a header with its length,
+    or its shape and dtype, followed by its elements in flat order, e.g.
+    ``<ndarray shape=(1000, 3) dtype=float64> [0.0, 1.0, 2.0, ... 2,994 more items, ...]``.
+
+    Arrays with more than ``ARRAY_THRESHOLD`` elements, or ``max_items`` if
+    given, show only their first and last ones. Only those are read from
+    the array; it is never converted to a list or a string as a whole.
+
+    Examples:
+        >>> print(prettify_array(numpy.arange(1_000_000)))
+    """
+    if isinstance(element, array.array):
+        header = f"<array typecode={element.typecode!r} len={_short_count(len(element))}>"
+        size = len(element)
+        items = element
+        kind = "U" if element.typecode in ("u", "w") else "f"
+    else:
+        header = f"<{type(element).__name__} shape={element.shape} dtype={element.dtype}>"
+        size = element.size
+        items = element.flat
+        kind = element.dtype.kind
+
+    limit = ARRAY_THRESHOLD if max_items is None else max_items
+    if size <= limit:
+        head, tail = size, 0
+    else:
+        head = min(ARRAY_EDGE_ITEMS, (limit + 1) // 2)
+        tail = min(ARRAY_EDGE_ITEMS, limit // 2)
+    parts = [_array_cells(items[:head], kind, level + 1)] if head else []
+    if head + tail < size:
+        parts.append(_marker(_more_items(size - head - tail)))
+        if tail:
+            parts.append(_array_cells(items[size - tail:], kind, level + 1))
+
+    color_index = get_container_color_index(level)
+    return (
+        f"{_marker(header)} {_COLORED_BRACKETS['['][color_index]}"
+        f"{', '.join(parts)}{_COLORED_BRACKETS[']'][color_index]}"
+    )
+
+
+def _marker(text: str) -> str:
+    """Highlights text that stands in for elided or repeated parts, like ``<cycle>``."""
+    return f"{color.italic.blue}{text}{clib.reset}" # type: ignore
+
+
+def _short_count(n: int) -> str:
+    """Formats a size for a summary: ``512``, ``1.5K``, ``4.2M``, ``3.0G``."""
+    for unit, scale in (("G", 1_000_000_000), ("M", 1_000_000), ("K", 1_000)):
+        if n >= scale:
+            return f"{n / scale:.1f}{unit}"
+    return str(n)
+
+
+def _summary(element: Any) -> str:
+    """
+    Summarizes an element by its type and length, e.g. ``<str len=4.2M>``,
+    or a record by its class, e.g. ``Point(...)``, without iterating it.
+    """
+    record = _record_of(element)
+    if record is not None:
+        return _marker(f"{record.name}(...)")
+    return _marker(f"<{type(element).__name__} len={_short_count(len(element))}>")
+
+
+def _check_limits(
+    max_items: Optional[int],
+    max_depth: Optional[int],
+    max_string: Optional[int],
+    max_bytes: Optional[int] = None,
+    width: int = PRETTIFY_WIDTH,
+) -> None:
+    limits = (
+        ("max_items", max_items), ("max_depth", max_depth), ("max_string", max_string), ("max_bytes", max_bytes),
+    )
+    for name, limit in limits:
+        if limit is not None and limit < 0:
+            raise ValueError(f"{name} must be None or a non-negative integer, got {limit!r}")
+    if width < 1:
+        raise ValueError(f"width must be a positive integer, got {width!r}")
+
+
+def _more_items(hidden: int) -> str:
+    return f"... {hidden:,} more item{'s' if hidden > 1 else ''}"
+
+
+RECORD_CACHE_SIZE = 1024
+"""Number of classes whose record fields are kept cached, see ``_record_fields``."""
+
+_MISSING = object()
+
+
+class _Record:
+    """
+    How the instances of a class with named fields are shown, as
+    ``Name(field=value, ...)``: the class name, the field names, and a
+    function returning the values of an instance in the same order.
+    """
+
+    __slots__ = ("name", "label", "fields", "values", "partial")
+
+    def __init__(
+        self, name: str, fields: tuple[str, ...], values: Callable[[Any], Any], partial: bool = False,
+    ) -> None:
+        self.name = name
+        self.label = f"{color.bold}{name}{clib.reset}" # type: ignore
+        self.fields = fields
+        self.values = values
+        # Slots may be unset; their value is _MISSING and the field is left out
+        self.partial = partial
+
+    def pairs(self, element: Any) -> list[tuple[str, Any]]:
+        """Returns the ``(field, value)`` pairs of an instance."""
+        pairs = list(zip(self.fields, self.values(element)))
+        if self.partial:
+            return [pair for pair in pairs if pair[1] is not _MISSING]
+        return pairs
+
+
+def _attr_getter(names: tuple[str, ...]) -> Callable[[Any], tuple[Any, ...]]:
+    """Returns a function that gets the attributes ``names`` of an object as a tuple."""
+    if len(names) > 1:
+        return attrgetter(*names)
+    if names:
+        get = attrgetter(names[0])
+        return lambda element: (get(element),)
+    return lambda element: ()
+
+
+def _slot_names(cls: type) -> Optional[tuple[tuple[str, str], ...]]:
+    """
+    Returns the ``(field, attribute)`` names of the slots of ``cls``, base
+    classes first, or None if its instances also have a ``__dict__``.
+    Private slots are stored under their mangled attribute name.
+    """
+    names = []
+    for klass in reversed(cls.__mro__[:-1]):
+        slots = klass.__dict__.get("__slots__")
+        if slots is None:
+            return None
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot == "__dict__":
+                return None
+            if slot == "__weakref__":
+                continue
+            if slot.startswith("__") and not slot.endswith("__"):
+                names.append((slot, f"_{klass.__name__.lstrip('_')}{slot}"))
+            else:
+                names.append((slot, slot))
+    return tuple(names)
+
+
+@lru_cache(maxsize=RECORD_CACHE_SIZE)
+def _record_fields(cls: type) -> Optional[_Record]:
+    """
+    Returns how to show the instances of ``cls`` field by field, or None if
+    they are not records. The fields are looked up once per class:
+    - dataclasses: the fields shown by their ``repr``
+    - namedtuples: ``_fields``
+    - attrs classes: the attributes in ``__attrs_attrs__`` shown by their ``repr``
+    - classes with ``__slots__`` and no ``__dict__``: the slots that are set,
+      unless the class defines its own ``__repr__`` or ``__str__``
+
+    Classes with a ``__tinycolors__`` method render themselves instead.
+    """
+    if hasattr(cls, "__tinycolors__"):
+        return None
+    name = cls.__name__
+    if issubclass(cls, tuple):
+        fields = getattr(cls, "_fields", None)
+        if isinstance(fields, tuple) and all(isinstance(field, str) for field in fields):
+            return _Record(name, fields, lambda element: element)
+        return None
+    if hasattr(cls, "__dataclass_fields__"):
+        # dataclasses is already imported by whoever defined the class
+        import dataclasses
+        fields = tuple(field.name for field in dataclasses.fields(cls) if field.repr)
+        return _Record(name, fields, _attr_getter(fields))
+    attributes = getattr(cls, "__attrs_attrs__", None)
+    if attributes is not None:
+        fields = tuple(attribute.name for attribute in attributes if attribute.repr is not False)
+        return _Record(name, fields, _attr_getter(fields))
+    if cls.__repr__ is object.__repr__ and cls.__str__ is object.__str__ and "__slots__" in cls.__dict__:
+        slots = _slot_names(cls)
+        if slots:
+            fields = tuple(field for field, _ in slots)
+            attrs = tuple(attr for _, attr in slots)
+            return _Record(name, fields, lambda element: [getattr(element, attr, _MISSING) for attr in attrs], True)
+    return None
+
+
+def _record_of(element: Any) -> Optional[_Record]:
+    """Returns how to show ``element`` field by field, or None if it is not a record."""
+    cls = element.__class__
+    if cls is list or cls is dict or cls is tuple or cls is set or cls is str:
+        return None
+    return _record_fields(cls)
+
+
+# What prettify does with an element, resolved once per type by _dispatch
+_STRING = 0  # quoted in containers, lexed on its own
+_NESTED = 1  # walked by _walk_containers: containers and records
+_SIMPLE = 2  # int, float, bool and None, see prettify_simple
+_BYTES = 3   # hex dump, see prettify_bytes
+_ARRAY = 4   # summary, see prettify_array
+_CUSTOM = 5  # a registered prettifier or the __tinycolors__ hook
+_OTHER = 6   # str(element), lexed by prettify_string
+
+_BUILTIN_KINDS = {
+    str: _STRING,
+    **dict.fromkeys(_CONTAINER_TYPES, _NESTED),
+    **dict.fromkeys(_SIMPLE_TYPES, _SIMPLE),
+    **dict.fromkeys(_BYTES_TYPES, _BYTES),
+    array.array: _ARRAY,
+}
+
+Prettifier = Callable[[Any, int], str]
+"""A function that prettifies an element at a nesting level, see ``register_prettifier``."""
+
+_prettifiers: dict[type, Prettifier] = {}
+
+DISPATCH_CACHE_SIZE = 1024
+"""Number of types whose way of being prettified is kept cached, see ``_dispatch``."""
+
+
+def _call_hook(element: Any, level: int) -> str:
+    return element.__tinycolors__()
+
+
+@lru_cache(maxsize=DISPATCH_CACHE_SIZE)
+def _dispatch(cls: type) -> tuple[int, Optional[Prettifier]]:
+    """
+    Returns how ``prettify`` shows the instances of ``cls``: one of the kinds
+    above, and the function to call for ``_CUSTOM``. Resolved once per type,
+    so prettifying mixed containers costs one cache lookup per item:
+    - the prettifier registered for the nearest class in the MRO, or for an
+      abstract base class of ``cls``
+    - the ``__tinycolors__`` method
+    - the fields of a record, see ``_record_fields``
+    - the built-in kind of the nearest class in the MRO, so subclasses of
+      ``str`` or ``int`` take the same path as their base
+    - NumPy arrays; NumPy is never imported here, if it isn't imported yet
+      ``cls`` can't be one of its arrays
+    """
+    if _prettifiers:
+        for klass in cls.__mro__:
+            func = _prettifiers.get(klass)
+            if func is not None:
+                return _CUSTOM, func
+        for klass, func in _prettifiers.items():
+            if issubclass(cls, klass):
+                return _CUSTOM, func
+    if hasattr(cls, "__tinycolors__"):
+        return _CUSTOM, _call_hook
+    if _record_fields(cls) is not None:
+        return _NESTED, None
+    for klass in cls.__mro__:
+        kind = _BUILTIN_KINDS.get(klass)
+        if kind is not None:
+            return kind, None
+    ndarray = getattr(sys.modules.get("numpy"), "ndarray", None)
+    if ndarray is not None and issubclass(cls, ndarray):
+        return _ARRAY, None
+    return _OTHER, None
+
+
+def register_prettifier(cls: type, func: Optional[Prettifier] = None) -> Any:
+    """
+    Registers ``func(element, level) -> str`` to prettify the instances of
+    ``cls`` and of its subclasses, also inside containers; its result is used
+    as is. As with ``functools.singledispatch``, the function registered for
+    the nearest class in the MRO wins, and ``cls`` may be an abstract base class.
+    Registered functions take precedence over built-in rendering.
+
+    Returns ``func``, or a decorator that registers it if ``func`` is omitted.
+
+    Examples:
+        >>> @register_prettifier(Decimal)
+        ... def _(element, level):
+        ...     return colorize(str(element), color="yellow")
+    """
+    if func is None:
+        return lambda func: register_prettifier(cls, func)
+    if not isinstance(cls, type):
+        raise TypeError(f"register_prettifier() expects a class, got {cls!r}")
+    _prettifiers[cls] = func
+    _dispatch.cache_clear()
+    return func
+
+
+def _is_nested(element: Any) -> bool:
+    """Returns True for the elements rendered by ``_walk_containers``: containers and records."""
+    return _dispatch(element.__class__)[0] == _NESTED
+
+
+class _Render:
+    """
+    The settings of one prettify call and the state shared by its containers:
+    the ids of the containers being rendered, the measured widths of the
+    single-line form of containers, and the chunks of the leaves that were
+    rendered to be measured, both by id and level.
+    """
+
+    __slots__ = (
+        "width", "max_items", "max_depth", "max_string", "max_bytes", "base_level", "active", "widths", "leaves",
+    )
+
+    def __init__(
+        self,
+        level: int,
+        width: int = PRETTIFY_WIDTH,
+        max_items: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_string: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        _check_limits(max_items, max_depth, max_string, max_bytes, width)
+        self.width = width
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self.max_string = max_string
+        self.max_bytes = max_bytes
+        self.base_level = level
+        self.active: set[int] = set()
+        # (id, level) -> (width, complete); an incomplete width is a lower bound
+        self.widths: dict[tuple[int, int], tuple[int, bool]] = {}
+        # (id, level) -> chunk, until the leaf is rendered
+        self.leaves: dict[tuple[int, int], str] = {}
+
+    def leaf(self, item: Any, level: int) -> str:
+        """
+        Returns the chunk of a leaf rendered by a function, like an object
+        with a hook or an array, or of a one-item tuple. A chunk made to
+        measure the leaf is reused, so hooks and prettifiers run once per item.
+        """
+        chunk = self.leaves.pop((id(item), level), None)
+        if chunk is None:
+            chunk = self._render_leaf(item, level)
+        return chunk
+
+    def _measured_leaf(self, item: Any, level: int) -> str:
+        """Returns the chunk of a leaf, and keeps it for ``leaf``."""
+        key = (id(item), level)
+        chunk = self.leaves.get(key)
+        if chunk is None:
+            chunk = self.leaves[key] = self._render_leaf(item, level)
+        return chunk
+
+    def _render_leaf(self, item: Any, level: int) -> str:
+        if _dispatch(item.__class__)[0] != _NESTED:
+            return _prettify_other(item, level, self.max_items)
+        # A one-item tuple, shown with a trailing comma, its item within the limits
+        value = item[0]
+        kind = _dispatch(value.__class__)[0]
+        if kind == _STRING and self.max_string is not None and len(value) > self.max_string:
+            text = _summary(value)
+        elif kind == _BYTES:
+            text = "".join(_iter_hexdump(value, level + 1, self.max_bytes))
+        elif kind == _STRING:
+            text = prettify(value, level + 1)
+        else:
+            text = _prettify_other(value, level + 1, self.max_items)
+        color_index = get_container_color_index(level)
+        return f"{_COLORED_BRACKETS['('][color_index]}{text},{_COLORED_BRACKETS[')'][color_index]}"
+
+    def fits(self, element: Any, level: int) -> bool:
+        """
+        Returns True if ``element`` fits on one line at ``level``: the visible
+        width of its single-line form is at most ``width`` minus the indentation.
+
+        Containers indented past the width stay on one line as well; expanding
+        them would only indent their items further, and make the output of
+        deeply nested structures grow with the square of their depth.
+        """
+        budget = self.width - _INDENT_WIDTH * level
+        if budget <= 0:
+            return True
+        cached = self.widths.get((id(element), level))
+        if cached is not None and (cached[1] or cached[0] > budget):
+            return cached[0] <= budget
+        return self._measure(element, level, budget) <= budget
+
+    def _leaf_width(self, item: Any, level: int) -> int:
+        """Returns the visible width of an item that is not a container."""
+        kind = _dispatch(item.__class__)[0]
+        if kind == _STRING:
+            if self.max_string is not None and len(item) > self.max_string:
+                return visible_len(_summary(item))
+            if '\\' in item:
+                return visible_len(prettify_quoted(item))
+            return len(item) + 2
+        if kind == _SIMPLE:
+            return len(str(item))
+        if kind == _BYTES:
+            # A hex dump takes several lines unless it is empty
+            with memoryview(item) as view:
+                return sys.maxsize if view.nbytes else visible_len(next(_iter_hexdump(item)))
+        return visible_len(self._measured_leaf(item, level))
+
+    def _open_frame(self, frames: list[list[Any]], path: set[int], container: Any, level: int) -> int:
+        """Pushes a container for ``_measure`` and returns the width of everything but its items."""
+        record = _record_of(container)
+        pairs = record.pairs(container) if record is not None else None
+        size = len(container) if pairs is None else len(pairs)
+        shown = size if self.max_items is None or size <= self.max_items else self.max_items
+        is_key_value = isinstance(container, dict)
+        # Brackets, ", " between entries and ": " in each pair
+        width = 2 + 2 * max(shown + (shown < size) - 1, 0) + (2 * shown if is_key_value else 0)
+        if pairs is not None:
+            # The class name, and "field=" in each pair
+            del pairs[shown:]
+            width += len(record.name) + sum(len(field) + 1 for field, _ in pairs)  # type: ignore
+            items: Any = [value for _, value in pairs]
+        else:
+            items = container.items() if is_key_value else container
+            if shown < size:
+                items = islice(items, shown)
+            if is_key_value:
+                items = chain.from_iterable(items)
+        if shown < size:
+            width += len(_more_items(size - shown))
+        frames.append([(id(container), level), width, iter(items), True])
+        path.add(id(container))
+        return width
+
+    def _measure(self, element: Any, level: int, budget: int) -> int:
+        """
+        Returns the visible width of the single-line form of ``element``, or
+        a lower bound of it as soon as that exceeds ``budget``.
+
+        Walks the containers with an explicit stack like ``_walk_containers``,
+        and stops early, so measuring costs at most about ``budget`` items.
+        The width of every container that was measured completely is cached
+        for later decisions, unless it was cut short by a cycle and so depends
+        on where it is rendered.
+        """
+        widths = self.widths
+        max_string = self.max_string
+        # Open containers: [key, width so far, remaining items, reusable]
+        frames: list[list[Any]] = []
+        path: set[int] = set()
+        total = self._open_frame(frames, path, element, level)
+        while frames:
+            if total > budget:
+                # Keep what was learned as lower bounds for the open containers
+                for key, width, _, reusable in frames:
+                    known = widths.get(key)
+                    if reusable and (known is None or not known[1] and known[0] < width):
+                        widths[key] = (width, False)
+                return total
+            frame = frames[-1]
+            nested_level = frame[0][1] + 1
+            for item in frame[2]:
+                kind = _dispatch(item.__class__)[0]
+                # The most common leaves first
+                if kind == _STRING and max_string is None and '\\' not in item:
+                    width = len(item) + 2
+                elif kind == _SIMPLE:
+                    width = len(str(item))
+                elif kind != _NESTED:
+                    width = self._leaf_width(item, nested_level)
+                elif id(item) in path or id(item) in self.active:
+                    width = len("<cycle>")
+                    for open_ in frames:
+                        open_[3] = False
+                elif self.max_depth is not None and nested_level - self.base_level >= self.max_depth:
+                    width = visible_len(_summary(item))
+                elif _is_single(item):
+                    width = visible_len(self._measured_leaf(item, nested_level))
+                else:
+                    cached = widths.get((id(item), nested_level))
+                    if cached is not None and (cached[1] or total + cached[0] > budget):
+                        width = cached[0]
+                    else:
+                        total += self._open_frame(frames, path, item, nested_level)
+                        break
+                frame[1] += width
+                total += width
+                if total > budget:
+                    break
+            else:
+                frames.pop()
+                path.discard(frame[0][0])
+                if frame[3]:
+                    widths[frame[0]] = (frame[1], True)
+                if not frames:
+                    return frame[1]
+                frames[-1][1] += frame[1]
+        return total
+
+
+def _container_chunks(
     element: Any,
     open_char: str,
     close_char: str,
     level: int,
-    is_key_value: bool = False,
-) -> str:
-    """
-    Generic function to handle lists, tuples, and sets, controlling
-    the bracket type and key/value formatting.
+    is_key_value: bool,
+    render: _Render,
+    compact: Optional[bool] = None,
+    record: Optional[_Record] = None,
+) -> Iterator[Any]:
     """
-    colors = get_bracket_colors()
-    color_index = get_container_color_index(level)
-    bracket_color = colors[color_index]
+    Yields the chunks of a single container, or of a ``record`` shown as
+    ``Name(field=value, ...)``. Nested containers are not
+    rendered here: an ``(item, level, compact)`` tuple is yielded in their
+    place, and ``_walk_containers`` renders it before resuming this generator.
 
-    colored_open = f"{bracket_color}{open_char}{clib.reset}"
-    colored_close = f"{bracket_color}{close_char}{clib.reset}"
+    ``compact`` forces the single-line form, as for containers nested in one
+    that is on a single line; by default the form is chosen by width.
 
+    Only the first ``max_items`` items are visited, the rest are counted in
+    a summary, and strings longer than ``max_string`` are summarized.
+    """
+    color_index = get_container_color_index(level)
+    colored_open = _COLORED_BRACKETS[open_char][color_index]
+    if record is not None:
+        colored_open = record.label + colored_open
+    colored_close = _COLORED_BRACKETS[close_char][color_index]
     nested_level = level + 1
-    items = list(element)
+    max_items = render.max_items
+    max_string = render.max_string
 
-    # Use compact, single-line format for small containers
-    compact_limit = 3 if is_key_value else 10
-    if len(element) <= compact_limit:
-        parts = []
+    # Use the compact, single-line format if it fits in the width,
+    # and the expanded, multi-line format otherwise
+    if record is not None:
+        values: Any = record.pairs(element)
+    else:
+        values = element.items() if is_key_value else element
+    size = len(values)
+    shown = size if max_items is None or size <= max_items else max_items
+    if compact is None:
+        compact = size == 0 or render.fits(element, level)
+    # Containers on a single line hold nested containers on the same line
+    nested_compact = True if compact else None
+    if compact:
+        separator = ', '
+        yield colored_open
+    else:
+        separator = f",\n{indent(nested_level)}"
+        yield f"{colored_open}\n{indent(nested_level)}"
+
+    # Key and value formatting for dicts, item formatting for lists, tuples and sets.
+    # The separator is joined to the next rendered item rather than yielded on its own.
+    if shown < size:
+        values = islice(values, shown)
+    prefix = ''
+    for value in values:
         if is_key_value:
-            for k, v in element.items():
-                # Key formatting
-                if isinstance(k, str):
-                    key_str = prettify(f'"{escape_internal_quotes(k)}"', nested_level)
+            key, value = value
+            kind = _dispatch(key.__class__)[0]
+            if record is not None:
+                yield f"{prefix}{key}="
+            elif kind == _STRING:
+                if max_string is not None and len(key) > max_string:
+                    yield f"{prefix}{_summary(key)}: "
                 else:
-                    key_str = prettify(k, nested_level)
+                    yield f"{prefix}{prettify_quoted(key, nested_level)}: "
+            elif kind == _NESTED:
+                if prefix:
+                    yield prefix
+                yield (key, nested_level, nested_compact)
+                yield ': '
+            elif kind == _BYTES:
+                if prefix:
+                    yield prefix
+                yield from _iter_hexdump(key, nested_level + 1, render.max_bytes)
+                yield ': '
+            else:
+                yield f"{prefix}{render.leaf(key, nested_level)}: "
+            prefix = ''
+        kind = _dispatch(value.__class__)[0]
+        if kind == _STRING:
+            if max_string is not None and len(value) > max_string:
+                yield prefix + _summary(value)
+            else:
+                yield prefix + prettify_quoted(value, nested_level)
+        elif kind == _NESTED:
+            if prefix:
+                yield prefix
+            yield (value, nested_level, nested_compact)
+        elif kind == _SIMPLE:
+            yield prefix + prettify_simple(value)
+        elif kind == _BYTES:
+            if prefix:
+                yield prefix
+            # The rows are indented below the item they belong to
+            yield from _iter_hexdump(value, nested_level + 1, render.max_bytes)
+        else:
+            yield prefix + render.leaf(value, nested_level)
+        prefix = separator
 
-                # Value formatting
-                if isinstance(v, str):
-                    value_str = prettify(f'"{escape_internal_quotes(v)}"', nested_level)
-                else:
-                    value_str = prettify(v, nested_level)
+    if shown < size:
+        yield prefix + _marker(_more_items(size - shown))
 
-                parts.append(f"{key_str}: {value_str}")
+    if compact:
+        yield colored_close
+    else:
+        yield f"\n{indent(level)}{colored_close}"
+
+
+def _is_single(element: Any) -> bool:
+    """Returns True for a tuple of one item that is shown with a trailing comma, like ``(1,)``."""
+    return (
+        isinstance(element, tuple) and len(element) == 1
+        and not _is_nested(element[0]) and _record_of(element) is None
+    )
+
+
+def _nested_chunks(element: Any, level: int, render: _Render, compact: Optional[bool] = None) -> Iterator[Any]:
+    """Returns the chunk generator for a nested list, dict, tuple, set or record."""
+    record = _record_of(element)
+    if record is not None:
+        return _container_chunks(element, '(', ')', level, True, render, compact, record)
+    if isinstance(element, list):
+        return _container_chunks(element, '[', ']', level, False, render, compact)
+    if isinstance(element, dict):
+        return _container_chunks(element, '{', '}', level, True, render, compact)
+    if isinstance(element, tuple):
+        if _is_single(element):
+            return iter((render.leaf(element, level),))
+        return _container_chunks(element, '(', ')', level, False, render, compact)
+    return _container_chunks(element, '{', '}', level, False, render, compact)
+
+
+def _shared_containers(element: Any, max_items: Optional[int] = None, max_depth: Optional[int] = None) -> set[int]:
+    """
+    Returns the ids of the containers that are referenced more than once
+    inside ``element``. Each container is visited once, breadth first and
+    within the same limits as rendering, so this costs one pass over the
+    distinct containers that will be shown, however much they are shared.
+    """
+    seen = {id(element)}
+    shared = set()
+    pending = deque([(element, 0)])
+    while pending:
+        container, depth = pending.popleft()
+        if max_depth is not None and depth >= max_depth:
+            continue
+        record = _record_of(container)
+        if record is not None:
+            items: Any = [value for _, value in record.pairs(container)[:max_items]]
         else:
-            for item in items:
-                if isinstance(item, str):
-                    # Ensure strings are wrapped in quotes before being passed to prettify_string
-                    item_str = prettify(f'"{escape_internal_quotes(item)}"', nested_level)
+            items = container.items() if isinstance(container, dict) else container
+            if max_items is not None and len(container) > max_items:
+                items = islice(items, max_items)
+            if isinstance(container, dict):
+                items = chain.from_iterable(items)
+        for item in items:
+            if _is_nested(item):
+                if id(item) in seen:
+                    shared.add(id(item))
                 else:
-                    item_str = prettify(item, nested_level)
-                parts.append(item_str)
+                    seen.add(id(item))
+                    pending.append((item, depth + 1))
+    return shared
 
-        return colored_open + ', '.join(parts) + colored_close
 
-    # Use expanded, multi-line format for large containers
-    result = colored_open
-    if is_key_value:
-        items = list(element.items())
+# Chunks of a nested container joined before it is walked on the stack instead
+_FLAT_PARTS = 256
 
-    for i, item in enumerate(items):
-        comma = ',' if i < len(items) - 1 else ''
 
-        if is_key_value:
-            key, value = item
-            # Key formatting
-            if isinstance(key, str):
-                key_str = prettify(f'"{escape_internal_quotes(key)}"', nested_level)
-            else:
-                key_str = prettify(key, nested_level)
+def _walk_containers(element: Any, chunks: Iterator[Any], render: _Render, memo: bool = False) -> Iterator[str]:
+    """
+    Yields the string chunks of nested containers without recursion.
+
+    The generators of the containers being rendered are kept on an explicit
+    stack, outermost first. When the innermost one yields a nested container,
+    that container's generator is pushed; when it is exhausted, it is popped
+    and its parent resumes. Nesting depth is therefore limited by memory,
+    not by the interpreter's recursion limit, and each chunk is passed on
+    by this loop alone rather than by one generator per level.
+
+    A container that is already on the stack is rendered as ``<cycle>``, and
+    one nested more than ``max_depth`` levels deep is summarized by its length.
+    With ``memo``, containers referenced more than once are rendered once
+    per level and the text is reused for their other occurrences.
+
+    A container is first rendered in a tight loop, and if it holds no nested
+    containers, as is common in wide data, it is passed on as one chunk
+    without being pushed; only the first ``_FLAT_PARTS`` chunks are joined
+    that way, so memory stays bounded for large containers.
+
+    The measured width of a container is dropped once it is rendered, so
+    like the stack, the cache of widths holds little more than the current
+    path through the structure. With ``memo``, the widths of shared
+    containers are kept for their other occurrences.
+    """
+    max_depth = render.max_depth
+    widths = render.widths
+    stack = [chunks]
+    # (id, level) of the containers on the stack, the keys of their widths
+    stack_keys = [(id(element), render.base_level)]
+    active = render.active
+    active.add(id(element))
+    shared = _shared_containers(element, render.max_items, max_depth) if memo else ()
+    rendered: dict[tuple[int, int, Optional[bool]], str] = {}
+    # Shared containers being recorded: [stack index, memo key, chunks, reusable]
+    recording: list[list[Any]] = []
+
+    while stack:
+        for chunk in stack[-1]:
+            pushed = False
+            while chunk.__class__ is tuple:
+                item, level, compact = chunk
+                item_id = id(item)
+                if item_id in active:
+                    chunk = _marker("<cycle>")
+                    # What is rendered inside a container depends on its ancestors
+                    # once a cycle is cut short, so those renderings can't be reused
+                    for record in recording:
+                        record[3] = False
+                elif max_depth is not None and len(stack) >= max_depth:
+                    chunk = _summary(item)
+                elif item_id in shared and (item_id, level, compact) in rendered:
+                    chunk = rendered[item_id, level, compact]
+                elif item_id in shared:
+                    recording.append([len(stack), (item_id, level, compact), [], True])
+                    stack.append(_nested_chunks(item, level, render, compact))
+                    stack_keys.append((item_id, level))
+                    active.add(item_id)
+                    chunk = None
+                    pushed = True
+                else:
+                    active.add(item_id)
+                    nested = _nested_chunks(item, level, render, compact)
+                    leading: list[str] = []
+                    for chunk in nested:
+                        if chunk.__class__ is tuple or len(leading) == _FLAT_PARTS:
+                            break
+                        leading.append(chunk)
+                    else:
+                        # No nested containers inside: passed on as one chunk
+                        active.discard(item_id)
+                        widths.pop((item_id, level), None)
+                        chunk = "".join(leading)
+                        break
+                    # The rest is rendered on the stack, starting with the chunk it stopped at
+                    stack.append(nested)
+                    stack_keys.append((item_id, level))
+                    pushed = True
+                    if recording:
+                        recording[-1][2].append("".join(leading))
+                    else:
+                        yield "".join(leading)
+            if chunk is not None:
+                if recording:
+                    recording[-1][2].append(chunk)
+                else:
+                    yield chunk
+            if pushed:
+                break
+        else:
+            stack.pop()
+            key = stack_keys.pop()
+            active.discard(key[0])
+            if key[0] not in shared:
+                widths.pop(key, None)
+            if recording and recording[-1][0] == len(stack):
+                _, key, parts, reusable = recording.pop()
+                text = "".join(parts)
+                if reusable:
+                    rendered[key] = text
+                if recording:
+                    recording[-1][2].append(text)
+                else:
+                    yield text
 
-            # Value formatting
-            if isinstance(value, str):
-                value_str = prettify(f'"{escape_internal_quotes(value)}"', nested_level)
-            else:
-                value_str = prettify(value, nested_level)
 
-            line = f"{key_str}: {value_str}{comma}"
-        else:
-            # Item formatting (for lists, tuples, sets)
-            if isinstance(item, str):
-                item_str = prettify(f'"{escape_internal_quotes(item)}"', nested_level)
-            else:
-                item_str = prettify(item, nested_level)
-            line = f"{item_str}{comma}"
+def iter_prettify_container(
+    element: Any,
+    open_char: str,
+    close_char: str,
+    level: int,
+    is_key_value: bool = False,
+    memo: bool = False,
+) -> Iterator[str]:
+    """
+    Yields ``prettify_container(element, ...)`` in chunks, prettifying
+    nested containers as they are reached.
+    """
+    render = _Render(level)
+    chunks = _container_chunks(element, open_char, close_char, level, is_key_value, render)
+    return _walk_containers(element, chunks, render, memo)
 
-        result += f"\n{indent(nested_level)}{line}"
 
-    result += f"\n{indent(level)}{colored_close}"
-    return result
+def prettify_container(
+    element: Any,
+    open_char: str,
+    close_char: str,
+    level: int,
+    is_key_value: bool = False,
+    memo: bool = False,
+) -> str:
+    """
+    Generic function to handle lists, tuples, and sets, controlling
+    the bracket type and key/value formatting.
+    """
+    return "".join(iter_prettify_container(element, open_char, close_char, level, is_key_value, memo))
 
 
 def prettify_list(element: list[Any], level: int = 0) -> str:
@@ -394,12 +1318,10 @@ def prettify_dict(element: dict[Any, Any], level: int = 0) -> str:
 def prettify_tuple(element: tuple[Any, ...], level: int = 0) -> str:
     """NEW: Recursively converts a tuple into a color-highlighted, formatted string."""
     # Special handling for single-item tuples to ensure the trailing comma is present
-    if len(element) == 1 and not isinstance(element[0], (list, dict, tuple, set)):
+    if len(element) == 1 and not _is_nested(element[0]):
         item_str = prettify(element[0], level + 1)
-        colors = get_bracket_colors()
         color_index = get_container_color_index(level)
-        bracket_color = colors[color_index]
-        return f"{bracket_color}({clib.reset}{item_str},{bracket_color}){clib.reset}"
+        return f"{_COLORED_BRACKETS['('][color_index]}{item_str},{_COLORED_BRACKETS[')'][color_index]}"
 
     return prettify_container(element, '(', ')', level, is_key_value=False)
 
@@ -409,34 +1331,178 @@ def prettify_set(element: set[Any], level: int = 0) -> str:
     return prettify_container(element, '{', '}', level, is_key_value=False)
 
 
-def prettify(element: Supported, level: int = 1) -> str:
+def _prettify_other(element: Any, level: int = 1, max_items: Optional[int] = None) -> str:
+    """Prettifies anything that is neither a string, a container, a record nor bytes."""
+    kind, func = _dispatch(element.__class__)
+    if kind == _SIMPLE:
+        # NEW: Handle simple types directly
+        return prettify_simple(element)
+    if kind == _ARRAY:
+        return prettify_array(element, level, max_items)
+    if kind == _CUSTOM:
+        result = func(element, level) # type: ignore
+        if not isinstance(result, str):
+            name = "__tinycolors__" if func is _call_hook else f"prettifier for {type(element).__name__}"
+            raise TypeError(f"{name} returned non-string (type {type(result).__name__})")
+        return result
+    # Fallback for other objects (e.g. custom classes)
+    return prettify_string(str(element))
+
+
+def prettify(
+    element: Supported,
+    level: int = 1,
+    memo: bool = False,
+    *,
+    max_items: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    max_string: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    width: int = PRETTIFY_WIDTH,
+) -> str:
     """
     The main entry point for prettifying an element, dispatching to the
     appropriate formatting function based on type.
+
+    Containers that contain themselves are cut short with a ``<cycle>``
+    marker. With ``memo=True``, a container referenced several times is
+    rendered once per nesting level and the result is reused, which pays
+    off for structures with heavy sharing.
+
+    A container is printed on one line if that line, without escape codes
+    and indentation, is at most ``width`` characters wide, and with one item
+    per line otherwise.
+
+    The limits keep the output of large structures short. Parts beyond
+    them are summarized and never iterated or converted to strings:
+    - ``max_items``: items shown per container, e.g. ``... 99,990 more items``
+    - ``max_depth``: levels of nested containers shown, e.g. ``<list len=12>``
+    - ``max_string``: characters a string may have, e.g. ``<str len=4.2M>``
+    - ``max_bytes``: bytes shown in a hex dump, e.g. ``... 4,096 more bytes``
+
+    Bytes, bytearrays and memoryviews are shown as a hex dump, see ``prettify_bytes``,
+    and NumPy arrays and ``array.array`` as a summary, see ``prettify_array``.
+    Other types can be given their own rendering with ``register_prettifier``.
+
+    Dataclasses, namedtuples, attrs classes and objects with ``__slots__``
+    are shown field by field, like ``Point(x=1, y=2)``, and laid out like
+    containers. An object can render itself instead with a
+    ``__tinycolors__(self) -> str`` method, whose result is used as is.
+
+    Examples:
+        >>> print(prettify(list(range(100_000)), max_items=10))
     """
-    if isinstance(element, str):
-        result = prettify_string(element)
-    elif isinstance(element, list):
-        result = prettify_list(element, level)
-    elif isinstance(element, dict):
-        result = prettify_dict(element, level)
-    elif isinstance(element, tuple):
-        result = prettify_tuple(element, level)
-    elif isinstance(element, set):
-        result = prettify_set(element, level)
-    elif isinstance(element, (int, float, bool, type(None))):
-        # NEW: Handle simple types directly
-        result = prettify_simple(element)
+    _check_limits(max_items, max_depth, max_string, max_bytes, width)
+    kind = _dispatch(element.__class__)[0]
+    if kind == _STRING:
+        if max_string is not None and len(element) > max_string:
+            result = _summary(element)
+        else:
+            result = prettify_string(element)
+    elif kind == _NESTED:
+        result = "".join(iter_prettify(
+            element, level, memo,
+            max_items=max_items, max_depth=max_depth, max_string=max_string, max_bytes=max_bytes, width=width,
+        ))
+    elif kind == _BYTES:
+        result = prettify_bytes(element, level, max_bytes)
     else:
-        # Fallback for other objects (e.g. custom classes, bytes)
-        result = prettify_string(str(element))
+        result = _prettify_other(element, level, max_items)
 
     return result
 
 
-def tprint(element: Supported, level: int = 0) -> None:
-    """Prints the prettified element to the console."""
-    print(prettify(element, level))
+def iter_prettify(
+    element: Supported,
+    level: int = 1,
+    memo: bool = False,
+    *,
+    max_items: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    max_string: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    width: int = PRETTIFY_WIDTH,
+) -> Iterator[str]:
+    """
+    Yields the prettified element in chunks that join up to ``prettify(element, level)``.
+
+    Containers are walked lazily, so only the current path through the
+    structure is held in memory rather than the whole output, and hex dumps
+    are yielded row by row. ``memo`` and the limits work as for ``prettify``;
+    with ``memo``, shared containers are yielded as one chunk.
+
+    Examples:
+        >>> for chunk in iter_prettify(data):
+        ...     stream.write(chunk)
+    """
+    kind = _dispatch(element.__class__)[0]
+    if kind == _NESTED:
+        render = _Render(level, width, max_items, max_depth, max_string, max_bytes)
+        if max_depth == 0:
+            return iter((_summary(element),))
+        return _walk_containers(element, _nested_chunks(element, level, render), render, memo)
+    _check_limits(max_items, max_depth, max_string, max_bytes, width)
+    if kind == _BYTES:
+        return _iter_hexdump(element, level, max_bytes)
+    # Strings, simple types, arrays and other objects fit in a single chunk
+    return iter((prettify(element, level, max_items=max_items, max_string=max_string),))
+
+
+def _stream_width(stream: TextIO) -> int:
+    """Returns the width of the terminal behind ``stream``, or ``PRETTIFY_WIDTH``."""
+    if stream is sys.stdout:
+        return shutil.get_terminal_size((PRETTIFY_WIDTH, 24)).columns
+    try:
+        return os.get_terminal_size(stream.fileno()).columns
+    except (AttributeError, OSError, ValueError):
+        return PRETTIFY_WIDTH
+
+
+def tprint(
+    element: Supported,
+    level: int = 0,
+    file: Optional[TextIO] = None,
+    memo: bool = False,
+    *,
+    max_items: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    max_string: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    width: Optional[int] = None,
+) -> None:
+    """
+    Prints the prettified element to ``file`` (default: ``sys.stdout``).
+
+    The output is written in chunks of about ``TPRINT_CHUNK_SIZE`` characters
+    as it is produced, so printing a large structure doesn't build the whole
+    output in memory first. ``memo`` and the limits work as for ``prettify``,
+    and ``width`` defaults to the width of the terminal, if there is one.
+
+    If the stream does not support colors, as for a file or a pipe, the same
+    layout is written with the escape codes stripped from each chunk.
+    """
+    stream = sys.stdout if file is None else file
+    plain = not colors_enabled(stream)
+    buffer: list[str] = []
+    size = 0
+    if width is None:
+        width = _stream_width(stream)
+    chunks = iter_prettify(
+        element, level, memo,
+        max_items=max_items, max_depth=max_depth, max_string=max_string, max_bytes=max_bytes, width=width,
+    )
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= TPRINT_CHUNK_SIZE:
+            text = "".join(buffer)
+            stream.write(strip_ansi(text) if plain else text)
+            buffer.clear()
+            size = 0
+    buffer.append("\n")
+    text = "".join(buffer)
+    stream.write(strip_ansi(text) if plain else text)
+
 
 def demo():
     """
@@ -0,0 +1,225 @@
+"""
+Buffered output for tinycolors.
+
+``ColorWriter`` collects styled writes in memory and hands them to the
+underlying stream in large chunks, instead of issuing one ``print()`` (and
+possibly one flush of a line-buffered TTY) per message.
+"""
+
+import atexit
+import heapq
+import os
+import sys
+from itertools import count
+from threading import TIMEOUT_MAX, Condition, Lock, Thread
+from time import monotonic
+from typing import Any, Optional, TextIO
+from weakref import WeakSet
+from .main import clib
+from .styles import Style, resolve_parts, resolve_style
+from .term import colors_enabled
+
+_WRITERS: "WeakSet[ColorWriter]" = WeakSet()
+_active_writer: Optional["ColorWriter"] = None
+
+# Flush deadlines of the writers with buffered text, earliest first. The
+# entries hold the writers, so a writer isn't collected with text in its buffer.
+_deadlines: list[tuple[float, int, "ColorWriter"]] = []
+_deadline_order = count()
+_deadlines_changed = Condition()
+_flusher: Optional[Thread] = None
+
+
+class ColorWriter:
+    """
+    A buffered, thread-safe writer for colored text.
+
+    Colors are only written if the stream supports them (see ``colors_enabled()``).
+    Writes are collected in an internal buffer, which is written to the stream
+    when it holds ``buffer_size`` characters, at most ``flush_interval``
+    seconds after the first write into the empty buffer (by a background
+    thread shared by all writers), when ``flush()`` is called, and at
+    interpreter exit. A writer is kept alive until its buffer is written.
+
+    Args:
+        stream: Text stream to write to. Defaults to the current ``sys.stdout``
+        buffer_size: Number of buffered characters that triggers a flush
+        flush_interval: Longest time in seconds that text stays in the buffer
+
+    Examples:
+        >>> with ColorWriter() as out:
+        ...     out.cprint("Error!", as_="bold red")
+        ...     out.cprint("Done", color="green")
+    """
+
+    def __init__(self,
+                 stream: Optional[TextIO] = None,
+                 buffer_size: int = 8192,
+                 flush_interval: float = 0.1) -> None:
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._parts: list[str] = []
+        self._size = 0
+        self._last_flush = monotonic()
+        self._deadline: Optional[float] = None
+        self._lock = Lock()
+        _WRITERS.add(self)
+
+    def write(self, text: str) -> int:
+        """Buffers raw text, flushing if a threshold is reached."""
+        with self._lock:
+            self._parts.append(text)
+            self._size += len(text)
+            now = monotonic()
+            if self._size >= self.buffer_size or now - self._last_flush >= self.flush_interval:
+                self._flush()
+            elif self._deadline is None:
+                self._deadline = now + self.flush_interval
+                _schedule_flush(self, self._deadline)
+        return len(text)
+
+    def colorize(self, text: Any,
+                 color: Optional[str] = None,
+                 style: Optional[str] = None,
+                 bg: Optional[str] = None,
+                 end: str = "") -> None:
+        """Buffers ``colorize(text, color, style, bg)`` followed by ``end``."""
+        if not colors_enabled(self._target()):
+            self.write(str(text) + end)
+            return
+        prefix = resolve_parts(color or "reset", style or "reset", bg or "reset")
+        self.write(prefix + str(text) + clib.reset + end)
+
+    def colortext(self, text: Any, as_: "str | Style", end: str = "") -> None:
+        """Buffers ``colortext(text, as_)`` followed by ``end``."""
+        if not colors_enabled(self._target()):
+            self.write(str(text) + end)
+            return
+        self.write(resolve_style(as_) + str(text) + clib.reset + end)
+
+    def cprint(self, text: Any,
+               color: Optional[str] = None,
+               style: Optional[str] = None,
+               bg: Optional[str] = None,
+               as_: "str | Style | None" = None,
+               end: Optional[str] = "\n",
+               flush: bool = False) -> None:
+        """
+        Buffers a line the same way ``cprint()`` would print it.
+
+        If ``as_`` is given it takes precedence over color, style and bg.
+        ``flush=True`` writes the buffer out immediately.
+        """
+        if end is None:
+            end = "\n"
+        if as_ is not None:
+            self.colortext(text, as_, end)
+        else:
+            self.colorize(text, color, style, bg, end)
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes everything buffered so far to the stream."""
+        with self._lock:
+            self._flush()
+
+    def _flush_due(self, deadline: float) -> None:
+        """Flushes the buffer if it still holds the text due at ``deadline``."""
+        with self._lock:
+            if self._deadline == deadline:
+                self._flush()
+
+    def _flush(self) -> None:
+        self._last_flush = monotonic()
+        self._deadline = None
+        if not self._parts:
+            return
+        data = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        stream = self._target()
+        stream.write(data)
+        stream.flush()
+
+    def _target(self) -> TextIO:
+        return self.stream if self.stream is not None else sys.stdout
+
+    def close(self) -> None:
+        """Flushes the buffer and stops routing ``cprint()`` here if this is the active writer."""
+        self.flush()
+        if get_writer() is self:
+            set_writer(None)
+
+    def __enter__(self) -> "ColorWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+
+def get_writer() -> Optional[ColorWriter]:
+    """Returns the process-wide writer used by ``cprint()``, if any."""
+    return _active_writer
+
+
+def set_writer(writer: Optional[ColorWriter]) -> Optional[ColorWriter]:
+    """
+    Routes ``cprint()`` through ``writer``, or back to ``print()`` when ``None``.
+
+    The previously active writer is flushed and returned.
+    """
+    global _active_writer
+    previous = _active_writer
+    _active_writer = writer
+    if previous is not None and previous is not writer:
+        previous.flush()
+    return previous
+
+
+def _schedule_flush(writer: ColorWriter, deadline: float) -> None:
+    """Has the flusher thread flush ``writer`` at ``deadline``, starting the thread if needed."""
+    global _flusher
+    with _deadlines_changed:
+        heapq.heappush(_deadlines, (deadline, next(_deadline_order), writer))
+        if _flusher is None:
+            _flusher = Thread(target=_run_flusher, name="tinycolors-flusher", daemon=True)
+            _flusher.start()
+        else:
+            _deadlines_changed.notify()
+
+
+def _run_flusher() -> None:
+    """Flushes the writers as their deadlines pass."""
+    while True:
+        with _deadlines_changed:
+            while not _deadlines or _deadlines[0][0] > monotonic():
+                timeout = _deadlines[0][0] - monotonic() if _deadlines else None
+                _deadlines_changed.wait(None if timeout is None else min(timeout, TIMEOUT_MAX))
+            deadline, _, writer = heapq.heappop(_deadlines)
+        try:
+            writer._flush_due(deadline)
+        except Exception:
+            pass
+        del writer
+
+
+def _reset_flusher() -> None:
+    """Forgets the flusher thread of the parent process in a forked child."""
+    global _flusher, _deadlines_changed
+    _flusher = None
+    _deadlines_changed = Condition()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_flusher)
+
+
+@atexit.register
+def _flush_all() -> None:
+    for writer in list(_WRITERS):
+        try:
+            writer.flush()
+        except Exception:
+            pass